@@ -0,0 +1,79 @@
+"""Micro-benchmark: template rendering throughput, the original chained str.replace vs the bound templates.
+
+The original renderer only fills three placeholders, so on today's templates it
+does less work than a complete render; read the speedup column with that in mind.
+
+Run with:
+
+    python -m benchmarks.bench_render
+"""
+
+import timeit
+
+from src.generator_core import (
+    DEFAULT_VARIANT,
+    STACK_PACKAGES,
+    STACK_SYSTEM_PACKAGES,
+    TEMPLATE_REGISTRY,
+    VALID_VERSIONS,
+    default_installer,
+    option_template,
+)
+
+SAMPLE_STACKS = {
+    "python": "Django Stack",
+    "javascript": "Express Stack",
+    "go": "Gin Stack",
+    "rust": "Actix-Web Stack",
+    "java": "Spring Boot Stack",
+}
+EXTRAS = "requests pyyaml"
+
+
+def legacy_render(language: str, version: str, stack: str, extras: str) -> str:
+    """The pre-compilation renderer, frozen as it shipped: three chained replaces plus a concatenation.
+
+    It runs over today's templates, whose newer placeholders it leaves unfilled
+    just as the original code would, so it does the baseline's per-render work.
+    """
+    start_template, end_template, version_placeholder = TEMPLATE_REGISTRY[language]
+    return (
+        start_template.replace(version_placeholder, version)
+        .replace("DEPENDENCY_STACK", STACK_PACKAGES[stack])
+        .replace("EXTRA_DEPENDENCIES", extras)
+        + end_template
+    )
+
+
+def compiled_render(language: str, version: str, stack: str, extras: str) -> str:
+    """The current renderer: the default options' bound template, filling only the request slots."""
+    template = option_template(
+        language, DEFAULT_VARIANT, default_installer(language), False, None,
+        tuple(STACK_SYSTEM_PACKAGES.get(stack, ())), bool(extras),
+    )
+    return template.render({
+        "language_version": version,
+        "dependency_stack": STACK_PACKAGES[stack],
+        "extra_dependencies": extras,
+    })
+
+
+def renders_per_second(func, args: tuple, number: int) -> float:
+    best = min(timeit.repeat(lambda: func(*args), number=number, repeat=5))
+    return number / best
+
+
+def main(number: int = 50_000) -> None:
+    print(f"{'language':<12}{'legacy/s':>14}{'compiled/s':>14}{'speedup':>10}")
+    for language, stack in SAMPLE_STACKS.items():
+        args = (language, VALID_VERSIONS[language][0], stack, EXTRAS)
+        # The outputs differ (the legacy path leaves the newer placeholders in), but both fill the version
+        for render in (legacy_render, compiled_render):
+            assert f":{args[1]}-" in render(*args)
+        legacy = renders_per_second(legacy_render, args, number)
+        compiled = renders_per_second(compiled_render, args, number)
+        print(f"{language:<12}{legacy:>14,.0f}{compiled:>14,.0f}{compiled / legacy:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
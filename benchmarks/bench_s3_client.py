@@ -0,0 +1,67 @@
+"""Benchmark: per-request S3 latency, fresh boto3 clients vs the pooled client cache.
+
+Simulates a cache-miss request (HEAD then PUT) against an in-process moto S3
+(``pip install "moto[s3]"``). Run with:
+
+    python -m benchmarks.bench_s3_client
+"""
+
+import os
+import statistics
+import time
+
+import boto3
+from moto import mock_aws
+
+from src.s3_helper import check_if_file_exists_in_s3, put_if_absent, set_s3_client_factory, upload_to_s3
+
+BUCKET = "bench-bucket"
+REGION = "us-east-1"
+
+
+def legacy_request(key: str) -> None:
+    """The pre-pooling path: one new client for the HEAD and another for the PUT."""
+    client = boto3.client("s3", region_name=REGION)
+    try:
+        client.head_object(Bucket=BUCKET, Key=key)
+    except Exception:
+        boto3.client("s3", region_name=REGION).put_object(Bucket=BUCKET, Key=key, Body="FROM scratch")
+
+
+def pooled_request(key: str) -> None:
+    if not check_if_file_exists_in_s3(bucket=BUCKET, key=key, region_name=REGION):
+        upload_to_s3(file_path=key, bucket=BUCKET, content="FROM scratch", region_name=REGION)
+
+
+def conditional_request(key: str) -> None:
+    put_if_absent(file_path=key, bucket=BUCKET, content="FROM scratch", region_name=REGION)
+
+
+def latencies_ms(func, prefix: str, number: int) -> list[float]:
+    samples = []
+    for i in range(number):
+        start = time.perf_counter()
+        func(f"{prefix}-{i}.dockerfile")
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main(number: int = 200) -> None:
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("s3", region_name=REGION).create_bucket(Bucket=BUCKET)
+        set_s3_client_factory(None)
+        print(f"{'path':<13}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+        for name, func in (
+            ("legacy", legacy_request),
+            ("pooled", pooled_request),
+            ("conditional", conditional_request),
+        ):
+            samples = latencies_ms(func, name, number)
+            p99 = statistics.quantiles(samples, n=100)[98]
+            print(f"{name:<13}{statistics.median(samples):>10.2f}{p99:>10.2f}{statistics.fmean(samples):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
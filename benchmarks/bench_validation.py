@@ -0,0 +1,69 @@
+"""Micro-benchmark: request validation throughput, legacy dict path vs pydantic JSON mode.
+
+Single requests compare ``json.loads`` + ``GenerateDockerfileRequest(**config)``
+with ``GenerateDockerfileEvent.model_validate_json`` on the raw body bytes.
+Batches compare a per-entry loop with one ``request_list_adapter()`` call.
+Run with:
+
+    python -m benchmarks.bench_validation
+"""
+
+import json
+import timeit
+
+from src.generator_core import (
+    GenerateDockerfileEvent,
+    GenerateDockerfileRequest,
+    request_list_adapter,
+)
+
+CONFIG = {
+    "language": "python",
+    "dependency_stack": "Django Stack",
+    "extra_dependencies": ["numpy", "pandas", "requests>=2.31"],
+    "language_version": "3.11",
+}
+BATCH_SIZE = 100
+
+
+def legacy_single(body: bytes) -> GenerateDockerfileRequest:
+    return GenerateDockerfileRequest(**json.loads(body)["config"])
+
+
+def json_mode_single(body: bytes) -> GenerateDockerfileRequest:
+    return GenerateDockerfileEvent.model_validate_json(body).config
+
+
+def legacy_batch(body: bytes) -> list:
+    return [GenerateDockerfileRequest(**config) for config in json.loads(body)["configs"]]
+
+
+def adapter_batch(body: bytes) -> list:
+    return request_list_adapter().validate_python(GenerateDockerfileEvent.model_validate_json(body).configs)
+
+
+def validations_per_second(func, body: bytes, number: int, per_call: int = 1) -> float:
+    best = min(timeit.repeat(lambda: func(body), number=number, repeat=5))
+    return number * per_call / best
+
+
+def main(number: int = 20_000) -> None:
+    single_body = json.dumps({"config": CONFIG}).encode("utf-8")
+    batch_body = json.dumps({"configs": [CONFIG] * BATCH_SIZE}).encode("utf-8")
+    assert legacy_single(single_body) == json_mode_single(single_body)
+    assert legacy_batch(batch_body) == adapter_batch(batch_body)
+
+    batch_number = max(1, number // BATCH_SIZE)
+    rows = [
+        ("single", validations_per_second(legacy_single, single_body, number),
+         validations_per_second(json_mode_single, single_body, number)),
+        (f"batch x{BATCH_SIZE}", validations_per_second(legacy_batch, batch_body, batch_number, BATCH_SIZE),
+         validations_per_second(adapter_batch, batch_body, batch_number, BATCH_SIZE)),
+    ]
+    print(f"{'input':<12}{'legacy/s':>14}{'fast path/s':>14}{'speedup':>10}")
+    for name, legacy, fast in rows:
+        print(f"{name:<12}{legacy:>14,.0f}{fast:>14,.0f}{fast / legacy:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Benchmark suite: generator, validation, Lambda handler and CLI cold start, with a JSON baseline.
+
+Record a baseline, then compare a later run against it:
+
+    python -m benchmarks.suite run --output benchmarks/baseline.json
+    python -m benchmarks.suite compare --baseline benchmarks/baseline.json --threshold 0.25
+
+``compare`` exits non-zero when any metric is worse than the baseline by more
+than ``threshold`` (a fraction). Numbers are machine-specific: record the
+baseline on the machine that runs the comparison. The handler runs against
+an in-process S3 stand-in, so no AWS credentials or network are needed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from typing import Callable
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_CONFIGS = {
+    "python": {"dependency_stack": "Django Stack", "language_version": "3.11"},
+    "javascript": {"dependency_stack": "Express Stack", "language_version": "20"},
+    "go": {"dependency_stack": "Gin Stack", "language_version": "1.22"},
+    "rust": {"dependency_stack": "Actix-Web Stack", "language_version": "1.82"},
+    "java": {"dependency_stack": "Spring Boot Stack", "language_version": "21"},
+}
+EXTRAS = ["requests", "pyyaml"]
+
+CLI_SCRIPT = "import sys\nfrom src.cli.main import cli\ncli(sys.argv[1:], standalone_mode=False)\n"
+
+
+def _config(language: str) -> dict:
+    return {"language": language, "extra_dependencies": EXTRAS, **SAMPLE_CONFIGS[language]}
+
+
+def _ops_per_second(func: Callable[[], object], number: int) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return number / best
+
+
+def _metric(value: float, unit: str, higher_is_better: bool) -> dict:
+    return {"value": round(value, 3), "unit": unit, "higher_is_better": higher_is_better}
+
+
+class InMemoryS3Client:
+    """In-process stand-in for the S3 client, honouring conditional puts."""
+
+    def __init__(self, region_name: str) -> None:
+        self.region_name = region_name
+        self.objects: dict[tuple[str, str], str] = {}
+
+    def put_object(self, Bucket: str, Key: str, Body: str, IfNoneMatch: str | None = None) -> dict:  # pylint: disable=invalid-name
+        from botocore.exceptions import ClientError  # pylint: disable=import-outside-toplevel
+
+        if IfNoneMatch == "*" and (Bucket, Key) in self.objects:
+            raise ClientError(
+                {"Error": {"Code": "PreconditionFailed"}, "ResponseMetadata": {"HTTPStatusCode": 412}},
+                "PutObject",
+            )
+        self.objects[(Bucket, Key)] = Body
+        return {}
+
+
+def bench_generator(number: int) -> dict[str, dict]:
+    from src.generator_core import DockerfileGenerator, GenerateDockerfileRequest  # pylint: disable=import-outside-toplevel
+
+    metrics = {}
+    for language in SAMPLE_CONFIGS:
+        generator = DockerfileGenerator(config=GenerateDockerfileRequest(**_config(language)))
+        metrics[f"generate_dockerfile.{language}"] = _metric(
+            _ops_per_second(generator.generate_dockerfile, number), "ops/s", True
+        )
+    return metrics
+
+
+def bench_validation(number: int) -> dict[str, dict]:
+    from src.generator_core import GenerateDockerfileEvent, request_list_adapter  # pylint: disable=import-outside-toplevel
+
+    single = json.dumps({"config": _config("python")}).encode("utf-8")
+    batch = [_config(language) for language in SAMPLE_CONFIGS] * 20
+    batch_number = max(1, number // len(batch))
+    adapter = request_list_adapter()
+    return {
+        "validate.single": _metric(
+            _ops_per_second(lambda: GenerateDockerfileEvent.model_validate_json(single), number), "ops/s", True
+        ),
+        "validate.batch_item": _metric(
+            _ops_per_second(lambda: adapter.validate_python(batch), batch_number) * len(batch), "ops/s", True
+        ),
+    }
+
+
+def bench_handler(number: int) -> dict[str, dict]:
+    os.environ.setdefault("AWS_LAMBDA_FUNCTION_NAME", "stackfordev-bench")
+    os.environ.setdefault("S3_BUCKET", "bench-bucket")
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+
+    # pylint: disable=import-outside-toplevel
+    from src.generate_dockerfile import lambda_handler, render_cache
+    from src.metrics import metrics_logger
+    from src.s3_helper import set_s3_client_factory
+
+    event = {"body": json.dumps({"config": _config("python")})}
+
+    def cold() -> None:
+        # Empty render cache and no known keys: render, conditional PUT, alias PUT
+        render_cache.clear()
+        set_s3_client_factory(InMemoryS3Client)
+        lambda_handler(event)
+
+    def warm() -> None:
+        lambda_handler(event)
+
+    set_s3_client_factory(InMemoryS3Client)
+    # One EMF line per invocation would flood the report; the cost of building it is still measured
+    metrics_logger.disabled = True
+    try:
+        handler_number = max(1, number // 10)
+        metrics = {"lambda_handler.miss": _metric(_ops_per_second(cold, handler_number), "ops/s", True)}
+        lambda_handler(event)
+        metrics["lambda_handler.warm"] = _metric(_ops_per_second(warm, handler_number), "ops/s", True)
+    finally:
+        metrics_logger.disabled = False
+        render_cache.clear()
+        set_s3_client_factory(None)
+    return metrics
+
+
+def bench_cli_startup(runs: int = 5) -> dict[str, dict]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", CLI_SCRIPT, "--help"], cwd=REPO_ROOT, capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"cli.help_cold_start": _metric(min(timings), "ms", False)}
+
+
+def run_suite(number: int) -> dict:
+    metrics = {
+        **bench_generator(number),
+        **bench_validation(number),
+        **bench_handler(number),
+        **bench_cli_startup(),
+    }
+    return {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": metrics,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Return one line per metric that regressed by more than ``threshold`` (a fraction)."""
+    regressions = []
+    for name, base in baseline["metrics"].items():
+        now = current["metrics"].get(name)
+        if now is None:
+            continue
+        if base["higher_is_better"]:
+            change = (base["value"] - now["value"]) / base["value"]
+        else:
+            change = (now["value"] - base["value"]) / base["value"]
+        if change > threshold:
+            regressions.append(
+                f"{name}: {base['value']:,.1f} -> {now['value']:,.1f} {now['unit']} ({change:.0%} worse)"
+            )
+    return regressions
+
+
+def _print_metrics(results: dict, baseline: dict | None = None) -> None:
+    print(f"{'metric':<32}{'value':>14}  unit{'baseline':>16}")
+    for name, metric in results["metrics"].items():
+        base = baseline["metrics"].get(name) if baseline else None
+        base_text = f"{base['value']:>16,.1f}" if base else ""
+        print(f"{name:<32}{metric['value']:>14,.1f}  {metric['unit']:<6}{base_text}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.splitlines()[0])
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    run_parser = subcommands.add_parser("run", help="run the suite and optionally write a baseline")
+    run_parser.add_argument("--output", "-o", help="write results to this JSON file")
+    compare_parser = subcommands.add_parser("compare", help="run the suite and fail on regressions")
+    compare_parser.add_argument("--baseline", "-b", default=os.path.join(REPO_ROOT, "benchmarks", "baseline.json"))
+    compare_parser.add_argument("--threshold", "-t", type=float, default=0.25)
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--number", "-n", type=int, default=20_000, help="iterations per throughput sample")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        results = run_suite(args.number)
+        _print_metrics(results, baseline)
+        regressions = compare(baseline, results, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    results = run_suite(args.number)
+    _print_metrics(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
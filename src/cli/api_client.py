@@ -1,37 +1,183 @@
-"""HTTP client for the StackForDev public API endpoint."""
+"""HTTP client for the StackForDev public API endpoint.
+
+All calls share one keep-alive connection pool per process, so scripts and
+batch tooling that generate several Dockerfiles pay for the TLS handshake
+once. Generation is idempotent (content-addressed, conditional writes), so
+transient transport failures and 5xx responses are retried with jittered
+exponential backoff.
+"""
+
+import asyncio
+import atexit
+import os
+import random
+import time
+from typing import Optional
 
 import httpx
 
+from src.cli.cache import ResponseCache, cache_key
 from src.cli.config import API_URL
-from src.generator_core import GenerateDockerfileRequest
+from src.generator_core import GenerateDockerfileRequest, default_installer
+
+CONNECT_TIMEOUT = 5.0
+MAX_RETRIES = int(os.getenv("STACKFORDEV_API_RETRIES", "3"))
+RETRY_BACKOFF_BASE = 0.25
+RETRY_BACKOFF_MAX = 4.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+_client: Optional[httpx.Client] = None
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 is opt-in via STACKFORDEV_HTTP2=1 and needs the optional ``h2`` package."""
+    if os.getenv("STACKFORDEV_HTTP2", "").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return False
+    return True
+
+
+def _client_options() -> dict:
+    return {
+        "http2": _http2_enabled(),
+        "limits": httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+    }
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.Client(**_client_options())
+        atexit.register(_client.close)
+    return _client
+
+
+def async_client() -> httpx.AsyncClient:
+    """Build a pooled AsyncClient for concurrent requests; the caller owns (and closes) it."""
+    return httpx.AsyncClient(**_client_options())
+
+
+def _payload(config: GenerateDockerfileRequest) -> dict:
+    """Only the non-default fields, so a request that uses no newer option still works against an older API.
+
+    An API that knows the fields rejects unknown ones, so a newer option is never silently dropped there.
+    """
+    fields = config.model_dump(exclude_defaults=True)
+    if fields.get("installer") == default_installer(config.language):
+        del fields["installer"]
+    return {"config": fields}
 
 
-def generate_via_api(config: GenerateDockerfileRequest, timeout: float = 15.0) -> dict:
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number ``attempt + 1``."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+
+def _friendly_error(error: httpx.HTTPError) -> RuntimeError:
+    """Translate an httpx failure into a user-friendly RuntimeError."""
+    if isinstance(error, httpx.TimeoutException):
+        return RuntimeError("Request timed out. Try again or use --local to generate offline.")
+    if isinstance(error, httpx.ConnectError):
+        return RuntimeError("Could not connect to the API. Check your internet or use --local.")
+    if isinstance(error, httpx.HTTPStatusError):
+        body = error.response.text
+        return RuntimeError(f"API returned {error.response.status_code}: {body}")
+    return RuntimeError(f"API request failed: {error}")
+
+
+def _post_with_retries(client: httpx.Client, payload: dict, timeout: httpx.Timeout) -> httpx.Response:
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = client.post(API_URL, json=payload, timeout=timeout)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                return response
+        except RETRY_EXCEPTIONS:
+            if attempt == MAX_RETRIES:
+                raise
+        time.sleep(_backoff(attempt))
+    raise AssertionError("unreachable")
+
+
+async def _post_with_retries_async(
+    client: httpx.AsyncClient, payload: dict, timeout: httpx.Timeout
+) -> httpx.Response:
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.post(API_URL, json=payload, timeout=timeout)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                return response
+        except RETRY_EXCEPTIONS:
+            if attempt == MAX_RETRIES:
+                raise
+        await asyncio.sleep(_backoff(attempt))
+    raise AssertionError("unreachable")
+
+
+def generate_via_api(
+    config: GenerateDockerfileRequest,
+    timeout: float = 15.0,
+    use_cache: bool = False,
+    refresh: bool = False,
+) -> dict:
     """POST to the public CLI endpoint and return the response body.
 
+    ``timeout`` bounds each read; connecting is bounded separately by
+    CONNECT_TIMEOUT. With ``use_cache`` the response is served from, and
+    stored in, the on-disk response cache; ``refresh`` skips the lookup but
+    still stores the result.
+
     Returns:
         dict with keys: message, key, dockerfile
 
     Raises:
         RuntimeError on network/HTTP errors with user-friendly messages.
     """
-    payload = {
-        "config": {
-            "language": config.language,
-            "dependency_stack": config.dependency_stack,
-            "extra_dependencies": config.extra_dependencies,
-            "language_version": config.language_version,
-        }
-    }
+    cache = ResponseCache() if use_cache else None
+    key = cache_key(API_URL, config.canonical_key())
+    cached = cache.get(key) if cache is not None and not refresh else None
+    if cached is not None:
+        return cached
+
+    request_timeout = httpx.Timeout(timeout, connect=CONNECT_TIMEOUT)
+    try:
+        response = _post_with_retries(get_client(), _payload(config), request_timeout)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        raise _friendly_error(e) from e
+    result = response.json()
 
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+
+async def generate_via_api_async(
+    config: GenerateDockerfileRequest,
+    client: httpx.AsyncClient,
+    timeout: float = 15.0,
+    use_cache: bool = False,
+    refresh: bool = False,
+) -> dict:
+    """Async counterpart of ``generate_via_api`` for use with ``async_client()``."""
+    cache = ResponseCache() if use_cache else None
+    key = cache_key(API_URL, config.canonical_key())
+    cached = cache.get(key) if cache is not None and not refresh else None
+    if cached is not None:
+        return cached
+
+    request_timeout = httpx.Timeout(timeout, connect=CONNECT_TIMEOUT)
     try:
-        response = httpx.post(API_URL, json=payload, timeout=timeout)
+        response = await _post_with_retries_async(client, _payload(config), request_timeout)
         response.raise_for_status()
-        return response.json()
-    except httpx.TimeoutException:
-        raise RuntimeError("Request timed out. Try again or use --local to generate offline.")
-    except httpx.ConnectError:
-        raise RuntimeError("Could not connect to the API. Check your internet or use --local.")
-    except httpx.HTTPStatusError as e:
-        body = e.response.text
-        raise RuntimeError(f"API returned {e.response.status_code}: {body}")
+    except httpx.HTTPError as e:
+        raise _friendly_error(e) from e
+    result = response.json()
+
+    if cache is not None:
+        cache.put(key, result)
+    return result
@@ -0,0 +1,94 @@
+"""On-disk cache for API responses, shared by concurrent CLI processes."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+CACHE_TTL_SECONDS = float(os.getenv("STACKFORDEV_CACHE_TTL", str(24 * 60 * 60)))
+CACHE_MAX_BYTES = int(os.getenv("STACKFORDEV_CACHE_MAX_BYTES", str(10 * 1024 * 1024)))
+
+
+def default_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/stackfordev``, falling back to ``~/.cache/stackfordev``."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "stackfordev"
+
+
+def cache_key(*parts: str) -> str:
+    """Content key for a cached response, derived from everything that shapes it."""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """JSON responses stored one file per key, with a TTL and an LRU size cap.
+
+    Writes go to a temporary file in the cache directory and are moved into
+    place with ``os.replace``, so readers never see a partial entry. File
+    mtimes track recency: hits touch the entry, eviction removes the oldest.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ttl: float = CACHE_TTL_SECONDS,
+        max_bytes: int = CACHE_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached response for ``key``, or None if missing, expired or unreadable."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["stored_at"] > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            os.utime(path)
+            return entry["response"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, response: dict) -> None:
+        """Atomically store ``response`` under ``key``, then enforce the size cap."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".json")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"stored_at": time.time(), "response": response}, f)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+            self._evict()
+        except OSError:
+            # The cache is an optimisation; an unwritable cache directory must not fail the command
+            return
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
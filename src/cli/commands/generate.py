@@ -6,14 +6,11 @@ import sys
 
 import click
 
-from src.cli.config import (
-    validate_language,
-    validate_version,
-    validate_stack,
-)
-from src.cli.display import print_dockerfile, print_saved
-from src.generator_core import GenerateDockerfileRequest, DockerfileGenerator
-from src.docker_templates.compose_template import COMPOSE_TEMPLATE, DOCKERIGNORE_TEMPLATE
+from src.cli.compose import compose_content
+from src.cli.config import build_request
+from src.cli.context_scan import build_dockerignore, dockerignore_content
+from src.cli.display import print_context_report, print_dockerfile, print_manifest_summary, print_saved
+from src.generator_core import DockerfileGenerator, detect_lockfile
 
 
 @click.command()
@@ -25,9 +22,58 @@ from src.docker_templates.compose_template import COMPOSE_TEMPLATE, DOCKERIGNORE
 @click.option("--local", is_flag=True, default=False, help="Generate offline (no API call)")
 @click.option("--json-output", "--json", "json_mode", is_flag=True, default=False, help="Output raw JSON")
 @click.option("--compose", is_flag=True, default=False, help="Also generate docker-compose.yml and .dockerignore")
+@click.option(
+    "--bind-consistency", "bind_consistency", type=click.Choice(["cached", "delegated"]), default=None,
+    help="Consistency hint for the compose file's source bind mount (speeds it up on macOS)",
+)
+@click.option(
+    "--variant", type=click.Choice(["full", "slim", "multistage"]), default=None,
+    help="Base image variant: full (default), slim, or multistage (build on full, run on slim)",
+)
+@click.option(
+    "--installer", type=click.Choice(["pip", "uv", "npm", "pnpm"]), default=None,
+    help="Package installer: pip (default) or uv for Python, npm (default) or pnpm for JavaScript",
+)
+@click.option(
+    "--system-packages", "system_packages", type=str, default=None,
+    help="Comma-separated apt packages replacing the stack's own (e.g. libpq-dev); '' installs none",
+)
+@click.option(
+    "--cache-mounts", "cache_mounts", is_flag=True, default=False,
+    help="Use BuildKit cache mounts for apt and package manager downloads (faster rebuilds)",
+)
+@click.option(
+    "--directory", "-d", "project_dir", type=click.Path(exists=True, file_okay=False), default=None,
+    help="Project directory: pre-install dependencies from its lockfile or build file (requirements.txt, "
+         "poetry.lock, uv.lock, package(-lock).json, Cargo.lock, go.mod, pom.xml, build.gradle)",
+)
 @click.option("--dry-run", "dry_run", is_flag=True, default=False, help="Print Dockerfile to stdout without saving or uploading")
-def generate(language, stack, lang_version, extras, output, local, json_mode, compose, dry_run):
+@click.option("--no-cache", "no_cache", is_flag=True, default=False, help="Bypass the on-disk API response cache")
+@click.option("--refresh", is_flag=True, default=False, help="Ignore cached API responses and refresh the cache")
+@click.option(
+    "--manifest", "-m", "manifest_path",
+    type=click.Path(exists=True, dir_okay=False), default=None,
+    help="Generate every service listed in a stackfordev.yaml/.json manifest",
+)
+@click.option(
+    "--jobs", "-j", type=click.IntRange(min=1), default=os.cpu_count() or 4,
+    help="Parallel renders (--local) or API requests in flight with --manifest",
+)
+def generate(
+    language, stack, lang_version, extras, output, local, json_mode, compose, bind_consistency, variant, installer,
+    system_packages, cache_mounts, project_dir, dry_run, no_cache, refresh, manifest_path, jobs,
+):
     """Generate a Dockerfile for a development environment."""
+    system_packages_list = (
+        [p.strip() for p in system_packages.split(",") if p.strip()] if system_packages is not None else None
+    )
+    if manifest_path:
+        _generate_manifest(
+            manifest_path, local, jobs, dry_run, json_mode, no_cache, refresh, cache_mounts, variant, installer,
+            system_packages_list,
+        )
+        return
+
     # If any flag is missing and we're in a TTY, go interactive
     if (language is None or stack is None or lang_version is None) and sys.stdin.isatty():
         from src.cli.interactive import prompt_config
@@ -42,20 +88,19 @@ def generate(language, stack, lang_version, extras, output, local, json_mode, co
     else:
         extras_list = [e.strip() for e in extras.split(",") if e.strip()] if extras else []
 
+    lockfile = detect_lockfile(project_dir, language) if project_dir else None
     try:
-        lang = validate_language(language)
-        validate_version(lang, lang_version)
-        validate_stack(lang, stack)
+        config = build_request(
+            language, lang_version, stack, extras_list,
+            cache_mounts=cache_mounts, variant=variant or "full", lockfile=lockfile, installer=installer,
+            system_packages=system_packages_list,
+        )
     except ValueError as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
-
-    config = GenerateDockerfileRequest(
-        language=lang,
-        dependency_stack=stack,
-        extra_dependencies=extras_list,
-        language_version=lang_version,
-    )
+    lang = config.language
+    if lockfile:
+        click.echo(f"Found {lockfile}: project dependencies install in their own layer", err=True)
 
     if local:
         generator = DockerfileGenerator(config=config)
@@ -63,7 +108,7 @@ def generate(language, stack, lang_version, extras, output, local, json_mode, co
     else:
         try:
             from src.cli.api_client import generate_via_api
-            result = generate_via_api(config)
+            result = generate_via_api(config, use_cache=not no_cache, refresh=refresh)
             dockerfile_content = result["dockerfile"]
         except Exception as e:
             click.echo(f"API error: {e}\nTip: use --local to generate offline.", err=True)
@@ -93,19 +138,54 @@ def generate(language, stack, lang_version, extras, output, local, json_mode, co
 
             compose_path = os.path.join(output_dir, "docker-compose.yml")
             with open(compose_path, "w", encoding="utf-8") as f:
-                f.write(COMPOSE_TEMPLATE.format(project_name=project_name))
+                f.write(compose_content(project_name, lang, config.installer, bind_consistency, lockfile))
             print_saved(compose_path)
 
+            dockerignore, scan = build_dockerignore(output_dir, lang)
             dockerignore_path = os.path.join(output_dir, ".dockerignore")
             with open(dockerignore_path, "w", encoding="utf-8") as f:
-                f.write(DOCKERIGNORE_TEMPLATE)
+                f.write(dockerignore)
             print_saved(dockerignore_path)
+            print_context_report(scan)
         return
 
     if compose:
         click.echo("--- docker-compose.yml ---")
-        click.echo(COMPOSE_TEMPLATE.format(project_name=lang))
+        click.echo(compose_content(lang, lang, config.installer, bind_consistency, lockfile))
         click.echo("--- .dockerignore ---")
-        click.echo(DOCKERIGNORE_TEMPLATE)
+        click.echo(dockerignore_content(lang))
 
     print_dockerfile(dockerfile_content, lang, stack)
+
+
+def _generate_manifest(
+    manifest_path, local, jobs, dry_run, json_mode, no_cache, refresh, cache_mounts, variant, installer,
+    system_packages,
+):
+    from src.cli.manifest import load_manifest, run_manifest
+
+    try:
+        services = load_manifest(manifest_path)
+    except (OSError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    results = run_manifest(
+        services,
+        base_dir=os.path.dirname(os.path.abspath(manifest_path)),
+        local=local,
+        jobs=jobs,
+        dry_run=dry_run,
+        use_cache=not no_cache,
+        refresh=refresh,
+        cache_mounts=cache_mounts,
+        variant=variant,
+        installer=installer,
+        system_packages=system_packages,
+    )
+    if json_mode:
+        click.echo(json.dumps(results))
+    else:
+        print_manifest_summary(results)
+    if any(result["status"] == "error" for result in results):
+        sys.exit(1)
@@ -6,10 +6,11 @@ import sys
 import click
 from rich.console import Console
 
-from src.cli.config import validate_language, validate_version, validate_stack
-from src.cli.display import print_saved
-from src.generator_core import GenerateDockerfileRequest, DockerfileGenerator
-from src.docker_templates.compose_template import COMPOSE_TEMPLATE, DOCKERIGNORE_TEMPLATE
+from src.cli.compose import compose_content
+from src.cli.config import build_request
+from src.cli.context_scan import build_dockerignore
+from src.cli.display import print_context_report, print_saved
+from src.generator_core import DockerfileGenerator, detect_lockfile
 from src.docker_templates.shell_template import SHELL_TEMPLATE
 
 
@@ -18,15 +19,44 @@ from src.docker_templates.shell_template import SHELL_TEMPLATE
 @click.option("--stack", "-s", type=str, default=None, help="Dependency stack (e.g. 'Django Stack')")
 @click.option("--version", "-v", "lang_version", type=str, default=None, help="Language version (e.g. 3.12)")
 @click.option("--extras", "-e", type=str, default=None, help="Comma-separated extra dependencies")
+@click.option(
+    "--variant", type=click.Choice(["full", "slim", "multistage"]), default=None,
+    help="Base image variant: full (default), slim, or multistage (build on full, run on slim)",
+)
+@click.option(
+    "--installer", type=click.Choice(["pip", "uv", "npm", "pnpm"]), default=None,
+    help="Package installer: pip (default) or uv for Python, npm (default) or pnpm for JavaScript",
+)
+@click.option(
+    "--system-packages", "system_packages", type=str, default=None,
+    help="Comma-separated apt packages replacing the stack's own (e.g. libpq-dev); '' installs none",
+)
+@click.option(
+    "--cache-mounts", "cache_mounts", is_flag=True, default=False,
+    help="Use BuildKit cache mounts for apt and package manager downloads (faster rebuilds)",
+)
+@click.option(
+    "--bind-consistency", "bind_consistency", type=click.Choice(["cached", "delegated"]), default=None,
+    help="Consistency hint for the compose file's source bind mount (speeds it up on macOS)",
+)
 @click.option(
     "--directory", "-d", "target_dir",
     type=click.Path(), default=".",
     help="Target directory for generated files (default: current directory)"
 )
-def init(language, stack, lang_version, extras, target_dir):
+def init(
+    language, stack, lang_version, extras, variant, installer, system_packages, cache_mounts, bind_consistency, target_dir,
+):
     """Bootstrap a full containerised dev workspace.
 
-    Generates: Dockerfile, docker-compose.yml, .dockerignore, devrun.sh
+    Generates: Dockerfile, docker-compose.yml, .dockerignore, devrun.sh. The
+    compose file keeps the language's package caches and build output in
+    named volumes. The .dockerignore adds the language's build and cache
+    directories (and any other language's found in the directory) to the
+    common rules, and the build context is sized before and after it. A
+    lockfile or build file in the target directory (requirements.txt,
+    poetry.lock, uv.lock, package(-lock).json, Cargo.lock, go.mod, pom.xml,
+    build.gradle) gets its own dependency layer.
     """
     console = Console()
 
@@ -42,33 +72,36 @@ def init(language, stack, lang_version, extras, target_dir):
     else:
         extras_list = [e.strip() for e in extras.split(",") if e.strip()] if extras else []
 
+    system_packages_list = (
+        [p.strip() for p in system_packages.split(",") if p.strip()] if system_packages is not None else None
+    )
+    target = os.path.abspath(target_dir)
+    lockfile = detect_lockfile(target, language)
     try:
-        lang = validate_language(language)
-        validate_version(lang, lang_version)
-        validate_stack(lang, stack)
+        config = build_request(
+            language, lang_version, stack, extras_list,
+            cache_mounts=cache_mounts, variant=variant or "full", lockfile=lockfile, installer=installer,
+            system_packages=system_packages_list,
+        )
     except ValueError as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
-
-    config = GenerateDockerfileRequest(
-        language=lang,
-        dependency_stack=stack,
-        extra_dependencies=extras_list,
-        language_version=lang_version,
-    )
+    lang = config.language
+    if lockfile:
+        console.print(f"[dim]Found {lockfile}: project dependencies install in their own layer[/]")
 
     generator = DockerfileGenerator(config=config)
     dockerfile_content = generator.generate_dockerfile()
 
-    target = os.path.abspath(target_dir)
     os.makedirs(target, exist_ok=True)
     project_name = os.path.basename(target) or lang
+    dockerignore, scan = build_dockerignore(target, lang)
 
     files = {
         "Dockerfile": dockerfile_content,
-        "docker-compose.yml": COMPOSE_TEMPLATE.format(project_name=project_name),
-        ".dockerignore": DOCKERIGNORE_TEMPLATE,
-        "devrun.sh": SHELL_TEMPLATE,
+        "docker-compose.yml": compose_content(project_name, lang, config.installer, bind_consistency, lockfile),
+        ".dockerignore": dockerignore,
+        "devrun.sh": SHELL_TEMPLATE.format(project_name=project_name),
     }
 
     for filename, content in files.items():
@@ -76,6 +109,7 @@ def init(language, stack, lang_version, extras, target_dir):
         with open(path, "w", encoding="utf-8") as f:
             f.write(content)
         print_saved(path)
+    print_context_report(scan)
 
     console.print()
     console.print("[bold green]Workspace ready![/] Next steps:")
@@ -0,0 +1,16 @@
+"""stackfordev serve command — run the generator as a local HTTP service."""
+
+import click
+
+
+@click.command()
+@click.option("--host", type=str, default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+@click.option("--port", "-p", type=int, default=8080, help="Port to listen on (default: 8080)")
+@click.option("--workers", "-w", type=click.IntRange(min=1), default=4, help="Render worker threads (default: 4)")
+def serve(host, port, workers):
+    """Serve the /cli/generate-dockerfile API locally.
+
+    Point the CLI at it with STACKFORDEV_API_URL=http://HOST:PORT/cli/generate-dockerfile
+    """
+    from src.cli.server import run
+    run(host, port, workers)
@@ -0,0 +1,47 @@
+"""docker-compose.yml rendering for ``init`` and ``generate --compose``."""
+
+from typing import Optional
+
+from src.docker_templates.compose_template import (
+    APP_DIR,
+    COMPOSE_BUILD_OUTPUT_VOLUMES,
+    COMPOSE_CACHE_VOLUMES,
+    COMPOSE_INSTALLER_CACHE_VOLUMES,
+    COMPOSE_LOCKFILE_DIRS,
+    COMPOSE_TEMPLATE,
+)
+
+# Bind mount consistency hints; Docker Desktop accepts them, Linux ignores them.
+BIND_CONSISTENCY = ("cached", "delegated")
+
+
+def compose_volumes(language: str, installer: Optional[str] = None, lockfile: Optional[str] = None) -> dict[str, str]:
+    """Named volumes of the dev service (volume name -> container path): caches first, then build output.
+
+    Directories the ``lockfile`` layer fills in the image get no volume, so a rebuilt image's dependencies
+    are not hidden behind a volume created from an earlier build.
+    """
+    volumes = {
+        **COMPOSE_CACHE_VOLUMES.get(language, {}),
+        **COMPOSE_INSTALLER_CACHE_VOLUMES.get(installer or "", {}),
+        **COMPOSE_BUILD_OUTPUT_VOLUMES.get(language, {}),
+    }
+    image_dirs = COMPOSE_LOCKFILE_DIRS.get((language, lockfile or ""), ())
+    return {name: path for name, path in volumes.items() if path not in image_dirs}
+
+
+def compose_content(
+    project_name: str, language: str, installer: Optional[str] = None, bind_consistency: Optional[str] = None,
+    lockfile: Optional[str] = None,
+) -> str:
+    """Render COMPOSE_TEMPLATE with ``language``'s named volumes and an optional bind mount consistency hint."""
+    if bind_consistency is not None and bind_consistency not in BIND_CONSISTENCY:
+        raise ValueError(f"Unknown bind mount consistency '{bind_consistency}'. Valid options are: {', '.join(BIND_CONSISTENCY)}")
+    volumes = compose_volumes(language, installer, lockfile)
+    return COMPOSE_TEMPLATE.format(
+        project_name=project_name,
+        app_dir=APP_DIR,
+        bind_options=f":{bind_consistency}" if bind_consistency else "",
+        volumes="".join(f"      - {name}:{path}\n" for name, path in volumes.items()),
+        named_volumes=("\nvolumes:\n" + "".join(f"  {name}:\n" for name in volumes)) if volumes else "",
+    )
@@ -1,6 +1,11 @@
 """CLI configuration: language versions, stacks, and validation."""
 
-from src.generator_core import STACK_PACKAGES
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.generator_core import GenerateDockerfileRequest
+
 
 LANGUAGE_VERSIONS: dict[str, list[str]] = {
     "python": ["3.12", "3.11", "3.10", "3.9"],
@@ -18,21 +23,10 @@ LANGUAGE_STACKS: dict[str, list[str]] = {
     "java": ["Spring Boot Stack", "Maven Build Stack", "Gradle Build Stack"],
 }
 
-API_URL = "https://f88slnkaa6.execute-api.eu-west-2.amazonaws.com/prod/cli/generate-dockerfile"
-
-
-def validate_language(language: str) -> str:
-    lang = language.lower()
-    if lang not in LANGUAGE_VERSIONS:
-        raise ValueError(f"Unsupported language: {language}. Supported: {', '.join(LANGUAGE_VERSIONS)}")
-    return lang
-
+DEFAULT_API_URL = "https://f88slnkaa6.execute-api.eu-west-2.amazonaws.com/prod/cli/generate-dockerfile"
 
-def validate_version(language: str, version: str) -> str:
-    versions = LANGUAGE_VERSIONS[language]
-    if version not in versions:
-        raise ValueError(f"Unsupported version '{version}' for {language}. Supported: {', '.join(versions)}")
-    return version
+# Point at a self-hosted `stackfordev serve` instance, e.g. http://localhost:8080/cli/generate-dockerfile
+API_URL = os.getenv("STACKFORDEV_API_URL", DEFAULT_API_URL)
 
 
 def validate_stack(language: str, stack: str) -> str:
@@ -40,3 +34,41 @@ def validate_stack(language: str, stack: str) -> str:
     if stack not in stacks:
         raise ValueError(f"Unsupported stack '{stack}' for {language}. Supported: {', '.join(stacks)}")
     return stack
+
+
+def build_request(
+    language: str,
+    version: str,
+    stack: str,
+    extras: list[str],
+    **options: object,
+) -> "GenerateDockerfileRequest":
+    """Validate CLI input and build the API request in a single pass.
+
+    Language, version and extras are validated by ``GenerateDockerfileRequest``
+    itself, exactly as the API does; only the stack, which the CLI restricts
+    to its curated list, is checked here. ``options`` are passed through as
+    request fields (e.g. ``cache_mounts=True``).
+
+    Raises:
+        ValueError: with a one-line message describing every invalid field.
+    """
+    # Deferred so `stackfordev info` and `--help` never import pydantic or the templates
+    from pydantic import ValidationError  # pylint: disable=import-outside-toplevel
+    from src.generator_core import (  # pylint: disable=import-outside-toplevel
+        GenerateDockerfileRequest,
+        validation_error_message,
+    )
+
+    try:
+        config = GenerateDockerfileRequest(
+            language=language,
+            dependency_stack=stack,
+            extra_dependencies=extras,
+            language_version=version,
+            **options,
+        )
+    except ValidationError as e:
+        raise ValueError(validation_error_message(e)) from e
+    validate_stack(config.language, stack)
+    return config
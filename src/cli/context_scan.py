@@ -0,0 +1,154 @@
+"""Language-aware .dockerignore, checked against a scan of the build context.
+
+The generated file is the common ``DOCKERIGNORE_TEMPLATE`` plus the rules of
+the project's language, plus the rules of other languages whose directories
+the scan actually found (a Python service with a ``frontend/node_modules``
+gets ``**/node_modules``). The scan sizes the context before and after those
+rules and flags directories over ``LARGE_DIRECTORY_BYTES``.
+"""
+
+import itertools
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from src.docker_templates.compose_template import DOCKERIGNORE_LANGUAGE_RULES, DOCKERIGNORE_TEMPLATE
+
+LARGE_DIRECTORY_BYTES = int(os.getenv("STACKFORDEV_LARGE_DIRECTORY_BYTES", str(100 * 1024 * 1024)))
+# Bounds on the scan: entries stat'ed in total (sizes become lower bounds past it) and worker threads.
+MAX_SCAN_ENTRIES = 200_000
+SCAN_WORKERS = min(8, os.cpu_count() or 4)
+
+
+def _compile_rule(rule: str) -> re.Pattern:
+    """Regex for a .dockerignore pattern: ``*`` and ``?`` stay within a path segment, ``**`` spans segments."""
+    regex = ""
+    for segment in rule.strip("/").split("/"):
+        if segment == "**":
+            regex += "(?:[^/]+/)*"
+            continue
+        for char in segment:
+            regex += "[^/]*" if char == "*" else "[^/]" if char == "?" else re.escape(char)
+        regex += "/"
+    return re.compile(regex.rstrip("/") + r"\Z")
+
+
+def _template_rules(template: str) -> list[str]:
+    return [line.strip() for line in template.splitlines() if line.strip() and not line.startswith("#")]
+
+
+def _candidate_rules(language: str) -> list[str]:
+    """Every rule the scan checks, in attribution order: common, own language, then the other languages."""
+    rules = _template_rules(DOCKERIGNORE_TEMPLATE) + list(DOCKERIGNORE_LANGUAGE_RULES.get(language, ()))
+    for other in DOCKERIGNORE_LANGUAGE_RULES.values():
+        rules += other
+    return list(dict.fromkeys(rules))
+
+
+def scan_context(
+    directory: str,
+    rules: list[str],
+    threshold: int = LARGE_DIRECTORY_BYTES,
+    workers: int = SCAN_WORKERS,
+    max_entries: int = MAX_SCAN_ENTRIES,
+) -> dict:
+    """Size the build context in ``directory`` and attribute excluded bytes to ``rules``.
+
+    Each top-level entry is walked on a thread pool of ``workers``; the walk
+    stops after ``max_entries`` entries overall. Symlinks are not followed,
+    as ``docker build`` sends them as links. An excluded path is attributed to
+    the first rule matching it, and its contents to that same rule.
+
+    Returns ``total_bytes``, ``excluded_bytes`` (rule -> bytes), ``large_directories``
+    (``(path, bytes, rule or None)`` for directories with at least ``threshold``
+    kept bytes, or excluded ones of that size, outermost only) and ``truncated``.
+    """
+    matchers = [(rule, _compile_rule(rule)) for rule in rules]
+    budget = itertools.count()  # next() on a count is atomic under the GIL, so the workers share it
+
+    def match(rel: str) -> Optional[str]:
+        return next((rule for rule, pattern in matchers if pattern.match(rel)), None)
+
+    def visit(entry: os.DirEntry, rel: str, rule: Optional[str], excluded: dict[str, int], large: list) -> tuple[int, int]:
+        """Total and kept (not excluded) bytes of ``entry``; ``rule`` is the rule excluding its parent, if any."""
+        if next(budget) >= max_entries:
+            return 0, 0
+        own_rule = rule or match(rel)
+        try:
+            if not entry.is_dir(follow_symlinks=False):
+                size = kept = entry.stat(follow_symlinks=False).st_size
+            else:
+                size = kept = 0
+                with os.scandir(entry.path) as it:
+                    for child in it:
+                        child_size, child_kept = visit(child, f"{rel}/{child.name}", own_rule, excluded, large)
+                        size += child_size
+                        kept += child_kept
+                if own_rule is None and kept >= threshold:
+                    large.append((rel, kept, None))
+                elif own_rule and rule is None and size >= threshold:
+                    large.append((rel, size, own_rule))
+        except OSError:
+            return 0, 0
+        if own_rule is None:
+            return size, kept
+        if rule is None:
+            excluded[own_rule] = excluded.get(own_rule, 0) + size
+        return size, 0
+
+    def visit_top_level(entry: os.DirEntry) -> tuple[int, dict[str, int], list]:
+        excluded: dict[str, int] = {}
+        large: list = []
+        size, _ = visit(entry, entry.name, None, excluded, large)
+        return size, excluded, large
+
+    total, excluded, large = 0, {}, []
+    with os.scandir(directory) as it:
+        top_level = list(it)
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="stackfordev-scan") as pool:
+        for size, entry_excluded, entry_large in pool.map(visit_top_level, top_level):
+            total += size
+            for rule, excluded_size in entry_excluded.items():
+                excluded[rule] = excluded.get(rule, 0) + excluded_size
+            large += entry_large
+
+    # Report the deepest kept directories: a kept parent is large because of its flagged child
+    kept = [path for path, _, rule in large if rule is None]
+    large = [
+        item for item in large
+        if item[2] is not None or not any(other.startswith(item[0] + "/") for other in kept)
+    ]
+    return {
+        "total_bytes": total,
+        "excluded_bytes": excluded,
+        "large_directories": sorted(large, key=lambda item: -item[1]),
+        "truncated": next(budget) > max_entries,
+    }
+
+
+def dockerignore_content(language: str, found_rules: tuple[str, ...] = ()) -> str:
+    """The common template plus ``language``'s rules and any other ``found_rules`` not yet listed."""
+    listed = set(_template_rules(DOCKERIGNORE_TEMPLATE))
+    content = DOCKERIGNORE_TEMPLATE
+    for title, rules in ((language, DOCKERIGNORE_LANGUAGE_RULES.get(language, ())), ("found in the project", found_rules)):
+        new_rules = [rule for rule in rules if rule not in listed]
+        if new_rules:
+            content += f"\n# {title}\n" + "".join(f"{rule}\n" for rule in new_rules)
+            listed.update(new_rules)
+    return content
+
+
+def build_dockerignore(directory: str, language: str, workers: int = SCAN_WORKERS) -> tuple[str, dict]:
+    """Scan ``directory`` and return the .dockerignore for it with the scan report.
+
+    The report adds ``context_bytes``, the estimated context size once the
+    generated rules apply.
+    """
+    scan = scan_context(directory, _candidate_rules(language), workers=workers)
+    own = set(_template_rules(DOCKERIGNORE_TEMPLATE)) | set(DOCKERIGNORE_LANGUAGE_RULES.get(language, ()))
+    found = tuple(rule for rule, size in scan["excluded_bytes"].items() if rule not in own and size > 0)
+    content = dockerignore_content(language, found)
+    # Rules that matched nothing excluded nothing, so the sum covers exactly the generated file's rules
+    scan["context_bytes"] = scan["total_bytes"] - sum(scan["excluded_bytes"].values())
+    return content, scan
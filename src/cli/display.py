@@ -1,10 +1,12 @@
 """Rich display helpers for CLI output."""
 
+import os
 import sys
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.syntax import Syntax
+from rich.table import Table
 
 
 def is_tty() -> bool:
@@ -27,3 +29,51 @@ def print_dockerfile(content: str, language: str, stack: str) -> None:
 def print_saved(path: str) -> None:
     console = Console(stderr=True)
     console.print(f"[green]Saved to {path}[/]")
+
+
+def print_manifest_summary(results: list[dict]) -> None:
+    """Print one row per manifest service with its output path and outcome."""
+    styles = {"written": "green", "unchanged": "dim", "would write": "yellow", "error": "bold red"}
+    table = Table(title="StackForDev — Manifest", show_lines=False)
+    table.add_column("Service", style="bold cyan", no_wrap=True)
+    table.add_column("Output")
+    table.add_column("Status", no_wrap=True)
+    table.add_column("Details")
+    for result in results:
+        style = styles.get(result["status"], "")
+        output = os.path.relpath(result["output"])
+        table.add_row(result["name"], output, f"[{style}]{result['status']}[/]", result["detail"])
+
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in styles}
+    summary = ", ".join(f"{count} {status}" for status, count in counts.items() if count)
+    console = Console()
+    console.print(table)
+    console.print(f"[bold]{len(results)} services:[/] {summary}")
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def print_context_report(scan: dict) -> None:
+    """Print the build context size before and after .dockerignore, and the large directories."""
+    console = Console(stderr=True)
+    bound = "≥ " if scan["truncated"] else ""
+    console.print(
+        f"[dim]Build context: {bound}{format_size(scan['total_bytes'])} → "
+        f"{bound}{format_size(scan['context_bytes'])} with .dockerignore[/]"
+    )
+    for path, size, rule in scan["large_directories"]:
+        if rule:
+            console.print(f"[dim]  {path}/ ({format_size(size)}) excluded by '{rule}'[/]")
+        else:
+            console.print(
+                f"[yellow]  {path}/ ({format_size(size)}) is sent to the Docker daemon; "
+                "add it to .dockerignore if the build does not need it[/]"
+            )
+    if scan["truncated"]:
+        console.print("[dim]  Scan stopped early on a very large tree; sizes are lower bounds[/]")
@@ -1,18 +1,55 @@
 """StackForDev CLI entrypoint."""
 
+import importlib
+
 import click
 
-from src.cli.commands.generate import generate
-from src.cli.commands.info import info
-from src.cli.commands.init import init
 
+class LazyGroup(click.Group):
+    """click.Group that imports a command's module only when that command is used.
+
+    ``lazy_commands`` maps a command name to ``("module:attribute", short_help)``.
+    The short help is listed by ``--help`` without importing anything, so the
+    group's own help and unrelated commands stay cheap.
+    """
+
+    def __init__(self, *args, lazy_commands: dict[str, tuple[str, str]] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx):
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            import_path, _ = self.lazy_commands[cmd_name]
+            module_name, attribute = import_path.split(":")
+            self.add_command(getattr(importlib.import_module(module_name), attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
 
-@click.group()
+    def format_commands(self, ctx, formatter):
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.lazy_commands and name not in self.commands:
+                rows.append((name, self.lazy_commands[name][1]))
+                continue
+            command = self.get_command(ctx, name)
+            if command is not None and not command.hidden:
+                rows.append((name, command.get_short_help_str(formatter.width - 6 - len(name))))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_commands={
+        "generate": ("src.cli.commands.generate:generate", "Generate a Dockerfile for a development environment."),
+        "info": ("src.cli.commands.info:info", "Show supported languages, versions, and stacks."),
+        "init": ("src.cli.commands.init:init", "Bootstrap a full containerised dev workspace."),
+        "serve": ("src.cli.commands.serve:serve", "Serve the /cli/generate-dockerfile API locally."),
+    },
+)
 @click.version_option(package_name="stackfordev")
 def cli():
     """StackForDev — Generate tailored Dockerfiles for development environments."""
-
-
-cli.add_command(generate)
-cli.add_command(info)
-cli.add_command(init)
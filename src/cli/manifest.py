@@ -0,0 +1,210 @@
+"""Manifest-driven batch generation for ``stackfordev generate --manifest``.
+
+A manifest lists the services of a monorepo::
+
+    services:
+      - name: api
+        path: services/api          # Dockerfile is written to <path>/Dockerfile
+        language: python
+        stack: Django Stack
+        version: "3.12"
+        extras: [celery, redis]
+        variant: slim               # optional: full (default), slim or multistage; --variant overrides
+        installer: uv               # optional: pip/uv (python), npm/pnpm (javascript); --installer overrides
+        system_packages: [libpq-dev] # optional: apt packages replacing the stack's; --system-packages overrides
+        cache_mounts: true          # optional; --cache-mounts turns it on for every service
+
+Paths are relative to the manifest. ``.json`` manifests with the same
+structure are read the same way.
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from src.cli.config import build_request
+from src.generator_core import INSTALLERS, DockerfileGenerator, GenerateDockerfileRequest
+
+
+class ManifestService(BaseModel):
+    """One service entry in a manifest."""
+
+    name: str
+    language: str
+    stack: str
+    version: str
+    extras: list[str] = Field(default_factory=list)
+    path: str = "."
+    output: Optional[str] = None
+    variant: str = "full"
+    installer: Optional[str] = None
+    system_packages: Optional[list[str]] = None
+    cache_mounts: bool = False
+
+    @field_validator("version", mode="before")
+    @classmethod
+    def coerce_version(cls, v: Any) -> str:
+        # Unquoted YAML versions arrive as numbers (3.12 -> 3.12, but 3.10 -> 3.1)
+        return str(v)
+
+    @field_validator("extras", "system_packages", mode="before")
+    @classmethod
+    def split_extras(cls, v: Any) -> list[str]:
+        if isinstance(v, str):
+            return [e.strip() for e in v.split(",") if e.strip()]
+        return v
+
+    def output_path(self, base_dir: str) -> str:
+        return os.path.normpath(os.path.join(base_dir, self.output or os.path.join(self.path, "Dockerfile")))
+
+    def to_request(
+        self, cache_mounts: bool = False, variant: Optional[str] = None, installer: Optional[str] = None,
+        system_packages: Optional[list[str]] = None,
+    ) -> GenerateDockerfileRequest:
+        """Validate against the CLI's supported configurations and build the request.
+
+        ``cache_mounts``, ``variant``, ``installer`` and ``system_packages`` come from the
+        command line and override the entry; ``installer`` only for the languages that
+        support it.
+        """
+        if installer not in INSTALLERS.get(self.language.strip().lower(), {}):
+            installer = None
+        return build_request(
+            self.language,
+            self.version,
+            self.stack,
+            self.extras,
+            cache_mounts=self.cache_mounts or cache_mounts,
+            variant=variant or self.variant,
+            installer=installer or self.installer,
+            system_packages=system_packages if system_packages is not None else self.system_packages,
+        )
+
+
+def load_manifest(path: str) -> list[ManifestService]:
+    """Parse a YAML or JSON manifest into service entries.
+
+    Raises:
+        ValueError: if the file cannot be parsed or an entry is invalid.
+    """
+    with open(path, encoding="utf-8") as f:
+        raw = f.read()
+
+    if path.endswith(".json"):
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"{path}: invalid JSON: {e}") from e
+    else:
+        # Imported here so commands that never read a manifest don't pay for it
+        import yaml  # pylint: disable=import-outside-toplevel
+
+        try:
+            data = yaml.safe_load(raw)
+        except yaml.YAMLError as e:
+            raise ValueError(f"{path}: invalid YAML: {e}") from e
+
+    entries = data.get("services") if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty 'services' list")
+
+    services = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}: service #{index + 1} must be a mapping")
+        entry = {"name": entry.get("path") or f"service-{index + 1}", **entry}
+        try:
+            services.append(ManifestService(**entry))
+        except ValueError as e:
+            raise ValueError(f"{path}: service '{entry['name']}': {e}") from e
+    return services
+
+
+def _render_local(config_data: dict) -> str:
+    """Process-pool worker: render one Dockerfile from a serialised request."""
+    return DockerfileGenerator(config=GenerateDockerfileRequest(**config_data)).generate_dockerfile()
+
+
+def _render_all_local(configs: list[GenerateDockerfileRequest], jobs: int) -> list:
+    payloads = [config.model_dump() for config in configs]
+    if jobs <= 1 or len(payloads) <= 1:
+        return [_render_local(payload) for payload in payloads]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(payloads))) as pool:
+        return list(pool.map(_render_local, payloads))
+
+
+async def _fetch_all(configs: list[GenerateDockerfileRequest], jobs: int, use_cache: bool, refresh: bool) -> list:
+    from src.cli.api_client import async_client, generate_via_api_async  # pylint: disable=import-outside-toplevel
+
+    in_flight = asyncio.Semaphore(jobs)
+    async with async_client() as client:
+        async def fetch(config: GenerateDockerfileRequest) -> str:
+            async with in_flight:
+                result = await generate_via_api_async(config, client, use_cache=use_cache, refresh=refresh)
+            return result["dockerfile"]
+
+        return await asyncio.gather(*(fetch(config) for config in configs), return_exceptions=True)
+
+
+def run_manifest(
+    services: list[ManifestService],
+    base_dir: str,
+    local: bool,
+    jobs: int,
+    dry_run: bool = False,
+    use_cache: bool = True,
+    refresh: bool = False,
+    cache_mounts: bool = False,
+    variant: Optional[str] = None,
+    installer: Optional[str] = None,
+    system_packages: Optional[list[str]] = None,
+) -> list[dict]:
+    """Generate every service's Dockerfile and write the ones that changed.
+
+    Returns one result per service with ``name``, ``output``, ``status``
+    (``written``, ``unchanged``, ``would write`` or ``error``) and ``detail``.
+    """
+    results = [
+        {"name": service.name, "output": service.output_path(base_dir), "status": "error", "detail": ""}
+        for service in services
+    ]
+    pending: list[tuple[int, GenerateDockerfileRequest]] = []
+    for index, service in enumerate(services):
+        try:
+            pending.append((index, service.to_request(cache_mounts, variant, installer, system_packages)))
+        except ValueError as e:
+            results[index]["detail"] = str(e)
+
+    configs = [config for _, config in pending]
+    if local:
+        rendered = _render_all_local(configs, jobs)
+    else:
+        rendered = asyncio.run(_fetch_all(configs, jobs, use_cache, refresh))
+
+    for (index, config), content in zip(pending, rendered):
+        result = results[index]
+        result["detail"] = f"{config.language} {config.language_version} / {config.dependency_stack}"
+        if isinstance(content, BaseException):
+            result["detail"] = str(content)
+            continue
+
+        output = result["output"]
+        try:
+            with open(output, encoding="utf-8") as f:
+                unchanged = f.read() == content
+        except FileNotFoundError:
+            unchanged = False
+        if unchanged:
+            result["status"] = "unchanged"
+        elif dry_run:
+            result["status"] = "would write"
+        else:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(content)
+            result["status"] = "written"
+    return results
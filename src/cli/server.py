@@ -0,0 +1,204 @@
+"""Local asyncio HTTP server implementing the generate-dockerfile API contract.
+
+Serves the same request/response bodies as ``lambda_handler`` so it can be
+used as a drop-in ``STACKFORDEV_API_URL`` target, without S3 persistence.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import click
+
+from src.generator_core import (
+    CORS_HEADERS,
+    GenerateDockerfileEvent,
+    RenderCache,
+    batch_response_body,
+    generate_dockerfile_alias_name,
+    render_batch,
+)
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_SIZE = 250
+KEEP_ALIVE_TIMEOUT = 60.0
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class GenerateServer:
+    """Keep-alive HTTP/1.1 server rendering Dockerfiles on a worker pool.
+
+    Concurrent requests with identical bodies are coalesced: the first one is
+    rendered and every other waiter receives the same response. ``renders``
+    counts bodies actually handed to the pool.
+    """
+
+    def __init__(self, workers: int = 4, cache_entries: int = 256, cache_bytes: int = 8 * 1024 * 1024) -> None:
+        self.render_cache = RenderCache(max_entries=cache_entries, max_bytes=cache_bytes)
+        self.renders = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stackfordev-render")
+        self._in_flight: dict[bytes, asyncio.Future] = {}
+        self._connections: set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str, port: int) -> tuple[str, int]:
+        """Start listening and return the bound ``(host, port)``."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    def handle_body(self, body: bytes) -> tuple[int, dict]:
+        """Validate and render one request body; returns ``(status_code, response_body)``."""
+        try:
+            payload = GenerateDockerfileEvent.model_validate_json(body)
+            if payload.configs is not None:
+                return 200, self._render_batch(payload.configs)
+            config = payload.config
+            dockerfile_content, key_name = self.render_cache.get_or_render(config)
+        except Exception as e:
+            return 400, {"error": str(e)}
+        return 200, {
+            "message": "Dockerfile generated successfully",
+            "key": key_name,
+            "alias": generate_dockerfile_alias_name(config),
+            "dockerfile": dockerfile_content,
+        }
+
+    def _render_batch(self, configs: list[Any]) -> dict:
+        results, _ = render_batch(configs, self.render_cache, MAX_BATCH_SIZE)
+        return batch_response_body(results)
+
+    async def _coalesced(self, body: bytes) -> tuple[int, dict]:
+        future = self._in_flight.get(body)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        self.renders += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self.handle_body, body)
+        self._in_flight[body] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._in_flight.pop(body, None)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+                    return
+                try:
+                    method, path, version, headers = _parse_head(head)
+                except ValueError:
+                    writer.write(_format_response(400, {"error": "Malformed request line"}, False))
+                    await writer.drain()
+                    return
+                keep_alive = headers.get("connection", "").lower() != "close" and (
+                    version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive"
+                )
+
+                length = headers.get("content-length", "0")
+                try:
+                    if not length.isdigit():
+                        keep_alive = False
+                        raise _HttpError(400, "Invalid Content-Length")
+                    if int(length) > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise _HttpError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+                    body = await reader.readexactly(int(length)) if int(length) else b""
+                    status, response = await self._route(method, path, body)
+                except _HttpError as e:
+                    status, response = e.status, {"error": str(e)}
+
+                writer.write(_format_response(status, response, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> tuple[int, Optional[dict]]:
+        if path.split("?", 1)[0] == "/healthz" and method == "GET":
+            return 200, {"status": "ok"}
+        if not path.split("?", 1)[0].endswith("/generate-dockerfile"):
+            raise _HttpError(404, f"No route for {path}")
+        if method == "OPTIONS":
+            return 200, None
+        if method != "POST":
+            raise _HttpError(405, f"Method {method} not allowed")
+        return await self._coalesced(body)
+
+
+def _parse_head(head: bytes) -> tuple[str, str, str, dict[str, str]]:
+    request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+    method, path, version = request_line.split(" ", 2)
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return method.upper(), path, version, headers
+
+
+def _format_response(status: int, body: Optional[dict], keep_alive: bool) -> bytes:
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    headers = {
+        **CORS_HEADERS,
+        "Content-Type": "application/json",
+        "Content-Length": str(len(payload)),
+        "Connection": "keep-alive" if keep_alive else "close",
+    }
+    head = f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return head.encode("latin-1") + b"\r\n" + payload
+
+
+def run(host: str, port: int, workers: int) -> None:
+    """Run a GenerateServer until interrupted."""
+
+    async def main() -> None:
+        server = GenerateServer(workers=workers)
+        bound_host, bound_port = await server.start(host, port)
+        click.echo(f"Serving on http://{bound_host}:{bound_port}/cli/generate-dockerfile", err=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,5 +1,13 @@
 """docker-compose.yml template for development environments."""
 
+from src.docker_templates import go_template, java_template, javascript_template, rust_template
+
+# The dev service idles in a keep-alive loop so devrun.sh can exec into one long-lived container. It exits
+# once DEVRUN_IDLE_MINUTES pass with no devrun command running or started (``$$`` escapes compose interpolation).
+# A busy marker only counts while the shell named by its PID suffix is alive and it is younger than the idle
+# window (devrun refreshes it every 30 seconds); markers left behind by a killed exec are removed.
+# {app_dir} is the bind-mounted project directory (APP_DIR), {bind_options} the bind mount's consistency hint,
+# {volumes} the named volume mounts and {named_volumes} their top-level declarations (see src.cli.compose).
 COMPOSE_TEMPLATE = """\
 services:
   dev:
@@ -8,11 +16,66 @@ services:
       dockerfile: Dockerfile
     container_name: {project_name}-dev
     volumes:
-      - .:/usr/src/app
-    working_dir: /usr/src/app
+      - .:{app_dir}{bind_options}
+{volumes}    working_dir: {app_dir}
     stdin_open: true
     tty: true
-"""
+    init: true
+    command:
+      - sh
+      - -c
+      - |
+        touch /tmp/.devrun-activity
+        while sleep 60; do
+          [ "${{DEVRUN_IDLE_MINUTES:-30}}" -gt 0 ] || continue
+          busy=
+          for marker in /tmp/.devrun-busy.*; do
+            [ -e "$$marker" ] || continue
+            if kill -0 "$${{marker##*.}}" 2>/dev/null && [ -z "$$(find "$$marker" -mmin +${{DEVRUN_IDLE_MINUTES:-30}})" ]; then
+              busy=1
+            else
+              rm -f "$$marker"
+            fi
+          done
+          [ -n "$$busy" ] && continue
+          [ -n "$$(find /tmp/.devrun-activity -mmin +${{DEVRUN_IDLE_MINUTES:-30}})" ] && exit 0
+        done
+{named_volumes}"""
+
+# The dev service's project directory: the bind mount and working directory, as in the templates' WORKDIR.
+APP_DIR = "/usr/src/app"
+
+# Named volumes per language: package caches, so reinstalls survive the container being recreated, and build
+# output directories, which stay off the (slow on macOS and Windows) bind mount. Volume name -> container path.
+# Paths the templates use come from their modules, so the volumes land where the images put things.
+COMPOSE_CACHE_VOLUMES: dict[str, dict[str, str]] = {
+    "python": {"pip-cache": "/root/.cache/pip"},
+    "javascript": {"npm-cache": "/root/.npm"},
+    "go": {"go-mod-cache": go_template.GO_MODULE_CACHE, "go-build-cache": "/root/.cache/go-build"},
+    "rust": {"cargo-registry": rust_template.CARGO_REGISTRY_DIR, "cargo-git": "/usr/local/cargo/git"},
+    "java": {"maven-repository": java_template.MAVEN_REPOSITORY_DIR, "gradle-cache": java_template.GRADLE_HOME_DIR},
+}
+COMPOSE_INSTALLER_CACHE_VOLUMES: dict[str, dict[str, str]] = {
+    "uv": {"uv-cache": "/root/.cache/uv"},
+    "pnpm": {"pnpm-store": "/root/.local/share/pnpm/store"},
+}
+# node_modules is where ``devrun npm install`` writes, in the app directory. Node resolves it before the lockfile
+# layer's javascript_template.NODE_MODULES_DIR in the parent directory, which the volume leaves visible.
+COMPOSE_BUILD_OUTPUT_VOLUMES: dict[str, dict[str, str]] = {
+    "javascript": {"node-modules": f"{APP_DIR}/node_modules"},
+    "rust": {"target": rust_template.CARGO_TARGET_DIR},
+    "java": {"target": f"{APP_DIR}/target"},
+}
+
+# Directories a lockfile layer fills in the image, keyed on (language, lockfile name). Docker only copies image
+# content into a named volume when the volume is created, so a volume over one of these would keep serving the
+# first build's dependencies after the image is rebuilt: src.cli.compose leaves them out.
+COMPOSE_LOCKFILE_DIRS: dict[tuple[str, str], tuple[str, ...]] = {
+    (_language, _lockfile): _dirs
+    for _language, _module in (("javascript", javascript_template), ("go", go_template),
+                               ("rust", rust_template), ("java", java_template))
+    for _lockfile, _dirs in _module.LOCKFILE_IMAGE_DIRS.items()
+}
 
 DOCKERIGNORE_TEMPLATE = """\
 __pycache__
@@ -29,3 +92,14 @@ node_modules
 dist/
 build/
 """
+
+# Build output, dependency and tool caches per language, in .dockerignore syntax (patterns are anchored at the
+# context root; ``**/`` matches at any depth). The dev container bind-mounts the source, so none of these need
+# to reach the daemon: only the lockfiles the Dockerfile copies do.
+DOCKERIGNORE_LANGUAGE_RULES: dict[str, tuple[str, ...]] = {
+    "python": ("**/__pycache__", ".venv/", "venv/", ".tox/", ".mypy_cache/", ".pytest_cache/", ".ruff_cache/"),
+    "javascript": ("**/node_modules", ".next/", ".nuxt/", ".cache/", "coverage/"),
+    "go": ("vendor/",),
+    "rust": ("target/",),
+    "java": ("target/", ".gradle/"),
+}
@@ -1,5 +1,5 @@
 """File to generate a Dockerfile for a Go application."""
-START_OF_TEMPLATE = """# Help
+HELP = """# Help
 
 # To execute Go code in the container:
     # docker exec manager go version
@@ -7,21 +7,85 @@ START_OF_TEMPLATE = """# Help
 # To start an interactive shell:
     # docker exec -it manager bash
 
-FROM golang:GO_VERSION-bookworm
+"""
+
+START_OF_TEMPLATE = HELP + """FROM golang:GO_VERSION-bookworm
 
 WORKDIR /usr/src/app
+SYSTEM_PACKAGES
+# Install Go packages
+RUN_INSTALL go install DEPENDENCY_STACK
+EXTRAS_LAYER"""
+
+# There is no slim golang image: copy the toolchain onto debian slim instead.
+SLIM_START_OF_TEMPLATE = HELP + """FROM debian:bookworm-slim
 
-# Install system dependencies
-RUN apt-get update && apt-get install -y \\
-    git \\
-    curl \\
-    build-essential \\
-    && rm -rf /var/lib/apt/lists/*
+COPY --from=golang:GO_VERSION-bookworm /usr/local/go /usr/local/go
+ENV GOPATH=/go
+ENV PATH=/go/bin:/usr/local/go/bin:$PATH
 
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES
 # Install Go packages
-RUN go install DEPENDENCY_STACK EXTRA_DEPENDENCIES
+RUN_INSTALL go install DEPENDENCY_STACK
+EXTRAS_LAYER"""
+
+MULTISTAGE_START_OF_TEMPLATE = HELP + """# Build stage: build the Go tools with the full toolchain
+FROM golang:GO_VERSION-bookworm AS builder
+
+RUN_INSTALL go install DEPENDENCY_STACK
+EXTRAS_LAYER
+# Runtime stage: debian slim with the Go toolchain and the built binaries only
+FROM debian:bookworm-slim
+
+COPY --from=builder /usr/local/go /usr/local/go
+COPY --from=builder /go/bin /go/bin
+ENV GOPATH=/go
+ENV PATH=/go/bin:/usr/local/go/bin:$PATH
+
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES"""
+
+# apt packages for each variant's final stage; debian slim lacks even the CA bundle that go get needs.
+SYSTEM_PACKAGES = {
+    "full": (),
+    "slim": ("ca-certificates", "curl", "git"),
+    "multistage": ("ca-certificates", "curl", "git"),
+}
+
+EXTRAS_LAYER = """
+# Install extra Go packages
+RUN_INSTALL go install EXTRA_DEPENDENCIES
 """
 
+# Project module files in order of preference, with the files each layer copies.
+LOCKFILE_SOURCES = {
+    "go.sum": ("go.mod", "go.sum"),
+    "go.mod": ("go.mod",),
+}
+
+GO_MODULE_CACHE = "/go/pkg/mod"
+
+# Plain RUN: the module cache is where the downloads must end up, so it cannot be a cache mount.
+LOCKFILE_LAYERS = {
+    "go.sum": """
+# Download module dependencies (rebuilt only when go.mod or go.sum change)
+COPY go.mod go.sum ./
+RUN go mod download
+""",
+    "go.mod": """
+# Download module dependencies (rebuilt only when go.mod changes)
+COPY go.mod ./
+RUN go mod download
+""",
+}
+
+# Directories each lockfile layer fills in the image; compose mounts no volume over them.
+LOCKFILE_IMAGE_DIRS = {
+    "go.sum": (GO_MODULE_CACHE,),
+    "go.mod": (GO_MODULE_CACHE,),
+}
+
 END_OF_TEMPLATE = """
 CMD ["bash"]
 """
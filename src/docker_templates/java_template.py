@@ -1,5 +1,5 @@
 """File to generate a Dockerfile for a Java application."""
-START_OF_TEMPLATE = """# Help
+HELP = """# Help
 
 # To compile Java code in the container:
     # docker exec manager javac Main.java
@@ -10,21 +10,124 @@ START_OF_TEMPLATE = """# Help
 # To start an interactive shell:
     # docker exec -it manager bash
 
-FROM eclipse-temurin:JAVA_VERSION-jdk-bookworm
+"""
+
+START_OF_TEMPLATE = HELP + """FROM eclipse-temurin:JAVA_VERSION-jdk-bookworm
+
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES
+ENV JAVA_TOOL_OPTIONS="-Dfile.encoding=UTF-8"
+"""
+
+# Maven comes from the official image instead of apt, which pulls in a second JDK's worth of dependencies.
+SLIM_START_OF_TEMPLATE = HELP + """FROM eclipse-temurin:JAVA_VERSION-jdk-bookworm
+
+COPY --from=maven:3-eclipse-temurin-JAVA_VERSION /usr/share/maven /usr/share/maven
+ENV MAVEN_HOME=/usr/share/maven
+ENV PATH=/usr/share/maven/bin:$PATH
 
 WORKDIR /usr/src/app
+SYSTEM_PACKAGES
+ENV JAVA_TOOL_OPTIONS="-Dfile.encoding=UTF-8"
+"""
 
-# Install system dependencies
-RUN apt-get update && apt-get install -y \\
-    git \\
-    curl \\
-    build-essential \\
-    maven \\
-    && rm -rf /var/lib/apt/lists/*
+# Java has no stack packages to build, so the builder stage comes from MULTISTAGE_LOCKFILE_STAGES: it resolves
+# a build file's dependencies, and the runtime stage copies them. Without a build file this matches slim.
+MULTISTAGE_START_OF_TEMPLATE = HELP + """# Runtime stage: JDK with the Maven distribution only
+FROM eclipse-temurin:JAVA_VERSION-jdk-bookworm
+
+COPY --from=maven:3-eclipse-temurin-JAVA_VERSION /usr/share/maven /usr/share/maven
+ENV MAVEN_HOME=/usr/share/maven
+ENV PATH=/usr/share/maven/bin:$PATH
 
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES
 ENV JAVA_TOOL_OPTIONS="-Dfile.encoding=UTF-8"
 """
 
+# apt packages for each variant's final stage; the temurin image is not built on buildpack-deps, so the
+# full variant still installs Maven from apt.
+SYSTEM_PACKAGES = {
+    "full": ("curl", "git", "maven"),
+    "slim": ("curl", "git"),
+    "multistage": ("curl", "git"),
+}
+
+# Build files in order of preference, with the files each layer requires.
+LOCKFILE_SOURCES = {
+    "pom.xml": ("pom.xml",),
+    "build.gradle.kts": ("gradlew", "gradle/wrapper/gradle-wrapper.properties", "build.gradle.kts"),
+    "build.gradle": ("gradlew", "gradle/wrapper/gradle-wrapper.properties", "build.gradle"),
+}
+
+# Dependencies land in ~/.m2 and ~/.gradle, outside the bind-mounted app directory.
+MAVEN_REPOSITORY_DIR = "/root/.m2"
+GRADLE_HOME_DIR = "/root/.gradle"
+
+LOCKFILE_LAYERS = {
+    "pom.xml": """
+# Resolve Maven dependencies and plugins (rebuilt only when pom.xml changes)
+COPY pom.xml ./
+RUN mvn -B dependency:go-offline
+""",
+    "build.gradle.kts": """
+# Download Gradle and resolve dependencies (rebuilt only when the build scripts change)
+COPY gradlew settings.gradle* build.gradle.kts ./
+COPY gradle ./gradle
+RUN ./gradlew dependencies --no-daemon
+""",
+    "build.gradle": """
+# Download Gradle and resolve dependencies (rebuilt only when the build scripts change)
+COPY gradlew settings.gradle* build.gradle ./
+COPY gradle ./gradle
+RUN ./gradlew dependencies --no-daemon
+""",
+}
+
+_DEPENDENCY_BUILDER = """# Build stage: resolve the project's dependencies with Maven on the full JDK image
+FROM maven:3-eclipse-temurin-JAVA_VERSION AS builder
+WORKDIR /usr/src/app
+"""
+
+MULTISTAGE_LOCKFILE_STAGES = {
+    "pom.xml": _DEPENDENCY_BUILDER + """COPY pom.xml ./
+RUN mvn -B dependency:go-offline
+
+""",
+    "build.gradle.kts": _DEPENDENCY_BUILDER + """COPY gradlew settings.gradle* build.gradle.kts ./
+COPY gradle ./gradle
+RUN ./gradlew dependencies --no-daemon
+
+""",
+    "build.gradle": _DEPENDENCY_BUILDER + """COPY gradlew settings.gradle* build.gradle ./
+COPY gradle ./gradle
+RUN ./gradlew dependencies --no-daemon
+
+""",
+}
+
+MULTISTAGE_LOCKFILE_LAYERS = {
+    "pom.xml": f"""
+# Maven dependencies resolved in the builder stage (rebuilt only when pom.xml changes)
+COPY --from=builder {MAVEN_REPOSITORY_DIR} {MAVEN_REPOSITORY_DIR}
+""",
+    "build.gradle.kts": f"""
+# Gradle and the dependencies resolved in the builder stage (rebuilt only when the build scripts change)
+COPY --from=builder {GRADLE_HOME_DIR} {GRADLE_HOME_DIR}
+""",
+    "build.gradle": f"""
+# Gradle and the dependencies resolved in the builder stage (rebuilt only when the build scripts change)
+COPY --from=builder {GRADLE_HOME_DIR} {GRADLE_HOME_DIR}
+""",
+}
+
+# Directories each lockfile layer fills in the image; compose mounts no volume over them.
+LOCKFILE_IMAGE_DIRS = {
+    "pom.xml": (MAVEN_REPOSITORY_DIR,),
+    "build.gradle.kts": (GRADLE_HOME_DIR,),
+    "build.gradle": (GRADLE_HOME_DIR,),
+}
+
 END_OF_TEMPLATE = """
 CMD ["bash"]
 """
@@ -1,5 +1,5 @@
 """File to generate a Dockerfile for a JavaScript/Node.js application."""
-START_OF_TEMPLATE = """# Help
+HELP = """# Help
 
 # To execute Node.js code in the container:
     # docker exec manager node --version
@@ -7,21 +7,115 @@ START_OF_TEMPLATE = """# Help
 # To start an interactive Node.js shell:
     # docker exec -it manager node
 
-FROM node:NODE_VERSION-bookworm
+"""
 
+START_OF_TEMPLATE = HELP + """FROM node:NODE_VERSION-bookworm
+INSTALLER_SETUP
 WORKDIR /usr/src/app
+SYSTEM_PACKAGES
+# Install global packages
+RUN_INSTALL PACKAGE_INSTALL DEPENDENCY_STACK
+EXTRAS_LAYER"""
 
-# Install system dependencies
-RUN apt-get update && apt-get install -y \\
-    git \\
-    curl \\
-    build-essential \\
-    && rm -rf /var/lib/apt/lists/*
-
+# No compilers: packages with native addons need prebuilt binaries. Use the multistage variant otherwise.
+SLIM_START_OF_TEMPLATE = HELP + """FROM node:NODE_VERSION-bookworm-slim
+INSTALLER_SETUP
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES
 # Install global packages
-RUN npm install -g DEPENDENCY_STACK EXTRA_DEPENDENCIES
+RUN_INSTALL PACKAGE_INSTALL DEPENDENCY_STACK
+EXTRAS_LAYER"""
+
+MULTISTAGE_START_OF_TEMPLATE = HELP + """# Build stage: install global packages (and build native addons) with the full toolchain
+FROM node:NODE_VERSION-bookworm AS builder
+INSTALLER_SETUP
+RUN_INSTALL PACKAGE_BUILD DEPENDENCY_STACK
+EXTRAS_LAYER
+# Runtime stage: slim image with the installed packages only
+FROM node:NODE_VERSION-bookworm-slim
+INSTALLER_SETUP
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES
+PACKAGE_COPY"""
+
+# apt packages for each variant's final stage; the full image already has them from buildpack-deps.
+SYSTEM_PACKAGES = {
+    "full": (),
+    "slim": ("ca-certificates", "curl", "git"),
+    "multistage": ("ca-certificates", "curl", "git"),
+}
+
+EXTRAS_LAYER = """
+# Install extra global packages
+RUN_INSTALL PACKAGE_INSTALL EXTRA_DEPENDENCIES
 """
 
+MULTISTAGE_EXTRAS_LAYER = """
+# Install extra global packages
+RUN_INSTALL PACKAGE_BUILD EXTRA_DEPENDENCIES
+"""
+
+# Package installers, the default first, with the values of their template slots (see python_template).
+# pnpm keeps package files in a content-addressed store that a cache mount can persist across builds.
+INSTALLERS = {
+    "npm": {
+        "installer_setup": "",
+        "package_install": "npm install -g",
+        "package_build": "npm install -g --prefix /opt/npm-global",
+        "package_copy": """COPY --from=builder /opt/npm-global /opt/npm-global
+ENV PATH=/opt/npm-global/bin:$PATH
+""",
+    },
+    "pnpm": {
+        "installer_setup": """
+# pnpm: global packages in PNPM_HOME, package files in its content-addressed store
+ENV PNPM_HOME=/usr/local/share/pnpm
+ENV PATH=$PNPM_HOME:$PATH
+RUN npm install -g pnpm && pnpm config set store-dir /root/.local/share/pnpm/store --global
+""",
+        "package_install": "pnpm add -g",
+        "package_build": "pnpm add -g",
+        "package_copy": """COPY --from=builder /usr/local/share/pnpm /usr/local/share/pnpm
+""",
+    },
+}
+
+# Project manifests in order of preference, with the files each layer copies.
+LOCKFILE_SOURCES = {
+    "package-lock.json": ("package.json", "package-lock.json"),
+    "package.json": ("package.json",),
+}
+
+# Both lockfiles are installed with npm whatever the installer, so their layers mount npm's cache.
+LOCKFILE_INSTALLERS = {
+    "package-lock.json": "npm",
+    "package.json": "npm",
+}
+
+# node_modules goes in /usr/src, outside the bind-mounted app directory; Node resolves it from the parent.
+NODE_MODULES_DIR = "/usr/src/node_modules"
+
+LOCKFILE_LAYERS = {
+    "package-lock.json": f"""
+# Install project dependencies from package-lock.json (rebuilt only when the lockfile changes)
+COPY package.json package-lock.json /usr/src/
+RUN_INSTALL cd /usr/src && npm ci
+ENV PATH={NODE_MODULES_DIR}/.bin:$PATH
+""",
+    "package.json": f"""
+# Install project dependencies from package.json (rebuilt only when it changes)
+COPY package.json /usr/src/
+RUN_INSTALL cd /usr/src && npm install
+ENV PATH={NODE_MODULES_DIR}/.bin:$PATH
+""",
+}
+
+# Directories each lockfile layer fills in the image; compose mounts no volume over them.
+LOCKFILE_IMAGE_DIRS = {
+    "package-lock.json": (NODE_MODULES_DIR,),
+    "package.json": (NODE_MODULES_DIR,),
+}
+
 END_OF_TEMPLATE = """
 CMD ["bash"]
 """
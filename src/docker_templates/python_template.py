@@ -1,5 +1,5 @@
 """File to generate a Dockerfile for a Python application."""
-START_OF_TEMPLATE = """# Help
+HELP = """# Help
 
 # To execute Python code in the container:
     # docker exec manager python3 --version
@@ -7,23 +7,167 @@ START_OF_TEMPLATE = """# Help
 # To start an interactive python shell:
     # docker exec -it manager python3
 
-FROM python:PYTHON_VERSION-bookworm
+"""
+
+START_OF_TEMPLATE = HELP + """FROM python:PYTHON_VERSION-bookworm
+
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES
+ENV PYTHONUNBUFFERED=1
+INSTALLER_SETUP
+# Install the dependency stack
+RUN_INSTALL PACKAGE_INSTALL DEPENDENCY_STACK
+EXTRAS_LAYER"""
+
+# No compilers: every package must ship a wheel. Use the multistage variant otherwise.
+SLIM_START_OF_TEMPLATE = HELP + """FROM python:PYTHON_VERSION-slim-bookworm
 
 WORKDIR /usr/src/app
+SYSTEM_PACKAGES
+ENV PYTHONUNBUFFERED=1
+INSTALLER_SETUP
+# Install the dependency stack
+RUN_INSTALL PACKAGE_INSTALL DEPENDENCY_STACK
+EXTRAS_LAYER"""
 
-# Install system dependencies
-RUN apt-get update && apt-get install -y \\
-    git \\
-    curl \\
-    build-essential \\
-    python3-dev \\
-    && rm -rf /var/lib/apt/lists/*
+MULTISTAGE_START_OF_TEMPLATE = HELP + """# Build stage: build the packages with the full toolchain
+FROM python:PYTHON_VERSION-bookworm AS builder
+INSTALLER_SETUP
+RUN_INSTALL PACKAGE_BUILD DEPENDENCY_STACK
+EXTRAS_LAYER
+# Runtime stage: slim image with the prebuilt packages only
+FROM python:PYTHON_VERSION-slim-bookworm
 
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES
 ENV PYTHONUNBUFFERED=1
+INSTALLER_SETUP
+PACKAGE_COPY"""
+
+# apt packages each variant's final stage needs before the stack's own (see STACK_SYSTEM_PACKAGES).
+# The full image builds on buildpack-deps, which already ships git, curl and the compilers.
+SYSTEM_PACKAGES = {
+    "full": (),
+    "slim": ("curl", "git"),
+    "multistage": ("curl", "git"),
+}
 
+EXTRAS_LAYER = """
 # Install extra dependencies
-RUN pip install DEPENDENCY_STACK EXTRA_DEPENDENCIES
+RUN_INSTALL PACKAGE_INSTALL EXTRA_DEPENDENCIES
+"""
+
+MULTISTAGE_EXTRAS_LAYER = """
+# Build the extra dependencies
+RUN_INSTALL PACKAGE_BUILD EXTRA_DEPENDENCIES
+"""
+
+# Pinned so rebuilds get the same uv; bump deliberately.
+UV_IMAGE = "ghcr.io/astral-sh/uv:0.13.1"
+
+# Package installers, the default first, with the values of their template slots: the setup step, the
+# install command, and for the multistage builder the build command and the runtime step that copies its output.
+INSTALLERS = {
+    "pip": {
+        "installer_setup": "",
+        "package_install": "pip install",
+        "package_build": "pip wheel --wheel-dir /wheels",
+        "package_copy": """# Install the wheels without copying them into a layer
+RUN --mount=type=bind,from=builder,source=/wheels,target=/wheels \\
+    pip install --no-cache-dir --no-index /wheels/*.whl
+""",
+        "uv_setup": f"""
+# uv, to install from uv.lock
+COPY --from={UV_IMAGE} /uv /uvx /usr/local/bin/
+ENV UV_LINK_MODE=copy
+""",
+    },
+    "uv": {
+        "installer_setup": f"""
+# uv: a faster, pip-compatible installer (copy mode, so a cache mount on another filesystem works)
+COPY --from={UV_IMAGE} /uv /uvx /usr/local/bin/
+ENV UV_LINK_MODE=copy
+""",
+        "package_install": "uv pip install --system",
+        "package_build": "uv pip install --system --prefix /install",
+        "package_copy": """# Copy the installed packages; both stages share the /usr/local Python layout
+COPY --from=builder /install /usr/local
+""",
+        # Already copied by installer_setup
+        "uv_setup": "",
+    },
+}
+
+# Project lockfiles in order of preference, with the files each layer copies.
+LOCKFILE_SOURCES = {
+    "uv.lock": ("pyproject.toml", "uv.lock"),
+    "poetry.lock": ("pyproject.toml", "poetry.lock"),
+    "requirements.txt": ("requirements.txt",),
+}
+
+# uv.lock is always installed with uv, so its layer mounts uv's cache whatever the installer.
+LOCKFILE_INSTALLERS = {
+    "uv.lock": "uv",
+}
+
+# Installed into the system environment: a virtualenv under /usr/src/app would be hidden by the bind mount.
+LOCKFILE_LAYERS = {
+    "uv.lock": """UV_SETUP
+# Install project dependencies from uv.lock (rebuilt only when the lockfile changes)
+COPY pyproject.toml uv.lock ./
+RUN_INSTALL UV_PROJECT_ENVIRONMENT=/usr/local uv sync --frozen --no-install-project
+""",
+    "poetry.lock": """
+# Install project dependencies from poetry.lock (rebuilt only when the lockfile changes)
+COPY pyproject.toml poetry.lock ./
+RUN_INSTALL PACKAGE_INSTALL poetry \\
+    && poetry config virtualenvs.create false \\
+    && poetry install --no-root --no-interaction
+""",
+    "requirements.txt": """
+# Install project dependencies from requirements.txt (rebuilt only when it changes)
+COPY requirements.txt ./
+RUN_INSTALL PACKAGE_INSTALL -r requirements.txt
+""",
+}
+
+# The multistage runtime stage has no compilers, so the lockfile is installed under /install in a full
+# lockfile-builder stage and copied over, like the stack from the builder. uv and poetry export the lock
+# to requirements first, since their own sync targets an environment rather than a prefix.
+_LOCKFILE_BUILDER = """# Lockfile stage: install the project dependencies with the full toolchain
+FROM python:PYTHON_VERSION-bookworm AS lockfile-builder
+WORKDIR /usr/src
+"""
+
+MULTISTAGE_LOCKFILE_STAGES = {
+    "uv.lock": _LOCKFILE_BUILDER + f"""COPY --from={UV_IMAGE} /uv /uvx /usr/local/bin/
+ENV UV_LINK_MODE=copy
+COPY pyproject.toml uv.lock ./
+RUN_INSTALL uv export --frozen --no-emit-project -o requirements.txt \\
+    && uv pip install --system --prefix /install --no-deps -r requirements.txt
+
+""",
+    "poetry.lock": _LOCKFILE_BUILDER + """INSTALLER_SETUP
+COPY pyproject.toml poetry.lock ./
+RUN_INSTALL PACKAGE_INSTALL poetry poetry-plugin-export \\
+    && poetry export -o requirements.txt \\
+    && PACKAGE_INSTALL --prefix /install --no-deps -r requirements.txt
+
+""",
+    "requirements.txt": _LOCKFILE_BUILDER + """INSTALLER_SETUP
+COPY requirements.txt ./
+RUN_INSTALL PACKAGE_INSTALL --prefix /install -r requirements.txt
+
+""",
+}
+
+MULTISTAGE_LOCKFILE_LAYERS = {
+    lockfile: f"""
+# Copy the project dependencies installed from {lockfile} (rebuilt only when it changes)
+COPY --from=lockfile-builder /install /usr/local
 """
+    for lockfile in LOCKFILE_SOURCES
+}
 
 END_OF_TEMPLATE = """
 CMD ["bash"]
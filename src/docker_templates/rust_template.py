@@ -1,5 +1,5 @@
 """File to generate a Dockerfile for a Rust application."""
-START_OF_TEMPLATE = """# Help
+HELP = """# Help
 
 # To compile and run Rust code in the container:
     # docker exec manager cargo build
@@ -8,23 +8,100 @@ START_OF_TEMPLATE = """# Help
 # To start an interactive shell:
     # docker exec -it manager bash
 
-FROM rust:RUST_VERSION-bookworm
+"""
+
+# Build output and the crate registry. The target directory lives outside /usr/src/app, where the bind mount
+# would hide it (compose mounts a named volume on it; see src.docker_templates.compose_template).
+CARGO_TARGET_DIR = "/usr/src/target"
+CARGO_REGISTRY_DIR = "/usr/local/cargo/registry"
+
+START_OF_TEMPLATE = HELP + """FROM rust:RUST_VERSION-bookworm
 
 WORKDIR /usr/src/app
+SYSTEM_PACKAGES
+# Install Cargo packages
+RUN_INSTALL cargo install DEPENDENCY_STACK
+EXTRAS_LAYER"""
 
-# Install system dependencies
-RUN apt-get update && apt-get install -y \\
-    git \\
-    curl \\
-    build-essential \\
-    pkg-config \\
-    libssl-dev \\
-    && rm -rf /var/lib/apt/lists/*
+SLIM_START_OF_TEMPLATE = HELP + """FROM rust:RUST_VERSION-slim-bookworm
 
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES
 # Install Cargo packages
-RUN cargo install DEPENDENCY_STACK EXTRA_DEPENDENCIES
+RUN_INSTALL cargo install DEPENDENCY_STACK
+EXTRAS_LAYER"""
+
+MULTISTAGE_START_OF_TEMPLATE = HELP + """# Build stage: compile the crates with the full toolchain
+FROM rust:RUST_VERSION-bookworm AS builder
+
+RUN_INSTALL cargo install --root /opt/cargo-tools DEPENDENCY_STACK
+EXTRAS_LAYER
+# Runtime stage: slim image with the compiled binaries only
+FROM rust:RUST_VERSION-slim-bookworm
+
+WORKDIR /usr/src/app
+SYSTEM_PACKAGES
+COPY --from=builder /opt/cargo-tools/bin /usr/local/bin
+"""
+
+# apt packages for each variant's final stage. The slim image already has gcc for linking; crates that
+# need OpenSSL get pkg-config and libssl-dev from their stack's entry in STACK_SYSTEM_PACKAGES.
+SYSTEM_PACKAGES = {
+    "full": (),
+    "slim": ("curl", "git"),
+    "multistage": ("curl", "git"),
+}
+
+EXTRAS_LAYER = """
+# Install extra Cargo packages
+RUN_INSTALL cargo install EXTRA_DEPENDENCIES
+"""
+
+MULTISTAGE_EXTRAS_LAYER = """
+# Install extra Cargo packages
+RUN_INSTALL cargo install --root /opt/cargo-tools EXTRA_DEPENDENCIES
 """
 
-END_OF_TEMPLATE = """
+# Project lockfiles, with the files each layer copies.
+LOCKFILE_SOURCES = {
+    "Cargo.lock": ("Cargo.toml", "Cargo.lock"),
+}
+
+# cargo-chef: the planner reduces the project to a recipe of its dependencies, which only changes with
+# Cargo.toml/Cargo.lock, so the cook layer (the compiled dependency graph) stays cached across source edits.
+# Cooking uses plain RUN: with cache mounts the target directory would end up in the cache, not the image.
+LOCKFILE_STAGES = {
+    "Cargo.lock": f"""# Dependency pre-build stages: compile the dependency graph once per Cargo.lock change
+FROM rust:RUST_VERSION-bookworm AS chef
+RUN_INSTALL cargo install cargo-chef --locked
+WORKDIR /usr/src/app
+
+FROM chef AS planner
+COPY . .
+RUN cargo chef prepare --recipe-path recipe.json
+
+FROM chef AS dependencies
+COPY --from=planner /usr/src/app/recipe.json recipe.json
+RUN CARGO_TARGET_DIR={CARGO_TARGET_DIR} cargo chef cook --recipe-path recipe.json
+
+""",
+}
+
+LOCKFILE_LAYERS = {
+    "Cargo.lock": f"""
+# Pre-compiled dependencies from the cargo-chef stages
+COPY --from=dependencies {CARGO_REGISTRY_DIR} {CARGO_REGISTRY_DIR}
+COPY --from=dependencies {CARGO_TARGET_DIR} {CARGO_TARGET_DIR}
+""",
+}
+
+# Directories each lockfile layer fills in the image; compose mounts no volume over them.
+LOCKFILE_IMAGE_DIRS = {
+    "Cargo.lock": (CARGO_REGISTRY_DIR, CARGO_TARGET_DIR),
+}
+
+# Set last, so cargo install in the layers above still builds in a throwaway directory.
+END_OF_TEMPLATE = f"""
+ENV CARGO_TARGET_DIR={CARGO_TARGET_DIR}
 CMD ["bash"]
 """
@@ -5,11 +5,37 @@ SHELL_TEMPLATE = """\
 # StackForDev — transparent Docker dev environment proxy
 # Usage: source devrun.sh
 #        devrun <command>   e.g. devrun python manage.py runserver
+#        devrun --stop      stop the dev container
+#
+# The first command starts one long-lived dev container (docker compose up -d);
+# every later command runs in it with docker compose exec, so there is no
+# container start-up per command. The container stops itself once no command
+# has run for DEVRUN_IDLE_MINUTES (default 30, 0 to never stop), read when it starts.
 
 devrun() {{
-  docker compose run --rm dev "$@"
+  if [ "$1" = "--stop" ]; then
+    docker compose stop dev
+    return
+  fi
+  if [ -z "$(docker compose ps --status running --quiet dev 2>/dev/null)" ]; then
+    docker compose up -d dev || return
+  fi
+  [ "$#" -gt 0 ] || set -- bash
+  local exec_flags=()
+  [ -t 0 ] && [ -t 1 ] || exec_flags=(-T)
+  # Mark the command busy for its whole run, so the idle check never stops a running server. The marker is
+  # refreshed while this shell lives; the idle check drops markers whose shell is gone or that went stale.
+  docker compose exec "${{exec_flags[@]}}" dev sh -c '
+    busy=/tmp/.devrun-busy.$$
+    touch "$busy" /tmp/.devrun-activity
+    while sleep 30 && kill -0 $$ 2>/dev/null; do touch -c "$busy"; done &
+    refresh=$!
+    trap '"'"'kill $refresh 2>/dev/null; rm -f "$busy"; touch /tmp/.devrun-activity'"'"' EXIT
+    trap '"'"'exit 130'"'"' INT TERM
+    "$@"
+  ' devrun "$@"
 }}
 
 export -f devrun
-echo "devrun is ready. Run: devrun <command>"
+echo "devrun is ready for {project_name}. Run: devrun <command> (devrun --stop to stop the container)"
 """
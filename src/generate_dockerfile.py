@@ -3,21 +3,26 @@
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
-from dotenv import load_dotenv
-
 from src.generator_core import (
+    CORS_HEADERS,
     TEMPLATE_REGISTRY,
     SUPPORTED_LANGUAGES,
     STACK_PACKAGES,
+    GenerateDockerfileEvent,
     GenerateDockerfileRequest,
     DockerfileGenerator,
+    RenderCache,
+    RenderedEntry,
+    batch_response_body,
     generate_dockerfile_key_name,
+    generate_dockerfile_alias_name,
+    render_batch,
 )
-from src.s3_helper import upload_to_s3, check_if_file_exists_in_s3
-
-load_dotenv()
+from src.metrics import OUTCOME_CACHE_HIT, OUTCOME_ERROR, OUTCOME_UPLOADED, PhaseTimer, emit_metrics
+from src.s3_helper import put_alias, put_if_absent
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -30,6 +35,7 @@ __all__ = [
     "GenerateDockerfileRequest",
     "DockerfileGenerator",
     "generate_dockerfile_key_name",
+    "generate_dockerfile_alias_name",
     "is_running_on_lambda",
     "validate_env_vars",
     "lambda_handler",
@@ -42,6 +48,13 @@ def is_running_on_lambda() -> bool:
     return bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
 
 
+if not is_running_on_lambda():
+    # Lambda gets its configuration from the function environment, never a .env file
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
 def validate_env_vars() -> None:
     """Validate required environment variables are present."""
     if not os.getenv("S3_BUCKET"):
@@ -50,11 +63,15 @@ def validate_env_vars() -> None:
         raise ValueError("AWS_REGION environment variable is not set")
 
 
-CORS_HEADERS = {
-    "Access-Control-Allow-Origin": "*",
-    "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token",
-    "Access-Control-Allow-Methods": "POST,OPTIONS",
-}
+# Upper bound on configs accepted in one batch request, and on concurrent S3 calls per batch.
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "250"))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "16"))
+
+# Rendered Dockerfiles kept per warm container, bounded by entry count and total bytes.
+RENDER_CACHE_MAX_ENTRIES = int(os.getenv("RENDER_CACHE_MAX_ENTRIES", "256"))
+RENDER_CACHE_MAX_BYTES = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+
+render_cache = RenderCache(max_entries=RENDER_CACHE_MAX_ENTRIES, max_bytes=RENDER_CACHE_MAX_BYTES)
 
 
 def _response(status_code: int, body: dict) -> dict:
@@ -65,12 +82,158 @@ def _response(status_code: int, body: dict) -> dict:
     }
 
 
+def _object_key(config: GenerateDockerfileRequest, dockerfile_key_name: str) -> str:
+    return os.path.join(f"{config.language.lower()}-images/", dockerfile_key_name)
+
+
+def _alias_key(config: GenerateDockerfileRequest) -> str:
+    return os.path.join(
+        f"{config.language.lower()}-images/", "aliases", f"{generate_dockerfile_alias_name(config)}.json"
+    )
+
+
+def _alias_manifest(config: GenerateDockerfileRequest, object_key: str) -> str:
+    """JSON manifest mapping a readable alias onto its content-addressed object."""
+    return json.dumps({"key": object_key, **config.model_dump()}, sort_keys=True)
+
+
+def _persist_dockerfile(
+    config: GenerateDockerfileRequest,
+    dockerfile_key_name: str,
+    content: str,
+    timer: Optional[PhaseTimer] = None,
+) -> bool:
+    """Write the Dockerfile and its alias manifest to disk locally, or to S3 on Lambda.
+
+    The Dockerfile is only put if it is not already in S3, and the alias manifest
+    whenever it does not already point at that object: configs that render to the
+    same object can still have different aliases (e.g. ``system_packages=[]`` when
+    the stack needs none). Warm containers skip S3 for both once they are written.
+
+    Returns:
+        True if the Dockerfile was written, False if it already existed in S3.
+
+    Raises:
+        Exception: propagated from the S3 helpers when the upload fails.
+    """
+    timer = timer or PhaseTimer()
+    object_key = _object_key(config, dockerfile_key_name)
+
+    if not is_running_on_lambda():
+        os.makedirs(os.path.dirname(object_key), exist_ok=True)
+        with open(object_key, "w", encoding="utf-8") as f:
+            f.write(content)
+        _persist_alias(config, object_key, timer)
+        return True
+
+    with timer.phase("S3Put"):
+        created = put_if_absent(
+            file_path=object_key,
+            bucket=os.getenv("S3_BUCKET"),
+            content=content,
+            region_name=os.getenv("AWS_REGION"),
+        )
+    _persist_alias(config, object_key, timer)
+    return created
+
+
+def _persist_alias(config: GenerateDockerfileRequest, object_key: str, timer: Optional[PhaseTimer] = None) -> None:
+    """Write (or overwrite, so it follows template changes) the alias manifest pointing at ``object_key``.
+
+    On Lambda, an alias this container already pointed at ``object_key`` is not written again.
+    """
+    timer = timer or PhaseTimer()
+    alias_key = _alias_key(config)
+    manifest = _alias_manifest(config, object_key)
+    if not is_running_on_lambda():
+        os.makedirs(os.path.dirname(alias_key), exist_ok=True)
+        with open(alias_key, "w", encoding="utf-8") as f:
+            f.write(manifest)
+        return
+    with timer.phase("AliasPut"):
+        put_alias(
+            file_path=alias_key,
+            bucket=os.getenv("S3_BUCKET"),
+            content=manifest,
+            region_name=os.getenv("AWS_REGION"),
+            target=object_key,
+        )
+
+
+def _persist_group(items: list[RenderedEntry]) -> None:
+    """Persist a batch group that shares one object: the object once, and every distinct alias."""
+    _, config, dockerfile_key_name, dockerfile_content = items[0]
+    _persist_dockerfile(config, dockerfile_key_name, dockerfile_content)
+    object_key = _object_key(config, dockerfile_key_name)
+    written = {_alias_key(config)}
+    for _, other, _, _ in items[1:]:
+        if _alias_key(other) not in written:
+            written.add(_alias_key(other))
+            _persist_alias(other, object_key)
+
+
+def _batch_handler(configs: Any, request_id: str, timer: PhaseTimer) -> tuple[dict, int]:
+    """Validate and render every config (see ``render_batch``), then persist them concurrently.
+
+    Entries that render to the same object are persisted once, with an alias
+    manifest for each distinct alias among them.
+
+    Returns:
+        The API response and the number of failed entries.
+    """
+    results, rendered = render_batch(configs, render_cache, BATCH_MAX_SIZE, timer)
+    pending: dict[str, list[RenderedEntry]] = {}
+    for entry in rendered:
+        _, config, dockerfile_key_name, _ = entry
+        pending.setdefault(_object_key(config, dockerfile_key_name), []).append(entry)
+
+    if pending:
+        with timer.phase("S3Put"), ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(pending))) as pool:
+            futures = {
+                pool.submit(_persist_group, items): items
+                for items in pending.values()
+            }
+            for future, items in futures.items():
+                error = future.exception()
+                if error is not None:
+                    for index, _, _, _ in items:
+                        results[index] = {"index": index, "error": f"Failed to upload Dockerfile to S3, {error}"}
+
+    failed = sum(1 for result in results if "error" in result)
+    logger.info(json.dumps({
+        "request_id": request_id,
+        "batch_size": len(configs),
+        "succeeded": len(configs) - failed,
+        "failed": failed,
+        "status_code": 200,
+        **render_cache.stats(),
+    }))
+    return _response(200, batch_response_body(results)), failed
+
+
 def lambda_handler(event: dict[str, Any], context: Optional[dict] = None) -> dict:
-    """AWS Lambda handler for the Dockerfile generation API endpoint."""
+    """AWS Lambda handler for the Dockerfile generation API endpoint.
+
+    Every invocation emits one EMF metrics record timing its phases
+    (Validation, Render, S3Put, AliasPut), with Language and Outcome
+    dimensions; batches report Language "batch".
+    """
     request_id = getattr(context, "aws_request_id", "local") if context else "local"
+    timer = PhaseTimer()
+    dimensions = {"Language": "unknown", "Outcome": OUTCOME_ERROR}
+    properties: dict[str, Any] = {"request_id": request_id}
     try:
-        validate_env_vars()
-        config = GenerateDockerfileRequest.from_event(event)
+        with timer.phase("Validation"):
+            validate_env_vars()
+            body = GenerateDockerfileEvent.model_validate_json(event["body"])
+        if body.configs is not None:
+            dimensions["Language"] = "batch"
+            response, failed = _batch_handler(body.configs, request_id, timer)
+            properties.update(batch_size=len(body.configs), failed=failed)
+            dimensions["Outcome"] = OUTCOME_ERROR if failed else OUTCOME_UPLOADED
+            return response
+        config = body.config
+        dimensions["Language"] = config.language
 
         logger.info(json.dumps({
             "request_id": request_id,
@@ -80,51 +243,33 @@ def lambda_handler(event: dict[str, Any], context: Optional[dict] = None) -> dic
             "status": "processing",
         }))
 
-        generator = DockerfileGenerator(config=config)
-        dockerfile_content = generator.generate_dockerfile()
-
-        dockerfile_key_name = generate_dockerfile_key_name(config)
-        path = f"{config.language.lower()}-images/"
-
-        if not is_running_on_lambda():
-            os.makedirs(path, exist_ok=True)
-            with open(os.path.join(path, dockerfile_key_name), "w", encoding="utf-8") as f:
-                f.write(dockerfile_content)
-
-        aws_region = os.getenv("AWS_REGION")
-        bucket = os.getenv("S3_BUCKET")
-
-        if is_running_on_lambda():
-            s3_key = os.path.join(path, dockerfile_key_name)
-            if not check_if_file_exists_in_s3(
-                bucket=bucket,
-                key=s3_key,
-                region_name=aws_region,
-            ):
-                try:
-                    upload_to_s3(
-                        file_path=s3_key,
-                        bucket=bucket,
-                        content=dockerfile_content,
-                        region_name=aws_region,
-                    )
-                except Exception as e:
-                    logger.error(json.dumps({
-                        "request_id": request_id,
-                        "error": f"S3 upload failed: {e}",
-                        "status_code": 500,
-                    }))
-                    return _response(500, {"error": f"Failed to upload Dockerfile to S3, {e}"})
+        hits_before = render_cache.hits
+        with timer.phase("Render"):
+            dockerfile_content, dockerfile_key_name = render_cache.get_or_render(config)
+        properties["render_cache_hit"] = render_cache.hits > hits_before
+
+        try:
+            created = _persist_dockerfile(config, dockerfile_key_name, dockerfile_content, timer)
+        except Exception as e:
+            logger.error(json.dumps({
+                "request_id": request_id,
+                "error": f"S3 upload failed: {e}",
+                "status_code": 500,
+            }))
+            return _response(500, {"error": f"Failed to upload Dockerfile to S3, {e}"})
+        dimensions["Outcome"] = OUTCOME_UPLOADED if created else OUTCOME_CACHE_HIT
 
         logger.info(json.dumps({
             "request_id": request_id,
             "language": config.language,
             "dependency_stack": config.dependency_stack,
             "status_code": 200,
+            **render_cache.stats(),
         }))
         return _response(200, {
             "message": "Dockerfile generated successfully",
             "key": dockerfile_key_name,
+            "alias": generate_dockerfile_alias_name(config),
             "dockerfile": dockerfile_content,
         })
     except Exception as e:
@@ -134,3 +279,5 @@ def lambda_handler(event: dict[str, Any], context: Optional[dict] = None) -> dic
             "status_code": 400,
         }))
         return _response(400, {"error": str(e)})
+    finally:
+        emit_metrics(timer, dimensions, **properties)
@@ -1,22 +1,318 @@
 """Core Dockerfile generation logic, decoupled from AWS dependencies."""
 
+import hashlib
 import json
+import os
 import re
-from typing import Any
+import shlex
+import threading
+from collections import OrderedDict
+from functools import cache, lru_cache
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, field_validator, model_validator
 
 from src.docker_templates import python_template, javascript_template, go_template, rust_template, java_template
+from src.metrics import PhaseTimer
 
-TEMPLATE_REGISTRY: dict[str, tuple] = {
-    "python": (python_template.START_OF_TEMPLATE, python_template.END_OF_TEMPLATE, "PYTHON_VERSION"),
-    "javascript": (javascript_template.START_OF_TEMPLATE, javascript_template.END_OF_TEMPLATE, "NODE_VERSION"),
-    "go": (go_template.START_OF_TEMPLATE, go_template.END_OF_TEMPLATE, "GO_VERSION"),
-    "rust": (rust_template.START_OF_TEMPLATE, rust_template.END_OF_TEMPLATE, "RUST_VERSION"),
-    "java": (java_template.START_OF_TEMPLATE, java_template.END_OF_TEMPLATE, "JAVA_VERSION"),
+# Placeholders shared by every template, mapped to the slot they fill at render time.
+# RUN_APT and RUN_INSTALL stand for the RUN keyword of the system-package and
+# package-install steps, so options such as cache mounts can extend them.
+# EXTRAS_LAYER marks where the extra dependencies get their own install layer,
+# rendered from the template's extras layer (which uses EXTRA_DEPENDENCIES).
+# Every compiled template also gets an implicit "lockfile_layer" slot between
+# its start and END_OF_TEMPLATE, where a project's lockfile is installed.
+# INSTALLER_SETUP, PACKAGE_INSTALL, PACKAGE_BUILD, PACKAGE_COPY and UV_SETUP
+# (uv for a uv.lock layer, unless the installer already provides it) are filled
+# from the selected entry of the template module's INSTALLERS. SYSTEM_PACKAGES
+# is the final stage's apt layer, rendered by system_packages_step.
+TEMPLATE_PLACEHOLDERS: dict[str, str] = {
+    "DEPENDENCY_STACK": "dependency_stack",
+    "EXTRA_DEPENDENCIES": "extra_dependencies",
+    "EXTRAS_LAYER": "extras_layer",
+    "RUN_APT": "run_apt",
+    "RUN_INSTALL": "run_install",
+    "INSTALLER_SETUP": "installer_setup",
+    "PACKAGE_INSTALL": "package_install",
+    "PACKAGE_BUILD": "package_build",
+    "PACKAGE_COPY": "package_copy",
+    "UV_SETUP": "uv_setup",
+    "SYSTEM_PACKAGES": "system_packages",
 }
+INSTALLER_SLOTS = frozenset({"installer_setup", "package_install", "package_build", "package_copy", "uv_setup"})
+
+_PLACEHOLDER_PATTERN = re.compile(
+    r"\b(?:[A-Z]+_VERSION|" + "|".join(TEMPLATE_PLACEHOLDERS) + r")\b"
+)
+
+
+class CompiledTemplate:
+    """A template pre-split into static segments and named slots.
+
+    ``parts`` holds the static text with an empty string at every slot
+    position; ``slots`` maps those positions to slot names. Rendering fills
+    the slots and joins once instead of rescanning the whole template.
+    """
+
+    __slots__ = ("parts", "slots")
+
+    def __init__(self, parts: list[str], slots: list[tuple[int, str]]) -> None:
+        self.parts = parts
+        self.slots = slots
+
+    @property
+    def slot_names(self) -> set[str]:
+        return {name for _, name in self.slots}
+
+    def render(self, values: dict[str, str]) -> str:
+        """Fill every slot from ``values`` and return the rendered template."""
+        parts = self.parts.copy()
+        for index, name in self.slots:
+            parts[index] = values[name]
+        return "".join(parts)
+
+    def bind(self, values: dict[str, "str | CompiledTemplate"]) -> "CompiledTemplate":
+        """Fill the slots named in ``values`` ahead of time and return the smaller template.
+
+        A value may itself be a CompiledTemplate, which is spliced in with its
+        own slots bound from the same ``values``. Slots not in ``values`` stay
+        open, and neighbouring static text is merged into one segment.
+        """
+        parts: list[str] = []
+        slots: list[tuple[int, str]] = []
+
+        def add(template: CompiledTemplate) -> None:
+            names = dict(template.slots)
+            for index, part in enumerate(template.parts):
+                name = names.get(index)
+                value = part if name is None else values.get(name)
+                if isinstance(value, CompiledTemplate):
+                    add(value)
+                elif value is None:
+                    slots.append((len(parts), name))
+                    parts.append("")
+                elif parts and (not slots or slots[-1][0] != len(parts) - 1):
+                    parts[-1] += value
+                else:
+                    parts.append(value)
+
+        add(self)
+        return CompiledTemplate(parts, slots)
+
+
+def _split_slots(text: str, placeholders: dict[str, str]) -> tuple[list[str], list[tuple[int, str]], int]:
+    """Split ``text`` at its placeholders; returns the parts, the slots and where the last placeholder ended."""
+    parts: list[str] = []
+    slots: list[tuple[int, str]] = []
+    position = 0
+    for match in _PLACEHOLDER_PATTERN.finditer(text):
+        name = placeholders.get(match.group())
+        if name is None:
+            raise ValueError(
+                f"Unknown placeholder '{match.group()}' in template "
+                f"(expected version placeholder '{next(iter(placeholders))}')"
+            )
+        parts.append(text[position:match.start()])
+        slots.append((len(parts), name))
+        parts.append("")
+        position = match.end()
+    return parts, slots, position
+
+
+def compile_template(start_template: str, end_template: str, version_placeholder: str) -> CompiledTemplate:
+    """Compile a template pair into static segments and named slots.
+
+    The ``lockfile_layer`` slot sits between the two halves, at the end of the
+    final stage, so project dependencies install after the stack and extras.
+
+    Raises:
+        ValueError: if the template uses a placeholder that does not belong to
+            it, leaves a placeholder in ``end_template`` (which is never
+            substituted), or never references ``version_placeholder``.
+    """
+    placeholders = {version_placeholder: "language_version", **TEMPLATE_PLACEHOLDERS}
+    parts, slots, position = _split_slots(start_template, placeholders)
+
+    leftover = _PLACEHOLDER_PATTERN.search(end_template)
+    if leftover:
+        raise ValueError(f"Placeholder '{leftover.group()}' in END_OF_TEMPLATE would never be substituted")
+
+    parts.append(start_template[position:])
+    slots.append((len(parts), "lockfile_layer"))
+    template = CompiledTemplate(parts + ["", end_template], slots)
+    if "language_version" not in template.slot_names:
+        raise ValueError(f"Template never references its version placeholder '{version_placeholder}'")
+    return template
+
+
+def compile_layer(layer_template: str, version_placeholder: str, required_placeholder: str = "") -> CompiledTemplate:
+    """Compile a layer that fills a slot of a template (its extras or lockfile layer).
+
+    Raises:
+        ValueError: if the layer uses an unknown placeholder, nests another
+            EXTRAS_LAYER, or never references ``required_placeholder``.
+    """
+    placeholders = {version_placeholder: "language_version", **TEMPLATE_PLACEHOLDERS}
+    parts, slots, position = _split_slots(layer_template, placeholders)
+    layer = CompiledTemplate(parts + [layer_template[position:]], slots)
+    if "extras_layer" in layer.slot_names:
+        raise ValueError("A layer cannot contain EXTRAS_LAYER")
+    if required_placeholder and placeholders[required_placeholder] not in layer.slot_names:
+        raise ValueError(f"Layer never references {required_placeholder}")
+    return layer
+
+
+# Image variants: "full" builds on the full -bookworm images, "slim" on the
+# slim images without compilers, and "multistage" builds in a full builder
+# stage and copies only the artifacts into a slim runtime stage.
+VARIANTS = ("full", "slim", "multistage")
+DEFAULT_VARIANT = "full"
+
+TEMPLATE_REGISTRY: dict[str, tuple] = {}
+COMPILED_TEMPLATES: dict[str, CompiledTemplate] = {}
+VARIANT_TEMPLATES: dict[tuple[str, str], CompiledTemplate] = {}
+# Keyed like VARIANT_TEMPLATES; absent for templates without an EXTRAS_LAYER slot.
+EXTRAS_LAYERS: dict[tuple[str, str], CompiledTemplate] = {}
+# Keyed on (language, variant, lockfile name); LOCKFILE_SOURCES lists each
+# lockfile's required files per language, in order of preference.
+# LOCKFILE_STAGES are dependency pre-build stages placed before the template's
+# own stages. A module's MULTISTAGE_LOCKFILE_LAYERS / MULTISTAGE_LOCKFILE_STAGES
+# override its LOCKFILE_LAYERS / LOCKFILE_STAGES for the multistage variant.
+LOCKFILE_LAYERS: dict[tuple[str, str, str], CompiledTemplate] = {}
+LOCKFILE_STAGES: dict[tuple[str, str, str], CompiledTemplate] = {}
+LOCKFILE_SOURCES: dict[str, dict[str, tuple[str, ...]]] = {}
+# (language, lockfile) -> the installer whose cache a lockfile's layer uses, for
+# lockfiles installed by a fixed tool rather than the selected installer.
+LOCKFILE_INSTALLERS: dict[tuple[str, str], str] = {}
+# apt packages the final stage of each (language, variant) needs regardless of the stack.
+BASE_SYSTEM_PACKAGES: dict[tuple[str, str], tuple[str, ...]] = {}
+# Installer name -> values of the installer slots, per language; the first installer is the default.
+INSTALLERS: dict[str, dict[str, dict[str, str]]] = {}
+SUPPORTED_LANGUAGES: set[str] = set()
+
+# Installers of the languages whose templates call their toolchain directly.
+_BUILTIN_INSTALLERS = {"go": "go", "rust": "cargo", "java": "maven"}
+
+
+def default_installer(language: str) -> str:
+    return next(iter(INSTALLERS[language]))
+
+
+def _check_installer_slots(installers: dict[str, dict[str, str]], slot_names: set[str], what: str) -> None:
+    for installer, values in installers.items():
+        missing = (slot_names & INSTALLER_SLOTS) - values.keys()
+        if missing:
+            raise ValueError(f"Installer '{installer}' does not fill {', '.join(sorted(missing))} of {what}")
+
+
+def register_template(
+    language: str,
+    start_template: str,
+    end_template: str,
+    version_placeholder: str,
+    variant: str = DEFAULT_VARIANT,
+    extras_layer: str = "",
+    installers: Optional[dict[str, dict[str, str]]] = None,
+    system_packages: tuple[str, ...] = (),
+) -> None:
+    """Validate, compile and register the template for ``language`` (and ``variant``).
+
+    ``extras_layer`` is required exactly when the template has an EXTRAS_LAYER
+    slot, and every installer must fill the installer slots the template and
+    its extras layer use.
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant '{variant}'. Valid options are: {', '.join(VARIANTS)}")
+    installers = installers or {_BUILTIN_INSTALLERS.get(language, language): {}}
+    compiled = compile_template(start_template, end_template, version_placeholder)
+    if ("extras_layer" in compiled.slot_names) != bool(extras_layer):
+        raise ValueError(f"The {variant} {language} template needs an extras layer exactly when it has EXTRAS_LAYER")
+    slot_names = set(compiled.slot_names)
+    if extras_layer:
+        EXTRAS_LAYERS[(language, variant)] = compile_layer(extras_layer, version_placeholder, "EXTRA_DEPENDENCIES")
+        slot_names |= EXTRAS_LAYERS[(language, variant)].slot_names
+    _check_installer_slots(installers, slot_names, f"the {variant} {language} template")
+    VARIANT_TEMPLATES[(language, variant)] = compiled
+    BASE_SYSTEM_PACKAGES[(language, variant)] = tuple(system_packages)
+    if variant == DEFAULT_VARIANT:
+        INSTALLERS[language] = installers
+        COMPILED_TEMPLATES[language] = compiled
+        TEMPLATE_REGISTRY[language] = (start_template, end_template, version_placeholder)
+        SUPPORTED_LANGUAGES.add(language)
+
+
+for _language, _module, _version_placeholder in (
+    ("python", python_template, "PYTHON_VERSION"),
+    ("javascript", javascript_template, "NODE_VERSION"),
+    ("go", go_template, "GO_VERSION"),
+    ("rust", rust_template, "RUST_VERSION"),
+    ("java", java_template, "JAVA_VERSION"),
+):
+    _extras_layer = getattr(_module, "EXTRAS_LAYER", "")
+    _installers = getattr(_module, "INSTALLERS", None)
+    _system_packages = getattr(_module, "SYSTEM_PACKAGES", {})
+    register_template(
+        _language, _module.START_OF_TEMPLATE, _module.END_OF_TEMPLATE, _version_placeholder,
+        extras_layer=_extras_layer, installers=_installers, system_packages=_system_packages.get("full", ()),
+    )
+    register_template(
+        _language, _module.SLIM_START_OF_TEMPLATE, _module.END_OF_TEMPLATE, _version_placeholder, "slim",
+        extras_layer=_extras_layer, installers=_installers, system_packages=_system_packages.get("slim", ()),
+    )
+    register_template(
+        _language, _module.MULTISTAGE_START_OF_TEMPLATE, _module.END_OF_TEMPLATE, _version_placeholder, "multistage",
+        extras_layer=getattr(_module, "MULTISTAGE_EXTRAS_LAYER", _extras_layer), installers=_installers,
+        system_packages=_system_packages.get("multistage", ()),
+    )
+    LOCKFILE_SOURCES[_language] = getattr(_module, "LOCKFILE_SOURCES", {})
+    for _lockfile, _installer in getattr(_module, "LOCKFILE_INSTALLERS", {}).items():
+        LOCKFILE_INSTALLERS[(_language, _lockfile)] = _installer
+    for _variant in VARIANTS:
+        _lockfile_layers = getattr(_module, "LOCKFILE_LAYERS", {})
+        _lockfile_stages = getattr(_module, "LOCKFILE_STAGES", {})
+        if _variant == "multistage":
+            _lockfile_layers = {**_lockfile_layers, **getattr(_module, "MULTISTAGE_LOCKFILE_LAYERS", {})}
+            _lockfile_stages = {**_lockfile_stages, **getattr(_module, "MULTISTAGE_LOCKFILE_STAGES", {})}
+        _orphans = _lockfile_stages.keys() - _lockfile_layers.keys()
+        if _orphans:
+            raise ValueError(f"Dependency stages for {_language} {', '.join(sorted(_orphans))} have no matching LOCKFILE_LAYERS entry")
+        for _lockfile, _layer in _lockfile_layers.items():
+            _key = (_language, _variant, _lockfile)
+            LOCKFILE_LAYERS[_key] = compile_layer(_layer, _version_placeholder)
+            if _lockfile in _lockfile_stages:
+                LOCKFILE_STAGES[_key] = compile_layer(_lockfile_stages[_lockfile], _version_placeholder)
+            _check_installer_slots(
+                INSTALLERS[_language],
+                LOCKFILE_LAYERS[_key].slot_names | (LOCKFILE_STAGES[_key].slot_names if _key in LOCKFILE_STAGES else set()),
+                f"the {_variant} {_language} {_lockfile} layer",
+            )
+
+# Expected image size before stack and extra packages, stated at the top of every Dockerfile.
+IMAGE_SIZE_CLASSES: dict[str, dict[str, str]] = {
+    "python": {"full": "large (~1.1 GB)", "slim": "small (~200 MB)", "multistage": "small (~200 MB)"},
+    "javascript": {"full": "large (~1.1 GB)", "slim": "small (~250 MB)", "multistage": "small (~250 MB)"},
+    "go": {"full": "large (~1 GB)", "slim": "medium (~400 MB)", "multistage": "medium (~400 MB)"},
+    "rust": {"full": "large (~1.6 GB)", "slim": "medium (~900 MB)", "multistage": "medium (~900 MB)"},
+    "java": {"full": "medium (~800 MB)", "slim": "medium (~550 MB)", "multistage": "medium (~550 MB)"},
+}
+
+
+def size_class_comment(language: str, variant: str) -> str:
+    size = IMAGE_SIZE_CLASSES.get(language, {}).get(variant, "unknown")
+    return f"# Image variant: {variant} - expected size class: {size}, before stack and extra packages\n"
+
+
+def detect_lockfile(directory: str, language: str) -> Optional[str]:
+    """Return the preferred lockfile of ``language`` found in ``directory``, or None.
+
+    Only the top level is checked, one stat per candidate file, so large
+    trees (and their node_modules) are never walked.
+    """
+    for lockfile, sources in LOCKFILE_SOURCES.get(language.strip().lower(), {}).items():
+        if all(os.path.isfile(os.path.join(directory, source)) for source in sources):
+            return lockfile
+    return None
 
-SUPPORTED_LANGUAGES = set(TEMPLATE_REGISTRY.keys())
 
 VALID_VERSIONS: dict[str, list[str]] = {
     "python": ["3.12", "3.11", "3.10", "3.9"],
@@ -55,10 +351,129 @@ STACK_PACKAGES: dict[str, str] = {
     "Gradle Build Stack": "gradle",
 }
 
+# apt packages each stack needs at runtime, on top of the template's base set. Only the final stage
+# installs them: multistage builders use the full images, which already ship the common headers.
+STACK_SYSTEM_PACKAGES: dict[str, tuple[str, ...]] = {
+    # Python: psycopg2-binary, lxml, numpy and tensorflow all ship manylinux wheels
+    "Django Stack": (),
+    "Flask Stack": (),
+    "Data Science Stack": (),
+    "Web Scraping Stack": (),
+    "Machine Learning Stack": (),
+    # JavaScript
+    "Express Stack": (),
+    "React Stack": (),
+    "Vue.js Stack": (),
+    "Node.js API Stack": (),
+    "Full-Stack JavaScript": (),
+    # Go: static binaries
+    "Gin Stack": (),
+    "Beego Stack": (),
+    "Web Framework Stack": (),
+    "Microservices Stack": (),
+    "Data Processing Stack": (),
+    # Rust: openssl-sys links against the system OpenSSL
+    "Actix-Web Stack": ("libssl-dev", "pkg-config"),
+    "CLI Tools Stack": (),
+    "WebAssembly Stack": ("libssl-dev", "pkg-config"),
+    # Java
+    "Spring Boot Stack": (),
+    "Maven Build Stack": (),
+    "Gradle Build Stack": (),
+}
+
+
+def system_packages_step(run_apt: str, packages: tuple[str, ...] | list[str]) -> str:
+    """Value of the SYSTEM_PACKAGES slot: one apt layer for ``packages``, or nothing when there are none."""
+    if not packages:
+        return ""
+    lines = "".join(f"    {package} \\\n" for package in sorted(set(packages)))
+    return (
+        f"\n# Install system dependencies\n{run_apt} apt-get update && apt-get install -y --no-install-recommends \\\n"
+        f"{lines}    && rm -rf /var/lib/apt/lists/*\n"
+    )
+
+
+# BuildKit cache mounts used with ``cache_mounts``: package manager download and
+# build caches persist across rebuilds without ending up in the image.
+BUILDKIT_SYNTAX = "# syntax=docker/dockerfile:1\n"
+
+CACHE_MOUNT_TARGETS: dict[str, tuple[str, ...]] = {
+    "python": ("/root/.cache/pip",),
+    "javascript": ("/root/.npm",),
+    "go": ("/go/pkg/mod", "/root/.cache/go-build"),
+    "rust": ("/usr/local/cargo/registry", "/usr/local/cargo/git", "/root/.cache/cargo-target"),
+}
+
+# Caches of the non-default installers, used instead of the language's.
+INSTALLER_CACHE_MOUNT_TARGETS: dict[str, tuple[str, ...]] = {
+    "uv": ("/root/.cache/uv",),
+    "pnpm": ("/root/.local/share/pnpm/store",),
+}
+
+# Environment for the install command when its cache is mounted (cargo install
+# otherwise builds in a throwaway target directory).
+CACHE_MOUNT_ENV: dict[str, str] = {
+    "rust": "CARGO_TARGET_DIR=/root/.cache/cargo-target",
+}
+
+# Debian images delete downloaded .debs after every install; keep them so the apt cache mount is useful.
+_APT_KEEP_CACHE = (
+    "RUN rm -f /etc/apt/apt.conf.d/docker-clean \\\n"
+    "    && echo 'Binary::apt::APT::Keep-Downloaded-Packages \"true\";' > /etc/apt/apt.conf.d/keep-cache\n"
+)
+
+
+def _cached_run(targets: tuple[str, ...], sharing: str = "", env: str = "") -> str:
+    """A RUN keyword with cache mounts, continued onto the command's line."""
+    if not targets:
+        return "RUN"
+    options = f",sharing={sharing}" if sharing else ""
+    lines = ["RUN"] + [f"--mount=type=cache,target={target}{options}" for target in targets]
+    prefix = " \\\n    ".join([" ".join(lines[:2])] + lines[2:]) + " \\\n   "
+    return prefix + (f" {env}" if env else "")
+
+
+def run_keywords(language: str, cache_mounts: bool, installer: str = "") -> dict[str, str]:
+    """Values for the RUN_APT and RUN_INSTALL slots of ``language``'s template."""
+    if not cache_mounts:
+        return {"run_apt": "RUN", "run_install": "RUN"}
+    targets = INSTALLER_CACHE_MOUNT_TARGETS.get(installer) or CACHE_MOUNT_TARGETS.get(language, ())
+    return {
+        "run_apt": _APT_KEEP_CACHE + _cached_run(("/var/cache/apt",), sharing="locked"),
+        "run_install": _cached_run(targets, env=CACHE_MOUNT_ENV.get(language, "")),
+    }
+
+
+# Compiled once: the validator runs for every request, and re.compile's own cache still costs a lookup per call.
+# Covers pip/uv requirement specifiers and npm/pnpm specs such as @scope/pkg@^1.2.
+_DEPENDENCY_PATTERN = re.compile(r"^[a-zA-Z0-9@][a-zA-Z0-9._\-\[\]>=<!, @/^~]*$")
+# Debian package names: lowercase alphanumerics, '+', '-' and '.', at least two characters.
+_SYSTEM_PACKAGE_PATTERN = re.compile(r"^[a-z0-9][a-z0-9+.\-]+$")
+
+
+@lru_cache(maxsize=1024)
+def _shell_words(words: tuple[str, ...]) -> str:
+    """Join ``words`` for a shell command line, quoting those that need it."""
+    # Cached: the same extras recur across requests, and shlex.quote per word dominated a render
+    return " ".join(shlex.quote(word) for word in words)
+
+
+# Response headers for the generate-dockerfile API, shared by the Lambda handler and `stackfordev serve`.
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token",
+    "Access-Control-Allow-Methods": "POST,OPTIONS",
+}
+
 
 class GenerateDockerfileRequest(BaseModel):
     """Pydantic model representing the API request for Dockerfile generation."""
 
+    # Build the validator on first use, not at import, so CLI paths that never validate stay fast.
+    # Unknown fields are rejected, so a client newer than the API fails instead of silently losing options.
+    model_config = ConfigDict(defer_build=True, extra="forbid")
+
     language: str = Field(
         ..., description="Programming language for the Dockerfile (e.g. python, node)"
     )
@@ -71,11 +486,28 @@ class GenerateDockerfileRequest(BaseModel):
     language_version: str = Field(
         ..., description="Version of the programming language (e.g. 3.11)"
     )
+    cache_mounts: bool = Field(
+        default=False, description="Use BuildKit cache mounts for apt and the language's package manager"
+    )
+    variant: str = Field(
+        default=DEFAULT_VARIANT, description="Image variant: full, slim or multistage"
+    )
+    lockfile: Optional[str] = Field(
+        default=None, description="Project lockfile to install from in its own layer (e.g. poetry.lock)"
+    )
+    installer: Optional[str] = Field(
+        default=None, validate_default=True,
+        description="Package installer (python: pip or uv, javascript: npm or pnpm); defaults per language",
+    )
+    system_packages: Optional[list[str]] = Field(
+        default=None, description="apt packages replacing the stack's own; the template's base packages stay"
+    )
 
     @field_validator("language", mode="before")
     @classmethod
-    def normalize_language(cls, v: str) -> str:
-        normalized = v.strip().lower()
+    def normalize_language(cls, v: Any) -> str:
+        # Runs before type checking, so non-string input must fail here as a ValueError
+        normalized = v.strip().lower() if isinstance(v, str) else None
         if normalized not in SUPPORTED_LANGUAGES:
             valid = ", ".join(sorted(SUPPORTED_LANGUAGES))
             raise ValueError(
@@ -83,19 +515,73 @@ class GenerateDockerfileRequest(BaseModel):
             )
         return normalized
 
-    @field_validator("extra_dependencies", mode="before")
+    @field_validator("extra_dependencies")
     @classmethod
     def sanitize_dependencies(cls, v: list[str]) -> list[str]:
         """Validate extra dependencies against injection attacks."""
-        pattern = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9._\-\[\]>=<!, ]*$")
         for dep in v:
-            if not pattern.match(dep):
+            if not _DEPENDENCY_PATTERN.match(dep):
                 raise ValueError(
                     f"Invalid dependency name: '{dep}'. "
                     "Only alphanumeric characters, hyphens, dots, and version specifiers are allowed."
                 )
         return v
 
+    @field_validator("extra_dependencies")
+    @classmethod
+    def canonicalize_dependencies(cls, v: list[str]) -> list[str]:
+        """Strip, de-duplicate and sort extras so equivalent requests render identically."""
+        return sorted({dep.strip() for dep in v if dep.strip()})
+
+    @field_validator("system_packages")
+    @classmethod
+    def validate_system_packages(cls, v: Optional[list[str]]) -> Optional[list[str]]:
+        """Validate apt package names (they are rendered unquoted) and sort them for stable output."""
+        if v is None:
+            return v
+        packages = {package.strip() for package in v if package.strip()}
+        for package in packages:
+            if not _SYSTEM_PACKAGE_PATTERN.match(package):
+                raise ValueError(
+                    f"Invalid system package name: '{package}'. "
+                    "Only lowercase alphanumeric characters, '+', '-' and '.' are allowed."
+                )
+        return sorted(packages)
+
+    @field_validator("variant", mode="before")
+    @classmethod
+    def validate_variant(cls, v: str) -> str:
+        normalized = v.strip().lower() if isinstance(v, str) else v
+        if normalized not in VARIANTS:
+            raise ValueError(f"Unsupported variant '{v}'. Valid options are: {', '.join(VARIANTS)}.")
+        return normalized
+
+    @field_validator("lockfile")
+    @classmethod
+    def validate_lockfile(cls, v: Optional[str], info: Any) -> Optional[str]:
+        language = info.data.get("language", "") if info.data else ""
+        if language not in SUPPORTED_LANGUAGES:
+            # The language error already explains the request; don't add a lockfile one on top
+            return v
+        if v is not None and (language, DEFAULT_VARIANT, v) not in LOCKFILE_LAYERS:
+            supported = ", ".join(LOCKFILE_SOURCES.get(language, {})) or "none"
+            raise ValueError(f"Unsupported lockfile '{v}' for {language}. Supported: {supported}")
+        return v
+
+    @field_validator("installer", mode="before")
+    @classmethod
+    def validate_installer(cls, v: Optional[str], info: Any) -> Optional[str]:
+        language = info.data.get("language", "") if info.data else ""
+        if language not in INSTALLERS:
+            return v
+        installers = INSTALLERS[language]
+        if v is None:
+            return default_installer(language)
+        normalized = v.strip().lower() if isinstance(v, str) else None
+        if normalized not in installers:
+            raise ValueError(f"Unsupported installer '{v}' for {language}. Supported: {', '.join(installers)}")
+        return normalized
+
     @field_validator("language_version")
     @classmethod
     def validate_language_version(cls, v: str, info: Any) -> str:
@@ -110,19 +596,129 @@ class GenerateDockerfileRequest(BaseModel):
 
     @property
     def extra_dependencies_str(self) -> str:
-        """Convert the list of extra dependencies to a space-separated string."""
-        return " ".join(self.extra_dependencies)
+        """Convert the list of extra dependencies to a space-separated string, shell-quoted where needed."""
+        return _shell_words(tuple(self.extra_dependencies))
+
+    def canonical_key(self) -> str:
+        """Stable serialisation of the request; equivalent requests share it."""
+        return json.dumps(self.model_dump(), sort_keys=True)
 
     @classmethod
     def from_event(cls, event: dict[str, Any]) -> "GenerateDockerfileRequest":
         """Create a GenerateDockerfileRequest instance from an API Gateway event."""
-        dict_obj = json.loads(event["body"])
-        return cls(**dict_obj["config"])
+        body = GenerateDockerfileEvent.model_validate_json(event["body"])
+        if body.config is None:
+            raise ValueError("Request body must contain 'config'")
+        return body.config
+
+
+class GenerateDockerfileEvent(BaseModel):
+    """Body of a generate-dockerfile API call: a single ``config`` or a batch of ``configs``.
+
+    Validated straight from the raw body with ``model_validate_json``, so the
+    JSON is parsed and the request validated in one pass inside pydantic-core.
+    Batch entries are kept raw and validated by ``validate_requests``, which
+    reports errors per entry.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    config: Optional[GenerateDockerfileRequest] = None
+    configs: Optional[list[Any]] = None
+
+    @model_validator(mode="after")
+    def require_config_or_configs(self) -> "GenerateDockerfileEvent":
+        if (self.config is None) == (self.configs is None):
+            raise ValueError("Request body must contain exactly one of 'config' or 'configs'")
+        return self
+
+
+@cache
+def request_list_adapter() -> TypeAdapter:
+    """TypeAdapter validating a list of requests in one call; built on first use."""
+    return TypeAdapter(list[GenerateDockerfileRequest])
+
+
+def validate_requests(raw_configs: list[Any]) -> list["GenerateDockerfileRequest | ValidationError"]:
+    """Validate batch entries, returning a request or the entry's ValidationError for each.
+
+    The whole list is validated in a single pydantic-core call; only when some
+    entry is invalid are the entries revalidated one by one to attribute errors.
+    """
+    try:
+        return request_list_adapter().validate_python(raw_configs)
+    except ValidationError:
+        pass
+    results: list[GenerateDockerfileRequest | ValidationError] = []
+    for raw_config in raw_configs:
+        try:
+            results.append(GenerateDockerfileRequest.model_validate(raw_config))
+        except ValidationError as e:
+            results.append(e)
+    return results
+
+
+def validation_error_message(error: ValidationError) -> str:
+    """Flatten a ValidationError into one line, e.g. "Unsupported version '2.7' for python. ..."."""
+    messages = []
+    for detail in error.errors():
+        message = detail["msg"].removeprefix("Value error, ")
+        if detail["type"] != "value_error" and detail["loc"]:
+            message = f"{'.'.join(str(part) for part in detail['loc'])}: {message}"
+        messages.append(message)
+    return "; ".join(messages)
+
+
+# Per-request slots left open in the templates bound by ``option_template``.
+REQUEST_SLOTS = frozenset({"language_version", "dependency_stack", "extra_dependencies"})
+
+
+@lru_cache(maxsize=512)
+def option_template(
+    language: str,
+    variant: str,
+    installer: str,
+    cache_mounts: bool,
+    lockfile: Optional[str],
+    system_packages: tuple[str, ...],
+    with_extras: bool,
+) -> CompiledTemplate:
+    """The whole Dockerfile for one combination of options, with only ``REQUEST_SLOTS`` left to fill.
+
+    Cache mounts, installer, apt, extras and lockfile fragments are worked out
+    once per combination, so a render only fills the version, stack and
+    extras. The key is bounded by the registries except for
+    ``system_packages``, hence the LRU.
+    """
+    template_key = (language, variant)
+    values: dict[str, str | CompiledTemplate] = {
+        **run_keywords(language, cache_mounts, installer),
+        **INSTALLERS[language][installer],
+    }
+    values["system_packages"] = system_packages_step(values["run_apt"], BASE_SYSTEM_PACKAGES[template_key] + system_packages)
+    # Extras get their own layer after the stack, so changing them keeps the stack layer cached
+    extras_layer = EXTRAS_LAYERS.get(template_key)
+    values["extras_layer"] = extras_layer if extras_layer and with_extras else ""
+    values["lockfile_layer"] = values["stages"] = ""
+    if lockfile:
+        # A lockfile installed by a fixed tool (npm ci, uv sync) mounts that tool's cache, whatever the installer
+        lockfile_installer = LOCKFILE_INSTALLERS.get((language, lockfile), installer)
+        lockfile_values = {**values, **run_keywords(language, cache_mounts, lockfile_installer)}
+        values["lockfile_layer"] = LOCKFILE_LAYERS[(language, variant, lockfile)].bind(lockfile_values)
+        stages = LOCKFILE_STAGES.get((language, variant, lockfile))
+        values["stages"] = stages.bind(lockfile_values) if stages else ""
+    # Parser directives are only honoured on the very first line
+    values["preamble"] = (BUILDKIT_SYNTAX if cache_mounts else "") + size_class_comment(language, variant)
+    values["template"] = VARIANT_TEMPLATES[template_key]
+    whole = CompiledTemplate(["", "", ""], [(0, "preamble"), (1, "stages"), (2, "template")])
+    return whole.bind(values)
 
 
 class DockerfileGenerator(BaseModel):
     """Service class for generating Dockerfile content."""
 
+    model_config = ConfigDict(defer_build=True)
+
     config: GenerateDockerfileRequest
 
     def generate_dockerfile(self) -> str:
@@ -131,20 +727,191 @@ class DockerfileGenerator(BaseModel):
         if language not in TEMPLATE_REGISTRY:
             raise ValueError(f"Unsupported language: {self.config.language}. Supported: {', '.join(SUPPORTED_LANGUAGES)}")
 
-        start_template, end_template, version_placeholder = TEMPLATE_REGISTRY[language]
-        stack_packages = STACK_PACKAGES.get(self.config.dependency_stack, self.config.dependency_stack)
-        return (
-            start_template.replace(version_placeholder, self.config.language_version)
-            .replace("DEPENDENCY_STACK", stack_packages)
-            .replace("EXTRA_DEPENDENCIES", self.config.extra_dependencies_str)
-            + end_template
+        config = self.config
+        stack_system_packages = config.system_packages
+        if stack_system_packages is None:
+            stack_system_packages = STACK_SYSTEM_PACKAGES.get(config.dependency_stack, ())
+        template = option_template(
+            language,
+            config.variant,
+            config.installer or default_installer(language),
+            config.cache_mounts,
+            config.lockfile,
+            # Only the packages the image and stack need, so full images built on buildpack-deps skip apt entirely
+            tuple(stack_system_packages),
+            bool(config.extra_dependencies),
         )
+        return template.render({
+            "language_version": config.language_version,
+            "dependency_stack": STACK_PACKAGES.get(config.dependency_stack, config.dependency_stack),
+            "extra_dependencies": config.extra_dependencies_str,
+        })
 
 
-def generate_dockerfile_key_name(config: GenerateDockerfileRequest) -> str:
-    """Generate a unique S3 key name for the Dockerfile."""
-    extras = f"-{'-'.join(config.extra_dependencies)}" if config.extra_dependencies else ""
-    return (
-        f"dockerfile-{config.language}-{config.dependency_stack}-"
-        f"{config.language_version}{extras}.dockerfile"
-    )
+# Readable aliases longer than this are truncated before the request digest suffix.
+MAX_ALIAS_LENGTH = 200
+
+
+def content_digest(dockerfile_content: str) -> str:
+    """Return the short SHA-256 digest used to address rendered Dockerfiles."""
+    return hashlib.sha256(dockerfile_content.encode("utf-8")).hexdigest()[:16]
+
+
+def generate_dockerfile_key_name(config: GenerateDockerfileRequest, dockerfile_content: str | None = None) -> str:
+    """Generate the content-addressed S3 key name for the Dockerfile.
+
+    Identical Dockerfiles share one key regardless of how the request spelled
+    or ordered its extras. ``dockerfile_content`` is rendered when not given.
+    """
+    if dockerfile_content is None:
+        dockerfile_content = DockerfileGenerator(config=config).generate_dockerfile()
+    return f"dockerfile-{config.language}-{config.language_version}-{content_digest(dockerfile_content)}.dockerfile"
+
+
+def _alias_options(config: GenerateDockerfileRequest) -> list[str]:
+    """Tokens for the non-default generation options, so they show in the alias."""
+    options = []
+    if config.installer and config.installer != default_installer(config.language):
+        options.append(config.installer)
+    if config.variant != DEFAULT_VARIANT:
+        options.append(config.variant)
+    if config.cache_mounts:
+        options.append("cache")
+    if config.lockfile:
+        options.append(config.lockfile)
+    if config.system_packages is not None:
+        options.append("apt-" + ("+".join(config.system_packages) or "none"))
+    return options
+
+
+def generate_dockerfile_alias_name(config: GenerateDockerfileRequest) -> str:
+    """Generate the human-readable alias that maps onto the content-addressed key.
+
+    The readable part sanitises and joins values, so different requests can spell
+    it the same way (``["a b"]`` and ``["a-b"]``); the trailing digest of the
+    canonical request keeps their aliases, and the objects they point at, apart.
+    """
+    stack = re.sub(r"[^A-Za-z0-9.]+", "-", config.dependency_stack).strip("-")
+    extras = re.sub(r"[^A-Za-z0-9._+-]+", "-", "+".join(config.extra_dependencies))
+    options = "".join(f"~{option}" for option in _alias_options(config))
+    alias = f"{config.language}-{stack}-{config.language_version}{options}" + (f"+{extras}" if extras else "")
+    digest = hashlib.sha256(config.canonical_key().encode("utf-8")).hexdigest()[:12]
+    return f"{alias[:MAX_ALIAS_LENGTH - 13]}-{digest}"
+
+
+class RenderCache:
+    """Bounded LRU of rendered Dockerfiles and their S3 keys, keyed on the canonical request.
+
+    Evicts least-recently-used entries once either ``max_entries`` or
+    ``max_bytes`` (UTF-8 size of the cached content and keys) is exceeded.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.size_bytes = 0
+        self._entries: OrderedDict[str, tuple[str, str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_render(self, config: GenerateDockerfileRequest) -> tuple[str, str]:
+        """Return ``(dockerfile_content, key_name)``, rendering on a miss."""
+        cache_key = config.canonical_key()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[0], entry[1]
+            self.misses += 1
+
+        dockerfile_content = DockerfileGenerator(config=config).generate_dockerfile()
+        key_name = generate_dockerfile_key_name(config, dockerfile_content)
+        size = len(cache_key.encode("utf-8")) + len(dockerfile_content.encode("utf-8")) + len(key_name)
+        if size <= self.max_bytes:
+            with self._lock:
+                if cache_key not in self._entries:
+                    self._entries[cache_key] = (dockerfile_content, key_name, size)
+                    self.size_bytes += size
+                    while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                        _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                        self.size_bytes -= evicted_size
+        return dockerfile_content, key_name
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "render_cache_hits": self.hits,
+            "render_cache_misses": self.misses,
+            "render_cache_entries": len(self._entries),
+            "render_cache_bytes": self.size_bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# A rendered batch entry: (index, request, key name, Dockerfile content).
+RenderedEntry = tuple[int, GenerateDockerfileRequest, str, str]
+
+
+def batch_result(index: int, config: GenerateDockerfileRequest, key_name: str, dockerfile_content: str) -> dict:
+    """Response entry for a batch config that rendered."""
+    return {
+        "index": index,
+        "key": key_name,
+        "alias": generate_dockerfile_alias_name(config),
+        "dockerfile": dockerfile_content,
+    }
+
+
+def render_batch(
+    configs: Any, render_cache: RenderCache, max_size: int, timer: Optional[PhaseTimer] = None,
+) -> tuple[list[dict], list[RenderedEntry]]:
+    """Validate and render every config of a batch request, shared by the Lambda handler and the local server.
+
+    Each entry gets its own result or error, so one bad config does not fail
+    the batch.
+
+    Returns:
+        The per-entry results, in request order, and the entries that rendered.
+
+    Raises:
+        ValueError: if ``configs`` is not a non-empty list of at most ``max_size`` entries.
+    """
+    timer = timer or PhaseTimer()
+    if not isinstance(configs, list) or not configs:
+        raise ValueError("'configs' must be a non-empty list")
+    if len(configs) > max_size:
+        raise ValueError(f"Batch too large: {len(configs)} configs (max {max_size})")
+
+    results: list[dict] = [{} for _ in configs]
+    rendered: list[RenderedEntry] = []
+    with timer.phase("Validation"):
+        validated = validate_requests(configs)
+    for index, config in enumerate(validated):
+        if isinstance(config, ValidationError):
+            results[index] = {"index": index, "error": validation_error_message(config)}
+            continue
+        try:
+            with timer.phase("Render"):
+                dockerfile_content, key_name = render_cache.get_or_render(config)
+        except Exception as e:
+            results[index] = {"index": index, "error": str(e)}
+            continue
+        results[index] = batch_result(index, config, key_name, dockerfile_content)
+        rendered.append((index, config, key_name, dockerfile_content))
+    return results, rendered
+
+
+def batch_response_body(results: list[dict]) -> dict:
+    """Body of a batch response: a summary message and the per-entry results."""
+    succeeded = sum(1 for result in results if "error" not in result)
+    return {"message": f"Generated {succeeded} of {len(results)} Dockerfiles", "results": results}
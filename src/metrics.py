@@ -0,0 +1,103 @@
+"""Per-phase request timings emitted as CloudWatch Embedded Metric Format (EMF) records.
+
+A record is one JSON log line on stdout; CloudWatch Logs extracts the metrics
+from it asynchronously, so publishing costs no API calls. Records go through
+the ``stackfordev.metrics`` logger, which writes bare JSON (no level or
+timestamp prefix, which would stop CloudWatch from parsing it) and does not
+propagate to the Lambda runtime's root handler.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any
+
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "StackForDev")
+
+# Outcome dimension values
+OUTCOME_UPLOADED = "uploaded"
+OUTCOME_CACHE_HIT = "cache_hit"
+OUTCOME_ERROR = "error"
+
+
+class _StdoutHandler(logging.Handler):
+    """Write each record's message to the current ``sys.stdout``, so captured output sees it."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            sys.stdout.write(record.getMessage() + "\n")
+            sys.stdout.flush()
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+
+
+metrics_logger = logging.getLogger("stackfordev.metrics")
+metrics_logger.setLevel(logging.INFO)
+metrics_logger.propagate = False
+if not metrics_logger.handlers:
+    metrics_logger.addHandler(_StdoutHandler())
+
+
+class _Phase:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer: "PhaseTimer", name: str) -> None:
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = (time.perf_counter() - self.start) * 1000
+        durations = self.timer.durations
+        durations[self.name] = durations.get(self.name, 0.0) + elapsed
+
+
+class PhaseTimer:
+    """Accumulates wall-clock milliseconds per named phase, using the monotonic clock.
+
+    ``with timer.phase("Render"): ...`` adds the block's duration to that
+    phase; a phase entered more than once accumulates.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.durations: dict[str, float] = {}
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def total(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+def emf_record(timer: PhaseTimer, dimensions: dict[str, str], **properties: Any) -> dict[str, Any]:
+    """Build an EMF record with one ``<Phase>Time`` metric per timed phase plus ``TotalTime``.
+
+    ``properties`` are included as searchable, non-metric fields.
+    """
+    values = {f"{name}Time": round(ms, 3) for name, ms in timer.durations.items()}
+    values["TotalTime"] = round(timer.total(), 3)
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [list(dimensions)],
+                "Metrics": [{"Name": name, "Unit": "Milliseconds"} for name in values],
+            }],
+        },
+        **dimensions,
+        **values,
+        **properties,
+    }
+
+
+def emit_metrics(timer: PhaseTimer, dimensions: dict[str, str], **properties: Any) -> None:
+    """Log an EMF record for ``timer``; see ``emf_record``."""
+    if not metrics_logger.isEnabledFor(logging.INFO):
+        return
+    metrics_logger.info(json.dumps(emf_record(timer, dimensions, **properties)))
@@ -1,7 +1,85 @@
-"""Helper script with S3 functions"""
-from typing import Optional
-import boto3
-from mypy_boto3_s3.client import S3Client
+"""Helper script with S3 functions
+
+boto3/botocore are imported on first use rather than at module load, so
+code paths that never touch S3 do not pay for them on a cold start.
+"""
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3.client import S3Client
+
+# Connection pool size per client; keep it at or above BATCH_MAX_WORKERS.
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "3"))
+S3_RETRY_MODE = os.getenv("S3_RETRY_MODE", "standard")
+
+# Upper bound on (bucket, key) pairs remembered as existing before the set is reset.
+S3_KNOWN_KEYS_MAX = int(os.getenv("S3_KNOWN_KEYS_MAX", "10000"))
+
+_clients: dict[str, "S3Client"] = {}
+_clients_lock = threading.Lock()
+_client_factory: Optional[Callable[[str], "S3Client"]] = None
+
+# Objects this process has seen or written. Objects only expire through the
+# bucket's 365-day lifecycle rule, so a warm container can skip S3 for them.
+_known_keys: set[tuple[str, str]] = set()
+
+# Alias manifests this process has written: (bucket, alias key) -> the object key it points at.
+_known_aliases: dict[tuple[str, str], str] = {}
+
+
+def _default_client_factory(region_name: str) -> "S3Client":
+    import boto3
+    from botocore.config import Config
+
+    config = Config(
+        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+        retries={"max_attempts": S3_MAX_ATTEMPTS, "mode": S3_RETRY_MODE},
+    )
+    # S3_ENDPOINT_URL points the client at a local stand-in (moto server, LocalStack)
+    return boto3.client(
+        "s3",
+        region_name=region_name,
+        endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+        config=config,
+    )
+
+
+def set_s3_client_factory(factory: Optional[Callable[[str], "S3Client"]]) -> None:
+    """Override how S3 clients are built, or restore the default with ``None``.
+
+    Clears the client cache so the next call picks up the new factory.
+    """
+    global _client_factory
+    with _clients_lock:
+        _client_factory = factory
+        _clients.clear()
+        _known_keys.clear()
+        _known_aliases.clear()
+
+
+def _remember_key(bucket: str, key: str) -> None:
+    if len(_known_keys) >= S3_KNOWN_KEYS_MAX:
+        _known_keys.clear()
+    _known_keys.add((bucket, key))
+
+
+def get_s3_client(region_name: str) -> "S3Client":
+    """Return the process-wide S3 client for ``region_name``, creating it on first use.
+
+    Clients are thread-safe and live for the lifetime of the process, so warm
+    Lambda invocations reuse their resolved credentials and connection pool.
+    """
+    client = _clients.get(region_name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(region_name)
+            if client is None:
+                client = (_client_factory or _default_client_factory)(region_name)
+                _clients[region_name] = client
+    return client
 
 
 def upload_to_s3(
@@ -27,8 +105,89 @@ def upload_to_s3(
     if not region_name:
         raise ValueError("Region name is required")
 
-    s3_client: S3Client = boto3.client("s3", region_name=region_name)
+    s3_client = get_s3_client(region_name)
+    s3_client.put_object(Bucket=bucket, Key=file_path, Body=content)
+    _remember_key(bucket, file_path)
+
+
+def put_if_absent(
+    file_path: str,
+    bucket: Optional[str],
+    content: str,
+    region_name: Optional[str],
+) -> bool:
+    """Upload to S3 unless the object already exists, in a single round trip.
+
+    Uses a conditional ``put_object`` (``If-None-Match: *``), so concurrent
+    identical requests cannot race between a HEAD and a PUT. Keys already
+    known to exist skip S3 entirely.
+
+    Returns:
+        True if this call created the object, False if it already existed.
+
+    Raises:
+        ValueError: if bucket or region_name is missing.
+        ClientError: for any S3 failure other than the object already existing.
+    """
+    if not bucket:
+        raise ValueError("Bucket is required")
+
+    if not region_name:
+        raise ValueError("Region name is required")
+
+    if (bucket, file_path) in _known_keys:
+        return False
+
+    from botocore.exceptions import ClientError
+
+    s3_client = get_s3_client(region_name)
+    try:
+        s3_client.put_object(Bucket=bucket, Key=file_path, Body=content, IfNoneMatch="*")
+        created = True
+    except ClientError as e:
+        # 412: the object exists; 409: a concurrent conditional write to it is in flight
+        status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        code = e.response.get("Error", {}).get("Code")
+        if status not in (409, 412) and code not in ("PreconditionFailed", "ConditionalRequestConflict"):
+            raise
+        created = False
+    _remember_key(bucket, file_path)
+    return created
+
+
+def put_alias(
+    file_path: str,
+    bucket: Optional[str],
+    content: str,
+    region_name: Optional[str],
+    target: str,
+) -> bool:
+    """Write an alias manifest pointing at ``target``, unless this process already wrote that mapping.
+
+    Aliases are overwritten rather than put conditionally, so they follow template
+    changes; an alias already known to point at ``target`` skips S3 entirely.
+
+    Returns:
+        True if the manifest was written, False if it was already known.
+
+    Raises:
+        ValueError: if bucket or region_name is missing.
+    """
+    if not bucket:
+        raise ValueError("Bucket is required")
+
+    if not region_name:
+        raise ValueError("Region name is required")
+
+    if _known_aliases.get((bucket, file_path)) == target:
+        return False
+
+    s3_client = get_s3_client(region_name)
     s3_client.put_object(Bucket=bucket, Key=file_path, Body=content)
+    if len(_known_aliases) >= S3_KNOWN_KEYS_MAX:
+        _known_aliases.clear()
+    _known_aliases[(bucket, file_path)] = target
+    return True
 
 
 def check_if_file_exists_in_s3(bucket: Optional[str], key: str, region_name: Optional[str]) -> bool:
@@ -39,9 +198,13 @@ def check_if_file_exists_in_s3(bucket: Optional[str], key: str, region_name: Opt
     if not region_name:
         raise ValueError("Region name is required")
 
-    s3_client: S3Client = boto3.client("s3", region_name=region_name)
+    if (bucket, key) in _known_keys:
+        return True
+
+    s3_client = get_s3_client(region_name)
     try:
         s3_client.head_object(Bucket=bucket, Key=key)
-        return True
     except Exception:
         return False
+    _remember_key(bucket, key)
+    return True
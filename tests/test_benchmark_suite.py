@@ -0,0 +1,27 @@
+"""Tests for the benchmark suite's baseline comparison."""
+
+from benchmarks.suite import compare
+
+
+def _results(**metrics):
+    return {"metrics": {
+        name: {"value": value, "unit": unit, "higher_is_better": unit == "ops/s"}
+        for name, (value, unit) in metrics.items()
+    }}
+
+
+def test_compare_flags_throughput_drop_past_threshold():
+    baseline = _results(render=(1000.0, "ops/s"))
+    assert compare(baseline, _results(render=(800.0, "ops/s")), threshold=0.25) == []
+    regressions = compare(baseline, _results(render=(700.0, "ops/s")), threshold=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("render:")
+
+
+def test_compare_flags_latency_increase_past_threshold():
+    baseline = _results(startup=(100.0, "ms"))
+    assert compare(baseline, _results(startup=(80.0, "ms")), threshold=0.1) == []
+    assert compare(baseline, _results(startup=(120.0, "ms")), threshold=0.1)
+
+
+def test_compare_ignores_metrics_missing_from_current_run():
+    assert compare(_results(removed=(1.0, "ops/s")), _results(), threshold=0.1) == []
@@ -1,14 +1,23 @@
 """Tests for the API client using respx to mock httpx."""
 
+import asyncio
+import json
+
 import httpx
 import pytest
 import respx
 
-from src.cli.api_client import generate_via_api
+from src.cli import api_client
+from src.cli.api_client import async_client, generate_via_api, generate_via_api_async, get_client
 from src.cli.config import API_URL
 from src.generator_core import GenerateDockerfileRequest
 
 
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr("src.cli.api_client._backoff", lambda attempt: 0)
+
+
 @pytest.fixture()
 def config():
     return GenerateDockerfileRequest(
@@ -48,3 +57,75 @@ def test_api_http_error_shows_status(config):
     respx.post(API_URL).mock(return_value=httpx.Response(400, text="Bad Request"))
     with pytest.raises(RuntimeError, match="400"):
         generate_via_api(config)
+
+
+@respx.mock
+def test_api_retries_5xx_then_succeeds(config):
+    route = respx.post(API_URL).mock(side_effect=[
+        httpx.Response(503, text="Service Unavailable"),
+        httpx.Response(200, json={"message": "ok", "key": "k", "dockerfile": "FROM python:3.11"}),
+    ])
+    assert generate_via_api(config)["dockerfile"] == "FROM python:3.11"
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_api_gives_up_after_max_retries(config):
+    route = respx.post(API_URL).mock(side_effect=httpx.ConnectError("failed"))
+    with pytest.raises(RuntimeError, match="--local"):
+        generate_via_api(config)
+    assert route.call_count == api_client.MAX_RETRIES + 1
+
+
+@respx.mock
+def test_api_client_errors_are_not_retried(config):
+    route = respx.post(API_URL).mock(return_value=httpx.Response(400, text="Bad Request"))
+    with pytest.raises(RuntimeError, match="400"):
+        generate_via_api(config)
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_api_uses_separate_connect_and_read_timeouts(config):
+    route = respx.post(API_URL).mock(return_value=httpx.Response(200, json={"dockerfile": ""}))
+    generate_via_api(config, timeout=7.0)
+    timeouts = route.calls.last.request.extensions["timeout"]
+    assert timeouts["read"] == 7.0
+    assert timeouts["connect"] == api_client.CONNECT_TIMEOUT
+
+
+@respx.mock
+def test_api_sends_only_non_default_fields(config):
+    route = respx.post(API_URL).mock(return_value=httpx.Response(200, json={"dockerfile": ""}))
+    generate_via_api(config)
+    assert json.loads(route.calls.last.request.content)["config"] == {
+        "language": "python", "dependency_stack": "Django Stack", "language_version": "3.11",
+    }
+    generate_via_api(config.model_copy(update={"installer": "uv", "variant": "slim"}))
+    sent = json.loads(route.calls.last.request.content)["config"]
+    assert (sent["installer"], sent["variant"]) == ("uv", "slim")
+
+
+def test_request_rejects_unknown_fields():
+    with pytest.raises(ValueError, match="future_option"):
+        GenerateDockerfileRequest(
+            language="python", dependency_stack="Django Stack", language_version="3.11", future_option=True,
+        )
+
+
+def test_client_is_shared_across_calls():
+    assert get_client() is get_client()
+
+
+@respx.mock
+def test_async_api_call(config):
+    respx.post(API_URL).mock(side_effect=[
+        httpx.Response(502),
+        httpx.Response(200, json={"message": "ok", "key": "k", "dockerfile": "FROM python:3.11"}),
+    ])
+
+    async def call():
+        async with async_client() as client:
+            return await generate_via_api_async(config, client)
+
+    assert asyncio.run(call())["dockerfile"] == "FROM python:3.11"
@@ -0,0 +1,79 @@
+"""Tests for the on-disk API response cache."""
+
+import json
+import os
+import time
+
+import httpx
+import respx
+from click.testing import CliRunner
+
+from src.cli.cache import ResponseCache, default_cache_dir
+from src.cli.config import API_URL
+from src.cli.main import cli
+
+runner = CliRunner()
+
+RESPONSE = {"message": "ok", "key": "test.dockerfile", "dockerfile": "FROM python:3.11"}
+
+
+def test_default_dir_honours_xdg_cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / "stackfordev"
+
+
+def test_round_trip_and_no_temp_files_left(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.put("abc", RESPONSE)
+    assert cache.get("abc") == RESPONSE
+    assert cache.get("missing") is None
+    assert [p.name for p in tmp_path.iterdir()] == ["abc.json"]
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = ResponseCache(tmp_path, ttl=0.0)
+    cache.put("abc", RESPONSE)
+    time.sleep(0.01)
+    assert cache.get("abc") is None
+    assert not (tmp_path / "abc.json").exists()
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path, monkeypatch):
+    # Freeze the clock so every entry serializes to exactly the same bytes
+    now = time.time()
+    monkeypatch.setattr("src.cli.cache.time.time", lambda: now)
+    entry_size = len(json.dumps({"stored_at": now, "response": RESPONSE}).encode("utf-8"))
+    cache = ResponseCache(tmp_path)
+    cache.put("old", RESPONSE)
+    cache.put("new", RESPONSE)
+    assert (tmp_path / "old.json").stat().st_size == entry_size
+    past = time.time() - 100
+    os.utime(tmp_path / "new.json", (past, past))
+    os.utime(tmp_path / "old.json", (past - 10, past - 10))
+    cache.get("old")  # touch: "new" is now the least recently used
+
+    cache.max_bytes = entry_size * 2  # room for two entries, not three
+    cache.put("newest", RESPONSE)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["newest.json", "old.json"]
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    (tmp_path / "abc.json").write_text("{not json")
+    assert ResponseCache(tmp_path).get("abc") is None
+
+
+@respx.mock
+def test_generate_uses_cache_between_runs(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    route = respx.post(API_URL).mock(return_value=httpx.Response(200, json=RESPONSE))
+    args = ["generate", "-l", "python", "-s", "Django Stack", "-v", "3.11", "--dry-run"]
+
+    assert runner.invoke(cli, args).exit_code == 0
+    assert runner.invoke(cli, args).exit_code == 0
+    assert route.call_count == 1
+
+    assert runner.invoke(cli, args + ["--refresh"]).exit_code == 0
+    assert route.call_count == 2
+
+    assert runner.invoke(cli, args + ["--no-cache"]).exit_code == 0
+    assert route.call_count == 3
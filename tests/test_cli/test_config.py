@@ -5,11 +5,10 @@ import pytest
 from src.cli.config import (
     LANGUAGE_VERSIONS,
     LANGUAGE_STACKS,
-    validate_language,
-    validate_version,
+    build_request,
     validate_stack,
 )
-from src.generator_core import STACK_PACKAGES, SUPPORTED_LANGUAGES
+from src.generator_core import STACK_PACKAGES, SUPPORTED_LANGUAGES, VALID_VERSIONS
 
 
 def test_all_languages_have_versions():
@@ -28,22 +27,36 @@ def test_all_stacks_have_packages():
             assert stack in STACK_PACKAGES, f"Stack '{stack}' for {lang} missing from STACK_PACKAGES"
 
 
-def test_validate_language_valid():
-    assert validate_language("Python") == "python"
+def test_language_versions_match_api():
+    assert LANGUAGE_VERSIONS == VALID_VERSIONS
 
 
-def test_validate_language_invalid():
-    with pytest.raises(ValueError, match="Unsupported language"):
-        validate_language("COBOL")
+def test_build_request_valid():
+    config = build_request("Python", "3.11", "Django Stack", ["numpy"])
+    assert config.language == "python"
+    assert config.language_version == "3.11"
+    assert config.extra_dependencies == ["numpy"]
 
 
-def test_validate_version_valid():
-    assert validate_version("python", "3.11") == "3.11"
+def test_build_request_invalid_language():
+    with pytest.raises(ValueError, match="Unsupported language"):
+        build_request("COBOL", "1", "Django Stack", [])
 
 
-def test_validate_version_invalid():
+def test_build_request_invalid_version():
     with pytest.raises(ValueError, match="Unsupported version"):
-        validate_version("python", "2.7")
+        build_request("python", "2.7", "Django Stack", [])
+
+
+def test_build_request_invalid_stack():
+    with pytest.raises(ValueError, match="Unsupported stack"):
+        build_request("python", "3.11", "Express Stack", [])
+
+
+def test_build_request_invalid_extras_is_one_line():
+    with pytest.raises(ValueError, match="Invalid dependency name") as exc_info:
+        build_request("python", "3.11", "Django Stack", ["numpy; rm -rf /"])
+    assert "\n" not in str(exc_info.value)
 
 
 def test_validate_stack_valid():
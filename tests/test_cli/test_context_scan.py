@@ -0,0 +1,75 @@
+"""Tests for the language-aware .dockerignore and the build-context scan."""
+
+import pytest
+
+from src.cli.context_scan import _compile_rule, build_dockerignore, dockerignore_content, scan_context
+
+
+def _write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+@pytest.mark.parametrize("rule, path, matches", [
+    ("node_modules", "node_modules", True),
+    ("node_modules", "web/node_modules", False),
+    ("**/node_modules", "web/node_modules", True),
+    ("**/node_modules", "node_modules", True),
+    ("target/", "target", True),
+    ("*.log", "build.log", True),
+    ("*.log", "logs/build.log", False),
+    (".env.*", ".env.local", True),
+])
+def test_rules_follow_dockerignore_semantics(rule, path, matches):
+    assert bool(_compile_rule(rule).match(path)) is matches
+
+
+@pytest.mark.parametrize("language, rules", [
+    ("python", [".venv/", "**/__pycache__"]),
+    ("javascript", ["**/node_modules"]),
+    ("go", ["vendor/"]),
+    ("rust", ["target/"]),
+    ("java", ["target/", ".gradle/"]),
+])
+def test_language_rules(language, rules):
+    content = dockerignore_content(language)
+    assert content.startswith("__pycache__\n")
+    for rule in rules:
+        assert f"\n{rule}\n" in content
+
+
+def test_scan_sizes_context_before_and_after(tmp_path):
+    _write(tmp_path / "target/debug/app", 5000)
+    _write(tmp_path / "web/node_modules/react/index.js", 3000)
+    _write(tmp_path / "data/blob", 2000)
+    _write(tmp_path / "src/main.rs", 10)
+    _write(tmp_path / "build.log", 7)
+
+    content, scan = build_dockerignore(str(tmp_path), "rust")
+    assert "\n# rust\ntarget/\n" in content
+    assert "\n# found in the project\n**/node_modules\n" in content
+    assert ".venv/" not in content
+    assert scan["total_bytes"] == 10017
+    assert scan["context_bytes"] == 2010
+    assert scan["excluded_bytes"]["target/"] == 5000
+    assert not scan["truncated"]
+
+
+def test_scan_flags_large_directories(tmp_path):
+    _write(tmp_path / "target/debug/app", 5000)
+    _write(tmp_path / "assets/videos/intro.mp4", 2000)
+    _write(tmp_path / "web/node_modules/react/index.js", 3000)
+    scan = scan_context(str(tmp_path), ["target/", "**/node_modules"], threshold=1000, workers=2)
+    assert scan["large_directories"] == [
+        ("target", 5000, "target/"),
+        ("web/node_modules", 3000, "**/node_modules"),
+        ("assets/videos", 2000, None),
+    ]
+
+
+def test_scan_is_bounded(tmp_path):
+    for index in range(20):
+        _write(tmp_path / f"files/{index}", 10)
+    scan = scan_context(str(tmp_path), [], max_entries=5)
+    assert scan["truncated"]
+    assert scan["total_bytes"] < 200
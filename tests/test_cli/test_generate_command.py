@@ -136,3 +136,95 @@ def test_compose_flag_with_output_creates_files(tmp_path):
         dockerignore = f.read()
     assert "__pycache__" in dockerignore
     assert "node_modules" in dockerignore
+    assert "\n# python\n**/__pycache__\n.venv/\n" in dockerignore
+    assert "Build context:" in result.output
+
+
+def test_cache_mounts_flag():
+    result = runner.invoke(cli, [
+        "generate", "--local", "--dry-run", "--cache-mounts", "-l", "rust", "-s", "CLI Tools Stack", "-v", "1.82",
+    ])
+    assert result.exit_code == 0
+    assert result.output.startswith("# syntax=docker/dockerfile:1\n")
+    assert "--mount=type=cache,target=/usr/local/cargo/registry" in result.output
+
+
+def test_default_output_has_no_cache_mounts():
+    result = runner.invoke(cli, ["generate", "--local", "--dry-run", "-l", "python", "-s", "Django Stack", "-v", "3.11"])
+    assert result.exit_code == 0
+    assert "--mount" not in result.output
+
+
+def test_variant_flag():
+    result = runner.invoke(cli, [
+        "generate", "--local", "--dry-run", "--variant", "slim", "-l", "python", "-s", "Django Stack", "-v", "3.11",
+    ])
+    assert result.exit_code == 0
+    assert "FROM python:3.11-slim-bookworm" in result.output
+    assert "# Image variant: slim - expected size class: small" in result.output
+
+
+def test_invalid_variant_rejected():
+    result = runner.invoke(cli, [
+        "generate", "--local", "--variant", "tiny", "-l", "python", "-s", "Django Stack", "-v", "3.11",
+    ])
+    assert result.exit_code != 0
+
+
+def test_directory_installs_from_lockfile(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("")
+    (tmp_path / "poetry.lock").write_text("")
+    result = runner.invoke(cli, [
+        "generate", "--local", "--dry-run", "-d", str(tmp_path), "-l", "python", "-s", "Django Stack", "-v", "3.11",
+    ])
+    assert result.exit_code == 0, result.output
+    assert "COPY pyproject.toml poetry.lock ./" in result.output
+    assert "poetry install --no-root --no-interaction" in result.output
+
+
+def test_directory_without_lockfile_renders_default(tmp_path):
+    args = ["generate", "--local", "--dry-run", "-l", "javascript", "-s", "Express Stack", "-v", "22"]
+    with_dir = runner.invoke(cli, args + ["-d", str(tmp_path)])
+    assert with_dir.exit_code == 0
+    assert with_dir.output == runner.invoke(cli, args).output
+
+
+def test_installer_flag():
+    result = runner.invoke(cli, [
+        "generate", "--local", "--dry-run", "--installer", "pnpm", "-l", "javascript", "-s", "Express Stack", "-v", "22",
+    ])
+    assert result.exit_code == 0, result.output
+    assert "pnpm add -g express" in result.output
+
+
+def test_installer_for_wrong_language_rejected():
+    result = runner.invoke(cli, [
+        "generate", "--local", "--installer", "uv", "-l", "javascript", "-s", "Express Stack", "-v", "22",
+    ])
+    assert result.exit_code == 1
+    assert "Unsupported installer 'uv' for javascript" in result.output
+
+
+def test_system_packages_flag():
+    args = ["generate", "--local", "--dry-run", "-l", "python", "-s", "Django Stack", "-v", "3.12"]
+    result = runner.invoke(cli, args + ["--system-packages", "libpq-dev, gcc"])
+    assert result.exit_code == 0, result.output
+    assert "--no-install-recommends \\\n    gcc \\\n    libpq-dev \\\n" in result.output
+
+    result = runner.invoke(cli, args + ["--variant", "slim", "--system-packages", ""])
+    assert result.exit_code == 0, result.output
+    assert "    curl \\\n    git \\\n    && rm -rf" in result.output
+
+    result = runner.invoke(cli, args + ["--system-packages", "libpq-dev;ls"])
+    assert result.exit_code == 1
+    assert "Invalid system package name" in result.output
+
+
+def test_compose_to_stdout_has_named_volumes():
+    result = runner.invoke(cli, [
+        "generate", "--local", "--compose", "--bind-consistency", "delegated",
+        "-l", "rust", "-s", "CLI Tools Stack", "-v", "1.82",
+    ])
+    assert result.exit_code == 0, result.output
+    assert "      - .:/usr/src/app:delegated\n      - cargo-registry:/usr/local/cargo/registry\n" in result.output
+    assert "  target:\n" in result.output
@@ -1,8 +1,11 @@
 """Tests for the stackfordev init command."""
 
 import os
+import shutil
+import subprocess
 
 import pytest
+import yaml
 from click.testing import CliRunner
 
 from src.cli.main import cli
@@ -54,14 +57,31 @@ def test_init_dockerignore_has_standard_entries(tmp_path):
     assert ".env" in content
 
 
-def test_init_devrun_sh_has_docker_compose_run(tmp_path):
+def test_init_devrun_sh_execs_into_persistent_container(tmp_path):
     runner.invoke(cli, [
         "init", "-l", "rust", "-s", "Actix-Web Stack", "-v", "1.82", "-d", str(tmp_path),
     ])
     with open(tmp_path / "devrun.sh") as f:
         content = f.read()
-    assert "docker compose run" in content
-    assert "devrun" in content
+    assert "docker compose up -d dev" in content
+    assert "docker compose exec" in content
+    assert "docker compose run" not in content
+    assert '"--stop"' in content
+    assert "{{" not in content and "}}" not in content
+    if shutil.which("bash"):
+        assert subprocess.run(["bash", "-n", str(tmp_path / "devrun.sh")]).returncode == 0
+
+
+def test_init_compose_keeps_dev_container_alive(tmp_path):
+    runner.invoke(cli, [
+        "init", "-l", "python", "-s", "Flask Stack", "-v", "3.12", "-d", str(tmp_path),
+    ])
+    dev = yaml.safe_load((tmp_path / "docker-compose.yml").read_text())["services"]["dev"]
+    assert dev["init"] is True
+    assert dev["command"][:2] == ["sh", "-c"]
+    assert "for marker in /tmp/.devrun-busy.*; do" in dev["command"][2]
+    assert 'kill -0 "$${marker##*.}"' in dev["command"][2]
+    assert "$$(find /tmp/.devrun-activity -mmin +${DEVRUN_IDLE_MINUTES:-30})" in dev["command"][2]
 
 
 def test_init_missing_flags_non_tty_errors():
@@ -79,3 +99,127 @@ def test_init_with_extras_included_in_dockerfile(tmp_path):
         content = f.read()
     assert "seaborn" in content
     assert "plotly" in content
+
+
+def test_init_cache_mounts(tmp_path):
+    result = runner.invoke(cli, [
+        "init", "-l", "python", "-s", "Django Stack", "-v", "3.12", "--cache-mounts", "-d", str(tmp_path),
+    ])
+    assert result.exit_code == 0, result.output
+    content = (tmp_path / "Dockerfile").read_text()
+    assert content.startswith("# syntax=docker/dockerfile:1\n")
+    assert "RUN --mount=type=cache,target=/root/.cache/pip" in content
+
+
+def test_init_multistage_variant(tmp_path):
+    result = runner.invoke(cli, [
+        "init", "-l", "rust", "-s", "CLI Tools Stack", "-v", "1.82", "--variant", "multistage", "-d", str(tmp_path),
+    ])
+    assert result.exit_code == 0, result.output
+    content = (tmp_path / "Dockerfile").read_text()
+    assert "FROM rust:1.82-bookworm AS builder" in content
+    assert "COPY --from=builder /opt/cargo-tools/bin /usr/local/bin" in content
+
+
+def test_init_installs_from_lockfile(tmp_path):
+    (tmp_path / "package.json").write_text("{}")
+    (tmp_path / "package-lock.json").write_text("{}")
+    result = runner.invoke(cli, [
+        "init", "-l", "javascript", "-s", "Express Stack", "-v", "22", "-d", str(tmp_path),
+    ])
+    assert result.exit_code == 0, result.output
+    assert "package-lock.json" in result.output
+    content = (tmp_path / "Dockerfile").read_text()
+    assert "COPY package.json package-lock.json /usr/src/\nRUN cd /usr/src && npm ci\n" in content
+
+
+def test_init_prebuilds_go_modules(tmp_path):
+    (tmp_path / "go.mod").write_text("module example.com/app\n")
+    result = runner.invoke(cli, [
+        "init", "-l", "go", "-s", "Gin Stack", "-v", "1.23", "-d", str(tmp_path),
+    ])
+    assert result.exit_code == 0, result.output
+    assert "COPY go.mod ./\nRUN go mod download\n" in (tmp_path / "Dockerfile").read_text()
+
+
+def test_init_installer(tmp_path):
+    (tmp_path / "requirements.txt").write_text("requests\n")
+    result = runner.invoke(cli, [
+        "init", "-l", "python", "-s", "Flask Stack", "-v", "3.12", "--installer", "uv", "-d", str(tmp_path),
+    ])
+    assert result.exit_code == 0, result.output
+    content = (tmp_path / "Dockerfile").read_text()
+    assert "RUN uv pip install --system flask" in content
+    assert "RUN uv pip install --system -r requirements.txt" in content
+
+
+def test_init_system_packages(tmp_path):
+    result = runner.invoke(cli, [
+        "init", "-l", "rust", "-s", "Actix-Web Stack", "-v", "1.82", "--system-packages", "libpq-dev", "-d", str(tmp_path),
+    ])
+    assert result.exit_code == 0, result.output
+    content = (tmp_path / "Dockerfile").read_text()
+    assert "    libpq-dev \\\n" in content
+    assert "libssl-dev" not in content
+
+
+def test_init_dockerignore_is_language_aware(tmp_path):
+    (tmp_path / "target").mkdir()
+    (tmp_path / "target" / "app").write_bytes(b"x" * 4096)
+    result = runner.invoke(cli, [
+        "init", "-l", "rust", "-s", "CLI Tools Stack", "-v", "1.82", "-d", str(tmp_path),
+    ])
+    assert result.exit_code == 0, result.output
+    content = (tmp_path / ".dockerignore").read_text()
+    assert "\n# rust\ntarget/\n" in content
+    assert ".gradle/" not in content
+    assert "Build context: 4.0 KB → 0 B with .dockerignore" in result.output
+
+
+@pytest.mark.parametrize("language, stack, version, volumes", [
+    ("python", "Flask Stack", "3.12", {"pip-cache": "/root/.cache/pip"}),
+    ("javascript", "Express Stack", "22", {"npm-cache": "/root/.npm", "node-modules": "/usr/src/app/node_modules"}),
+    ("go", "Gin Stack", "1.23", {"go-mod-cache": "/go/pkg/mod", "go-build-cache": "/root/.cache/go-build"}),
+    ("rust", "CLI Tools Stack", "1.82", {
+        "cargo-registry": "/usr/local/cargo/registry", "cargo-git": "/usr/local/cargo/git", "target": "/usr/src/target",
+    }),
+    ("java", "Maven Build Stack", "21", {
+        "maven-repository": "/root/.m2", "gradle-cache": "/root/.gradle", "target": "/usr/src/app/target",
+    }),
+])
+def test_init_compose_named_volumes(tmp_path, language, stack, version, volumes):
+    result = runner.invoke(cli, ["init", "-l", language, "-s", stack, "-v", version, "-d", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    compose = yaml.safe_load((tmp_path / "docker-compose.yml").read_text())
+    mounts = compose["services"]["dev"]["volumes"]
+    assert mounts[0] == ".:/usr/src/app"
+    assert mounts[1:] == [f"{name}:{path}" for name, path in volumes.items()]
+    assert set(compose["volumes"]) == set(volumes)
+
+
+@pytest.mark.parametrize("language, stack, version, files, volumes", [
+    ("javascript", "Express Stack", "22", ["package.json", "package-lock.json"], {
+        "npm-cache": "/root/.npm", "node-modules": "/usr/src/app/node_modules",
+    }),
+    ("go", "Gin Stack", "1.23", ["go.mod", "go.sum"], {"go-build-cache": "/root/.cache/go-build"}),
+    ("rust", "CLI Tools Stack", "1.82", ["Cargo.toml", "Cargo.lock"], {"cargo-git": "/usr/local/cargo/git"}),
+    ("java", "Maven Build Stack", "21", ["pom.xml"], {"gradle-cache": "/root/.gradle", "target": "/usr/src/app/target"}),
+])
+def test_init_compose_leaves_lockfile_directories_to_the_image(tmp_path, language, stack, version, files, volumes):
+    for name in files:
+        (tmp_path / name).write_text("")
+    result = runner.invoke(cli, ["init", "-l", language, "-s", stack, "-v", version, "-d", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    compose = yaml.safe_load((tmp_path / "docker-compose.yml").read_text())
+    assert compose["services"]["dev"]["volumes"][1:] == [f"{name}:{path}" for name, path in volumes.items()]
+
+
+def test_init_compose_installer_cache_and_bind_consistency(tmp_path):
+    result = runner.invoke(cli, [
+        "init", "-l", "python", "-s", "Flask Stack", "-v", "3.12", "--installer", "uv",
+        "--bind-consistency", "cached", "-d", str(tmp_path),
+    ])
+    assert result.exit_code == 0, result.output
+    content = (tmp_path / "docker-compose.yml").read_text()
+    assert "      - .:/usr/src/app:cached\n      - pip-cache:/root/.cache/pip\n      - uv-cache:/root/.cache/uv\n" in content
+    assert content.endswith("\nvolumes:\n  pip-cache:\n  uv-cache:\n")
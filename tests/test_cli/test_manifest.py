@@ -0,0 +1,152 @@
+"""Tests for manifest-driven batch generation (generate --manifest)."""
+
+import json
+
+import httpx
+import pytest
+import respx
+from click.testing import CliRunner
+
+from src.cli.config import API_URL
+from src.cli.main import cli
+from src.cli.manifest import load_manifest
+
+runner = CliRunner()
+
+SERVICES = [
+    {"name": "api", "path": "services/api", "language": "python", "stack": "Django Stack",
+     "version": "3.12", "extras": ["celery"]},
+    {"name": "web", "path": "services/web", "language": "javascript", "stack": "React Stack", "version": "22"},
+    {"name": "worker", "path": "services/worker", "language": "go", "stack": "Gin Stack", "version": "1.23"},
+]
+
+
+@pytest.fixture()
+def manifest(tmp_path):
+    path = tmp_path / "stackfordev.json"
+    path.write_text(json.dumps({"services": SERVICES}))
+    return path
+
+
+def _run(manifest_path, *args):
+    result = runner.invoke(cli, ["generate", "--manifest", str(manifest_path), "--json", *args])
+    return result, json.loads(result.output)
+
+
+def test_local_manifest_writes_every_service(manifest, tmp_path):
+    result, results = _run(manifest, "--local", "-j", "2")
+    assert result.exit_code == 0, result.output
+    assert [r["status"] for r in results] == ["written"] * 3
+    assert "FROM python:3.12-bookworm" in (tmp_path / "services/api/Dockerfile").read_text()
+    assert "celery" in (tmp_path / "services/api/Dockerfile").read_text()
+    assert "FROM golang:1.23-bookworm" in (tmp_path / "services/worker/Dockerfile").read_text()
+
+
+def test_unchanged_outputs_are_skipped(manifest, tmp_path):
+    _run(manifest, "--local")
+    dockerfile = tmp_path / "services/web/Dockerfile"
+    mtime = dockerfile.stat().st_mtime_ns
+    _, results = _run(manifest, "--local")
+    assert [r["status"] for r in results] == ["unchanged"] * 3
+    assert dockerfile.stat().st_mtime_ns == mtime
+
+
+def test_dry_run_writes_nothing(manifest, tmp_path):
+    _, results = _run(manifest, "--local", "--dry-run")
+    assert [r["status"] for r in results] == ["would write"] * 3
+    assert not (tmp_path / "services").exists()
+
+
+def test_invalid_service_fails_run_but_not_others(tmp_path):
+    path = tmp_path / "stackfordev.json"
+    path.write_text(json.dumps([SERVICES[0], {**SERVICES[1], "version": "12"}]))
+    result, results = _run(path, "--local")
+    assert result.exit_code == 1
+    assert results[0]["status"] == "written"
+    assert results[1]["status"] == "error"
+    assert "Unsupported version" in results[1]["detail"]
+
+
+@respx.mock
+def test_api_manifest_runs_requests_concurrently(manifest, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+    def respond(request):
+        config = json.loads(request.content)["config"]
+        return httpx.Response(200, json={"dockerfile": f"FROM {config['language']}:{config['language_version']}\n"})
+
+    route = respx.post(API_URL).mock(side_effect=respond)
+    result, results = _run(manifest, "-j", "2")
+    assert result.exit_code == 0, result.output
+    assert route.call_count == 3
+    assert (tmp_path / "services/web/Dockerfile").read_text() == "FROM javascript:22\n"
+
+    _, results = _run(manifest, "-j", "2")
+    assert route.call_count == 3  # served from the response cache
+    assert [r["status"] for r in results] == ["unchanged"] * 3
+
+
+def test_yaml_manifest_coerces_unquoted_versions(tmp_path):
+    path = tmp_path / "stackfordev.yaml"
+    path.write_text(
+        "services:\n"
+        "  - name: api\n    language: python\n    stack: Flask Stack\n    version: 3.12\n    extras: a, b\n"
+    )
+    [service] = load_manifest(str(path))
+    assert service.version == "3.12"
+    assert service.extras == ["a", "b"]
+
+
+def test_empty_manifest_rejected(tmp_path):
+    path = tmp_path / "stackfordev.json"
+    path.write_text(json.dumps({"services": []}))
+    result = runner.invoke(cli, ["generate", "--manifest", str(path)])
+    assert result.exit_code == 1
+    assert "non-empty 'services' list" in result.output
+
+
+@pytest.mark.parametrize("name, content", [
+    ("stackfordev.yml", "services:\n  - name: api\n    extras: [celery\n"),
+    ("stackfordev.json", '{"services": ['),
+])
+def test_malformed_manifest_reported_with_path(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+    with pytest.raises(ValueError, match=f"^{path}: invalid"):
+        load_manifest(str(path))
+    result = runner.invoke(cli, ["generate", "--manifest", str(path)])
+    assert result.exit_code == 1
+    assert f"{path}: invalid" in result.output
+    assert "Traceback" not in result.output
+
+
+def test_service_options_and_command_line_overrides(tmp_path):
+    path = tmp_path / "stackfordev.json"
+    path.write_text(json.dumps([{**SERVICES[0], "variant": "slim"}, SERVICES[2]]))
+    _run(path, "--local")
+    assert "FROM python:3.12-slim-bookworm" in (tmp_path / "services/api/Dockerfile").read_text()
+    assert "FROM golang:1.23-bookworm" in (tmp_path / "services/worker/Dockerfile").read_text()
+
+    _run(path, "--local", "--variant", "multistage")
+    assert "AS builder" in (tmp_path / "services/api/Dockerfile").read_text()
+    assert "AS builder" in (tmp_path / "services/worker/Dockerfile").read_text()
+
+
+def test_installer_override_applies_only_where_supported(manifest, tmp_path):
+    result, results = _run(manifest, "--local", "--installer", "uv")
+    assert result.exit_code == 0, result.output
+    assert {r["status"] for r in results} == {"written"}
+    assert "uv pip install --system django" in (tmp_path / "services/api/Dockerfile").read_text()
+    assert "npm install -g react" in (tmp_path / "services/web/Dockerfile").read_text()
+
+
+def test_system_packages_entry_and_override(tmp_path):
+    path = tmp_path / "stackfordev.json"
+    path.write_text(json.dumps([{**SERVICES[0], "system_packages": "libpq-dev"}, SERVICES[2]]))
+    _run(path, "--local")
+    assert "    libpq-dev \\\n" in (tmp_path / "services/api/Dockerfile").read_text()
+    assert "apt-get" not in (tmp_path / "services/worker/Dockerfile").read_text()
+
+    _run(path, "--local", "--system-packages", "graphviz")
+    assert "libpq-dev" not in (tmp_path / "services/api/Dockerfile").read_text()
+    assert "    graphviz \\\n" in (tmp_path / "services/worker/Dockerfile").read_text()
@@ -0,0 +1,126 @@
+"""Tests for stackfordev serve and the local HTTP server behind it."""
+
+import asyncio
+import json
+import socket
+import threading
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from src.cli.main import cli
+from src.cli.server import GenerateServer
+from src.generator_core import GenerateDockerfileRequest
+
+runner = CliRunner()
+
+CONFIG = {
+    "language": "python",
+    "dependency_stack": "Django Stack",
+    "extra_dependencies": ["requests"],
+    "language_version": "3.12",
+}
+
+
+@pytest.fixture()
+def server():
+    """Run a GenerateServer on an ephemeral port in a background event loop."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    instance = GenerateServer(workers=2)
+    host, port = asyncio.run_coroutine_threadsafe(instance.start("127.0.0.1", 0), loop).result()
+    instance.url = f"http://{host}:{port}/cli/generate-dockerfile"
+    instance.loop = loop
+    yield instance
+    asyncio.run_coroutine_threadsafe(instance.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def test_serve_listed_in_help():
+    result = runner.invoke(cli, ["serve", "--help"])
+    assert result.exit_code == 0
+    assert "--workers" in result.output
+
+
+def test_generate_matches_api_contract(server):
+    response = httpx.post(server.url, json={"config": CONFIG})
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"message", "key", "alias", "dockerfile"}
+    assert "FROM python:3.12-bookworm" in body["dockerfile"]
+    assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+
+def test_invalid_config_returns_400(server):
+    response = httpx.post(server.url, json={"config": {**CONFIG, "language": "COBOL"}})
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+def test_batch_request(server):
+    response = httpx.post(server.url, json={"configs": [CONFIG, {**CONFIG, "language_version": "2.7"}]})
+    results = response.json()["results"]
+    assert "dockerfile" in results[0]
+    assert "error" in results[1]
+
+
+def test_batch_errors_match_lambda_handler(server, tmp_path, monkeypatch):
+    from src.generate_dockerfile import lambda_handler
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("S3_BUCKET", "test-bucket")
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    configs = [CONFIG, {**CONFIG, "language_version": "2.7"}, {**CONFIG, "language": 5}, "not a config"]
+    served = httpx.post(server.url, json={"configs": configs}).json()
+    deployed = json.loads(lambda_handler(event={"body": json.dumps({"configs": configs})})["body"])
+    assert served == deployed
+    assert all("\n" not in result["error"] for result in served["results"][1:])
+
+
+def test_unknown_route_and_preflight(server):
+    base = server.url.rsplit("/cli/", 1)[0]
+    assert httpx.post(f"{base}/nope", json={}).status_code == 404
+    assert httpx.options(server.url).status_code == 200
+    assert httpx.get(f"{base}/healthz").json() == {"status": "ok"}
+
+
+def test_keep_alive_serves_multiple_requests_per_connection(server):
+    host, port = httpx.URL(server.url).host, httpx.URL(server.url).port
+    body = json.dumps({"config": CONFIG}).encode()
+    request = (
+        f"POST /cli/generate-dockerfile HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+    with socket.create_connection((host, port)) as sock:
+        stream = sock.makefile("rb")
+        for _ in range(2):
+            sock.sendall(request)
+            assert stream.readline().startswith(b"HTTP/1.1 200")
+            headers = {}
+            while (line := stream.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            assert headers["connection"] == "keep-alive"
+            assert b"FROM python:3.12" in stream.read(int(headers["content-length"]))
+
+
+def test_identical_concurrent_requests_are_coalesced(server):
+    body = json.dumps({"config": CONFIG}).encode()
+
+    async def burst():
+        return await asyncio.gather(*(server._coalesced(body) for _ in range(10)))
+
+    responses = asyncio.run_coroutine_threadsafe(burst(), server.loop).result()
+    assert server.renders == 1
+    assert all(r == responses[0] for r in responses)
+
+
+def test_api_client_can_target_local_server(server, monkeypatch):
+    from src.cli.api_client import generate_via_api
+
+    monkeypatch.setattr("src.cli.api_client.API_URL", server.url)
+    result = generate_via_api(GenerateDockerfileRequest(**CONFIG))
+    assert "FROM python:3.12-bookworm" in result["dockerfile"]
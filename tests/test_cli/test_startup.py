@@ -0,0 +1,59 @@
+"""Startup benchmark: `stackfordev --help` must stay under a fixed wall-clock budget."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Wall-clock budget for a fresh `stackfordev --help`, best of a few runs.
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "250"))
+
+# Only the command that actually runs may import these.
+COMMAND_ONLY_MODULES = {"pydantic", "rich", "httpx", "src.generator_core", "src.cli.commands"}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CLI_SCRIPT = (
+    "import sys\n"
+    "from src.cli.main import cli\n"
+    "cli(sys.argv[1:], standalone_mode=False)\n"
+    "sys.stderr.write('\\n'.join(sys.modules))\n"
+)
+
+
+def _run_cli(*args: str) -> tuple[float, set[str]]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CLI_SCRIPT, *args],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return elapsed_ms, set(result.stderr.splitlines())
+
+
+def _loaded(modules: set[str], prefix: str) -> bool:
+    return any(name == prefix or name.startswith(prefix + ".") for name in modules)
+
+
+@pytest.fixture(scope="module")
+def help_runs():
+    return [_run_cli("--help") for _ in range(3)]
+
+
+def test_help_within_startup_budget(help_runs):
+    best_ms = min(elapsed for elapsed, _ in help_runs)
+    assert best_ms <= STARTUP_BUDGET_MS, f"stackfordev --help took {best_ms:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)"
+
+
+def test_help_imports_no_command_modules(help_runs):
+    _, modules = help_runs[0]
+    assert not [prefix for prefix in COMMAND_ONLY_MODULES if _loaded(modules, prefix)]
+
+
+def test_info_does_not_import_generator():
+    _, modules = _run_cli("info")
+    assert _loaded(modules, "src.cli.commands.info")
+    assert not _loaded(modules, "src.generator_core")
+    assert not _loaded(modules, "src.cli.commands.generate")
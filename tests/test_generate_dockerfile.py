@@ -1,4 +1,5 @@
 import json
+import re
 import shutil
 import os
 from unittest.mock import patch
@@ -6,12 +7,39 @@ from unittest.mock import patch
 import pytest
 
 from src.generate_dockerfile import (
+    TEMPLATE_REGISTRY,
+    STACK_PACKAGES,
     lambda_handler,
     GenerateDockerfileRequest,
     DockerfileGenerator,
     generate_dockerfile_key_name,
+    generate_dockerfile_alias_name,
     CORS_HEADERS,
 )
+from src.generate_dockerfile import render_cache
+from src.s3_helper import set_s3_client_factory
+from src.docker_templates import go_template, java_template, javascript_template, python_template, rust_template
+from src.cli.config import LANGUAGE_STACKS
+from src.generator_core import (
+    BASE_SYSTEM_PACKAGES,
+    INSTALLERS,
+    REQUEST_SLOTS,
+    STACK_SYSTEM_PACKAGES,
+    TEMPLATE_PLACEHOLDERS,
+    VALID_VERSIONS,
+    GenerateDockerfileEvent,
+    RenderCache,
+    VARIANTS,
+    compile_layer,
+    detect_lockfile,
+    compile_template,
+    option_template,
+    register_template,
+    request_list_adapter,
+    size_class_comment,
+    system_packages_step,
+    validate_requests,
+)
 
 
 def _make_event(config: dict) -> dict:
@@ -65,6 +93,7 @@ JAVA_CONFIG = {
 def setup_env_and_cleanup(monkeypatch):
     monkeypatch.setenv("S3_BUCKET", "test-bucket")
     monkeypatch.setenv("AWS_REGION", "us-east-1")
+    render_cache.clear()
     yield
     for d in ["python-images/", "javascript-images/", "go-images/", "rust-images/", "java-images/"]:
         if os.path.isdir(d):
@@ -81,7 +110,8 @@ def test_lambda_handler_python():
     assert "dockerfile" in body
     assert "FROM python:3.11-bookworm" in body["dockerfile"]
     assert "pip install django" in body["dockerfile"].lower()
-    assert body["key"].startswith("dockerfile-python-Django-3.11")
+    assert body["key"].startswith("dockerfile-python-3.11-")
+    assert re.fullmatch(r"python-Django-3\.11\+numpy\+pandas-[0-9a-f]{12}", body["alias"])
 
 
 def test_lambda_handler_javascript():
@@ -279,47 +309,858 @@ def test_empty_extra_dependencies():
     assert "pip install django" in body["dockerfile"].lower()
 
 
+# --- Template compilation tests ---
+
+
+TEMPLATE_MODULES = {
+    "python": python_template,
+    "javascript": javascript_template,
+    "go": go_template,
+    "rust": rust_template,
+    "java": java_template,
+}
+
+
+def test_compiled_templates_match_chained_replace():
+    for language, (start, end, version_placeholder) in TEMPLATE_REGISTRY.items():
+        version = VALID_VERSIONS[language][0]
+        config = GenerateDockerfileRequest(**{**PYTHON_CONFIG, "language": language, "language_version": version})
+        stack_packages = STACK_PACKAGES.get(config.dependency_stack, config.dependency_stack)
+        installer = next(iter(getattr(TEMPLATE_MODULES[language], "INSTALLERS", {"": {}}).values()))
+        expected = start.replace("EXTRAS_LAYER", getattr(TEMPLATE_MODULES[language], "EXTRAS_LAYER", ""))
+        for placeholder in ("INSTALLER_SETUP", "PACKAGE_INSTALL"):
+            expected = expected.replace(placeholder, installer.get(placeholder.lower(), placeholder))
+        system_packages = BASE_SYSTEM_PACKAGES[(language, "full")] + STACK_SYSTEM_PACKAGES.get(config.dependency_stack, ())
+        expected = expected.replace("SYSTEM_PACKAGES", system_packages_step("RUN_APT", system_packages))
+        expected = size_class_comment(language, "full") + (
+            expected.replace(version_placeholder, config.language_version)
+            .replace("DEPENDENCY_STACK", stack_packages)
+            .replace("EXTRA_DEPENDENCIES", config.extra_dependencies_str)
+            .replace("RUN_APT", "RUN")
+            .replace("RUN_INSTALL", "RUN")
+            + end
+        )
+        assert DockerfileGenerator(config=config).generate_dockerfile() == expected
+
+
+def test_default_output_has_no_buildkit_features():
+    for config in (PYTHON_CONFIG, JS_CONFIG, GO_CONFIG, RUST_CONFIG, JAVA_CONFIG):
+        content = DockerfileGenerator(config=GenerateDockerfileRequest(**config)).generate_dockerfile()
+        assert content.startswith("# Image variant: full - expected size class:")
+        assert "--mount" not in content and "RUN_" not in content
+
+
+@pytest.mark.parametrize("config, targets", [
+    (PYTHON_CONFIG, ["/root/.cache/pip"]),
+    (JS_CONFIG, ["/root/.npm"]),
+    (GO_CONFIG, ["/go/pkg/mod", "/root/.cache/go-build"]),
+    (RUST_CONFIG, ["/usr/local/cargo/registry", "/usr/local/cargo/git", "/root/.cache/cargo-target"]),
+    (JAVA_CONFIG, []),
+])
+def test_cache_mounts(config, targets):
+    # The slim variant always has an apt step; full images built on buildpack-deps may have none
+    request = GenerateDockerfileRequest(**config, cache_mounts=True, variant="slim")
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert content.startswith("# syntax=docker/dockerfile:1\n")
+    assert "RUN --mount=type=cache,target=/var/cache/apt,sharing=locked \\\n    apt-get update" in content
+    assert "rm -f /etc/apt/apt.conf.d/docker-clean" in content
+    for target in targets:
+        assert f"--mount=type=cache,target={target}" in content
+    assert "RUN_" not in content
+
+
+def test_cache_mounts_set_cargo_target_dir():
+    request = GenerateDockerfileRequest(**RUST_CONFIG, cache_mounts=True)
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert "CARGO_TARGET_DIR=/root/.cache/cargo-target cargo install" in content
+
+
+@pytest.mark.parametrize("config, slim_image", [
+    (PYTHON_CONFIG, "python:3.11-slim-bookworm"),
+    (JS_CONFIG, "node:20-bookworm-slim"),
+    (GO_CONFIG, "debian:bookworm-slim"),
+    (RUST_CONFIG, "rust:1.82-slim-bookworm"),
+    (JAVA_CONFIG, "eclipse-temurin:21-jdk-bookworm"),
+])
+def test_variants(config, slim_image):
+    for variant in VARIANTS:
+        request = GenerateDockerfileRequest(**config, variant=variant)
+        content = DockerfileGenerator(config=request).generate_dockerfile()
+        assert content.startswith(f"# Image variant: {variant} - expected size class: ")
+        assert "RUN_" not in content
+        from_lines = [line for line in content.splitlines() if line.startswith("FROM ")]
+        assert "build-essential" not in content
+        if variant == "full":
+            assert len(from_lines) == 1
+        elif variant == "slim":
+            assert from_lines == [f"FROM {slim_image}"]
+            assert "apt-get install -y --no-install-recommends" in content
+        elif config is JAVA_CONFIG:
+            # Nothing to build without a build file (see test_java_multistage_resolves_dependencies_in_builder)
+            assert from_lines == [f"FROM {slim_image}"]
+        else:
+            assert len(from_lines) == 2 and from_lines[0].endswith(" AS builder")
+            assert from_lines[1] == f"FROM {slim_image}"
+            assert "from=builder" in content
+
+
+def test_stack_system_packages_cover_every_stack():
+    assert STACK_SYSTEM_PACKAGES.keys() == STACK_PACKAGES.keys()
+
+
+@pytest.mark.parametrize("config", [PYTHON_CONFIG, JS_CONFIG, GO_CONFIG])
+def test_full_buildpack_images_skip_apt(config):
+    content = DockerfileGenerator(config=GenerateDockerfileRequest(**config)).generate_dockerfile()
+    assert "apt-get" not in content
+    assert "WORKDIR /usr/src/app\n\n" in content
+
+
+def test_system_packages_are_the_union_of_base_and_stack():
+    request = GenerateDockerfileRequest(**RUST_CONFIG, variant="slim")
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert (
+        "RUN apt-get update && apt-get install -y --no-install-recommends \\\n"
+        "    curl \\\n    git \\\n    libssl-dev \\\n    pkg-config \\\n"
+        "    && rm -rf /var/lib/apt/lists/*\n"
+    ) in content
+    cli_tools = GenerateDockerfileRequest(**{**RUST_CONFIG, "dependency_stack": "CLI Tools Stack"}, variant="slim")
+    assert "libssl-dev" not in DockerfileGenerator(config=cli_tools).generate_dockerfile()
+
+
+def test_system_packages_override_replaces_stack_packages():
+    request = GenerateDockerfileRequest(**RUST_CONFIG, variant="slim", system_packages=["libpq-dev", " git ", "libpq-dev"])
+    assert request.system_packages == ["git", "libpq-dev"]
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert "    curl \\\n    git \\\n    libpq-dev \\\n" in content
+    assert "libssl-dev" not in content
+    assert "~apt-git+libpq-dev" in generate_dockerfile_alias_name(request)
+
+    request = GenerateDockerfileRequest(**PYTHON_CONFIG, system_packages=["libpq-dev"])
+    assert "    libpq-dev \\\n" in DockerfileGenerator(config=request).generate_dockerfile()
+    none = GenerateDockerfileRequest(**RUST_CONFIG, system_packages=[])
+    assert "apt-get" not in DockerfileGenerator(config=none).generate_dockerfile()
+    assert re.search(r"~apt-none-[0-9a-f]{12}$", generate_dockerfile_alias_name(none))
+
+
+@pytest.mark.parametrize("package", ["libpq-dev; rm -rf /", "LibPQ", "x", "-dev"])
+def test_invalid_system_packages_rejected(package):
+    with pytest.raises(ValueError, match="Invalid system package name"):
+        GenerateDockerfileRequest(**PYTHON_CONFIG, system_packages=[package])
+
+
+def test_multistage_python_installs_prebuilt_wheels():
+    request = GenerateDockerfileRequest(**PYTHON_CONFIG, variant="multistage")
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert "pip wheel --wheel-dir /wheels Django\n" in content
+    assert "pip wheel --wheel-dir /wheels numpy pandas\n" in content
+    assert "pip install --no-cache-dir --no-index /wheels/*.whl" in content
+
+
+def test_unknown_variant_rejected():
+    with pytest.raises(ValueError, match="Unsupported variant 'tiny'"):
+        GenerateDockerfileRequest(**PYTHON_CONFIG, variant="tiny")
+
+
+@pytest.mark.parametrize("config, stack_line, extras_line", [
+    (PYTHON_CONFIG, "RUN pip install Django\n", "RUN pip install numpy pandas\n"),
+    (JS_CONFIG, "RUN npm install -g express\n", "RUN npm install -g cors dotenv\n"),
+    ({**GO_CONFIG, "extra_dependencies": ["gopls"]},
+     "RUN go install github.com/gin-gonic/gin@latest\n", "RUN go install gopls\n"),
+    ({**RUST_CONFIG, "extra_dependencies": ["ripgrep"]},
+     "RUN cargo install actix-web serde tokio\n", "RUN cargo install ripgrep\n"),
+])
+def test_extras_get_their_own_layer_after_the_stack(config, stack_line, extras_line):
+    for variant in VARIANTS:
+        content = DockerfileGenerator(
+            config=GenerateDockerfileRequest(**config, variant=variant)
+        ).generate_dockerfile()
+        if variant == "multistage":
+            stack_line = stack_line.replace("pip install", "pip wheel --wheel-dir /wheels")
+            stack_line = stack_line.replace("-g ", "-g --prefix /opt/npm-global ")
+            stack_line = stack_line.replace("cargo install ", "cargo install --root /opt/cargo-tools ")
+            extras_line = extras_line.replace("pip install", "pip wheel --wheel-dir /wheels")
+            extras_line = extras_line.replace("-g ", "-g --prefix /opt/npm-global ")
+            extras_line = extras_line.replace("cargo install ", "cargo install --root /opt/cargo-tools ")
+        assert stack_line in content and extras_line in content
+        assert content.index(stack_line) < content.index(extras_line)
+
+
+def test_stack_layer_unchanged_by_extras():
+    def stack_layers(extras):
+        content = DockerfileGenerator(
+            config=GenerateDockerfileRequest(**{**PYTHON_CONFIG, "extra_dependencies": extras})
+        ).generate_dockerfile()
+        return content[:content.index("RUN pip install Django\n") + len("RUN pip install Django\n")]
+
+    assert stack_layers([]) == stack_layers(["numpy"]) == stack_layers(["numpy", "pandas", "requests"])
+
+
+def test_no_extras_layer_without_extras():
+    content = DockerfileGenerator(
+        config=GenerateDockerfileRequest(**{**PYTHON_CONFIG, "extra_dependencies": []})
+    ).generate_dockerfile()
+    assert content.count("pip install") == 1
+    assert "Install extra dependencies" not in content
+
+
+def test_register_template_requires_extras_layer_for_slot():
+    with pytest.raises(ValueError, match="extras layer"):
+        register_template("cobol", "FROM cobol:COBOL_VERSION\nRUN x\nEXTRAS_LAYER", "", "COBOL_VERSION")
+
+
+def test_compile_layer_requires_placeholder():
+    with pytest.raises(ValueError, match="EXTRA_DEPENDENCIES"):
+        compile_layer("RUN_INSTALL pip install\n", "PYTHON_VERSION", "EXTRA_DEPENDENCIES")
+
+
+@pytest.mark.parametrize("language, files, expected", [
+    ("python", ["requirements.txt"], "requirements.txt"),
+    ("python", ["pyproject.toml", "poetry.lock", "requirements.txt"], "poetry.lock"),
+    ("python", ["pyproject.toml", "uv.lock", "poetry.lock"], "uv.lock"),
+    ("python", ["poetry.lock"], None),
+    ("JavaScript", ["package.json"], "package.json"),
+    ("javascript", ["package.json", "package-lock.json"], "package-lock.json"),
+    ("go", ["requirements.txt"], None),
+    ("python", [], None),
+])
+def test_detect_lockfile(tmp_path, language, files, expected):
+    for name in files:
+        (tmp_path / name).write_text("")
+    assert detect_lockfile(str(tmp_path), language) == expected
+
+
+def test_detect_lockfile_ignores_subdirectories(tmp_path):
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "dep" / "package.json").write_text("{}")
+    (tmp_path / "backend").mkdir()
+    (tmp_path / "backend" / "requirements.txt").write_text("")
+    assert detect_lockfile(str(tmp_path), "javascript") is None
+    assert detect_lockfile(str(tmp_path), "python") is None
+
+
+@pytest.mark.parametrize("config, lockfile, install", [
+    (PYTHON_CONFIG, "requirements.txt", "RUN pip install -r requirements.txt"),
+    (PYTHON_CONFIG, "poetry.lock", "poetry install --no-root"),
+    (PYTHON_CONFIG, "uv.lock", "uv sync --frozen --no-install-project"),
+    (JS_CONFIG, "package-lock.json", "RUN cd /usr/src && npm ci"),
+    (JS_CONFIG, "package.json", "RUN cd /usr/src && npm install"),
+])
+def test_lockfile_layer_follows_stack_and_extras(config, lockfile, install):
+    for variant in VARIANTS:
+        if config is PYTHON_CONFIG and variant == "multistage":
+            continue  # installed in a lockfile-builder stage, see below
+        request = GenerateDockerfileRequest(**config, variant=variant, lockfile=lockfile)
+        content = DockerfileGenerator(config=request).generate_dockerfile()
+        copy = re.search(rf"^COPY [^\n]*{re.escape(lockfile)}", content, re.MULTILINE).start()
+        assert copy < content.index(install) < content.index('CMD ["bash"]')
+        assert content.rindex("FROM ") < copy
+        assert content.index(request.extra_dependencies_str) < copy
+
+
+@pytest.mark.parametrize("installer", ["pip", "uv"])
+@pytest.mark.parametrize("lockfile", ["uv.lock", "poetry.lock", "requirements.txt"])
+def test_python_multistage_lockfile_installs_in_full_stage(lockfile, installer):
+    request = GenerateDockerfileRequest(**PYTHON_CONFIG, variant="multistage", lockfile=lockfile, installer=installer)
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    install = content.index("--prefix /install")
+    assert content.index("FROM python:3.11-bookworm AS lockfile-builder") < install
+    assert install < content.index("FROM python:3.11-bookworm AS builder")
+    runtime = content.index("FROM python:3.11-slim-bookworm")
+    assert runtime < content.index("COPY --from=lockfile-builder /install /usr/local") < content.index('CMD ["bash"]')
+
+
+@pytest.mark.parametrize("installer", ["pip", "uv"])
+def test_uv_lock_layer_reuses_installed_uv(installer):
+    request = GenerateDockerfileRequest(**PYTHON_CONFIG, lockfile="uv.lock", installer=installer)
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert content.count(f"COPY --from={python_template.UV_IMAGE} /uv /uvx /usr/local/bin/") == 1
+    assert "pip install uv" not in content
+
+
+@pytest.mark.parametrize("config, installer, lockfile, install", [
+    (JS_CONFIG, "pnpm", "package-lock.json", "--mount=type=cache,target=/root/.npm \\\n    cd /usr/src && npm ci"),
+    (JS_CONFIG, "pnpm", "package.json", "--mount=type=cache,target=/root/.npm \\\n    cd /usr/src && npm install"),
+    (PYTHON_CONFIG, "pip", "uv.lock", "--mount=type=cache,target=/root/.cache/uv \\\n    UV_PROJECT_ENVIRONMENT"),
+])
+def test_lockfile_layer_mounts_the_cache_of_its_own_tool(config, installer, lockfile, install):
+    request = GenerateDockerfileRequest(**config, installer=installer, lockfile=lockfile, cache_mounts=True)
+    assert f"RUN {install}" in DockerfileGenerator(config=request).generate_dockerfile()
+
+
+def test_poetry_lock_layer_installs_poetry_with_the_installer():
+    request = GenerateDockerfileRequest(**PYTHON_CONFIG, lockfile="poetry.lock", installer="uv")
+    assert "RUN uv pip install --system poetry \\\n" in DockerfileGenerator(config=request).generate_dockerfile()
+
+
+@pytest.mark.parametrize("language, files, expected", [
+    ("rust", ["Cargo.toml", "Cargo.lock"], "Cargo.lock"),
+    ("rust", ["Cargo.toml"], None),
+    ("go", ["go.mod", "go.sum"], "go.sum"),
+    ("go", ["go.mod"], "go.mod"),
+    ("java", ["pom.xml", "gradlew", "gradle/wrapper/gradle-wrapper.properties", "build.gradle"], "pom.xml"),
+    ("java", ["gradlew", "gradle/wrapper/gradle-wrapper.properties", "build.gradle.kts"], "build.gradle.kts"),
+    ("java", ["build.gradle"], None),
+])
+def test_detect_build_files(tmp_path, language, files, expected):
+    for name in files:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("")
+    assert detect_lockfile(str(tmp_path), language) == expected
+
+
+@pytest.mark.parametrize("config, lockfile, steps", [
+    (GO_CONFIG, "go.sum", ["COPY go.mod go.sum ./\nRUN go mod download\n"]),
+    (JAVA_CONFIG, "pom.xml", ["COPY pom.xml ./\nRUN mvn -B dependency:go-offline\n"]),
+    (JAVA_CONFIG, "build.gradle", ["COPY gradle ./gradle\nRUN ./gradlew dependencies --no-daemon\n"]),
+    (RUST_CONFIG, "Cargo.lock", [
+        "COPY --from=dependencies /usr/src/target /usr/src/target\n",
+    ]),
+])
+def test_dependency_prebuild(config, lockfile, steps):
+    for variant in VARIANTS:
+        if config is JAVA_CONFIG and variant == "multistage":
+            continue  # resolved in the builder stage, see test_java_multistage_resolves_dependencies_in_builder
+        for cache_mounts in (False, True):
+            request = GenerateDockerfileRequest(**config, variant=variant, cache_mounts=cache_mounts, lockfile=lockfile)
+            content = DockerfileGenerator(config=request).generate_dockerfile()
+            for step in steps:
+                assert content.rindex("FROM ") < content.index(step) < content.index('CMD ["bash"]')
+
+
+@pytest.mark.parametrize("variant", VARIANTS)
+def test_rust_target_dir_is_set_after_the_install_layers(variant):
+    request = GenerateDockerfileRequest(**RUST_CONFIG, variant=variant)
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    # cargo install must not leave its build directory in the image
+    assert content.index("cargo install") < content.index("ENV CARGO_TARGET_DIR=/usr/src/target\n") < content.index('CMD ["bash"]')
+
+
+@pytest.mark.parametrize("lockfile, step, copied", [
+    ("pom.xml", "COPY pom.xml ./\nRUN mvn -B dependency:go-offline\n", "/root/.m2"),
+    ("build.gradle.kts", "COPY gradle ./gradle\nRUN ./gradlew dependencies --no-daemon\n", "/root/.gradle"),
+])
+def test_java_multistage_resolves_dependencies_in_builder(lockfile, step, copied):
+    request = GenerateDockerfileRequest(**JAVA_CONFIG, variant="multistage", lockfile=lockfile)
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    from_lines = [line for line in content.splitlines() if line.startswith("FROM ")]
+    assert from_lines == ["FROM maven:3-eclipse-temurin-21 AS builder", "FROM eclipse-temurin:21-jdk-bookworm"]
+    runtime = content.rindex("FROM ")
+    assert content.index(step) < runtime
+    assert runtime < content.index(f"COPY --from=builder {copied} {copied}\n") < content.index('CMD ["bash"]')
+
+
+def test_cargo_chef_stages_precede_the_template():
+    request = GenerateDockerfileRequest(**RUST_CONFIG, lockfile="Cargo.lock", cache_mounts=True)
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    from_lines = [line for line in content.splitlines() if line.startswith("FROM ")]
+    assert from_lines == [
+        "FROM rust:1.82-bookworm AS chef", "FROM chef AS planner", "FROM chef AS dependencies", "FROM rust:1.82-bookworm",
+    ]
+    # The cooked target directory must land in the image, not in a cache mount
+    assert "\nRUN CARGO_TARGET_DIR=/usr/src/target cargo chef cook --recipe-path recipe.json\n" in content
+
+
+def test_lockfile_layer_uses_cache_mounts():
+    request = GenerateDockerfileRequest(**PYTHON_CONFIG, lockfile="requirements.txt", cache_mounts=True)
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert "--mount=type=cache,target=/root/.cache/pip \\\n    pip install -r requirements.txt" in content
+
+
+def test_unsupported_lockfile_rejected():
+    with pytest.raises(ValueError, match="Unsupported lockfile 'poetry.lock' for go"):
+        GenerateDockerfileRequest(**GO_CONFIG, lockfile="poetry.lock")
+
+
+def test_invalid_language_reports_no_lockfile_error():
+    with pytest.raises(ValueError) as excinfo:
+        GenerateDockerfileRequest(**{**PYTHON_CONFIG, "language": "COBOL"}, lockfile="poetry.lock")
+    assert "Unsupported language 'COBOL'" in str(excinfo.value)
+    assert "lockfile" not in str(excinfo.value)
+
+
+def test_generate_alias_name_marks_lockfile():
+    alias = generate_dockerfile_alias_name(GenerateDockerfileRequest(**PYTHON_CONFIG, lockfile="uv.lock"))
+    assert "-3.11~uv.lock+" in alias
+
+
+LEFTOVER_PLACEHOLDER = re.compile(r"\b(?:[A-Z]+_VERSION|" + "|".join(TEMPLATE_PLACEHOLDERS) + r")\b")
+
+INSTALLER_MATRIX = [
+    (language, stack, installer)
+    for language, stacks in LANGUAGE_STACKS.items()
+    for stack in stacks
+    for installer in INSTALLERS[language]
+]
+
+
+def test_installer_matrix_covers_every_stack():
+    assert {stack for _, stack, _ in INSTALLER_MATRIX} == set(STACK_PACKAGES)
+
+
+@pytest.mark.parametrize("language, stack, installer", INSTALLER_MATRIX)
+def test_every_stack_renders_with_every_installer(language, stack, installer):
+    values = INSTALLERS[language][installer]
+    for variant in VARIANTS:
+        for cache_mounts in (False, True):
+            request = GenerateDockerfileRequest(
+                language=language, dependency_stack=stack, language_version=VALID_VERSIONS[language][0],
+                extra_dependencies=["requests"], variant=variant, cache_mounts=cache_mounts, installer=installer,
+            )
+            content = DockerfileGenerator(config=request).generate_dockerfile()
+            assert not LEFTOVER_PLACEHOLDER.search(content)
+            if language == "java":
+                continue
+            command = values.get("package_build" if variant == "multistage" else "package_install")
+            if command:
+                assert f"{command} {STACK_PACKAGES[stack]}\n" in content
+                assert f"{command} requests\n" in content
+            else:
+                assert STACK_PACKAGES[stack] in content
+            assert values.get("installer_setup", "") in content
+
+
+@pytest.mark.parametrize("config, installer, setup, command", [
+    (PYTHON_CONFIG, "uv", f"COPY --from={python_template.UV_IMAGE} /uv /uvx /usr/local/bin/", "uv pip install --system Django"),
+    (JS_CONFIG, "pnpm", "ENV PNPM_HOME=/usr/local/share/pnpm", "pnpm add -g express"),
+])
+def test_installer(config, installer, setup, command):
+    request = GenerateDockerfileRequest(**config, installer=installer)
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert content.index(setup) < content.index(command)
+    assert "pip install Django" not in content and "npm install -g express" not in content
+
+
+def test_default_installer():
+    assert GenerateDockerfileRequest(**PYTHON_CONFIG).installer == "pip"
+    assert GenerateDockerfileRequest(**JS_CONFIG).installer == "npm"
+    assert GenerateDockerfileRequest(**GO_CONFIG).installer == "go"
+
+
+def test_unsupported_installer_rejected():
+    with pytest.raises(ValueError, match="Unsupported installer 'pnpm' for python. Supported: pip, uv"):
+        GenerateDockerfileRequest(**PYTHON_CONFIG, installer="pnpm")
+
+
+def test_multistage_uv_copies_installed_prefix():
+    request = GenerateDockerfileRequest(**PYTHON_CONFIG, installer="uv", variant="multistage")
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert "uv pip install --system --prefix /install Django\n" in content
+    assert "COPY --from=builder /install /usr/local\n" in content
+    assert "/wheels" not in content
+
+
+@pytest.mark.parametrize("config, installer, target", [
+    (PYTHON_CONFIG, "uv", "/root/.cache/uv"),
+    (JS_CONFIG, "pnpm", "/root/.local/share/pnpm/store"),
+])
+def test_installer_cache_mounts(config, installer, target):
+    request = GenerateDockerfileRequest(**config, installer=installer, cache_mounts=True)
+    content = DockerfileGenerator(config=request).generate_dockerfile()
+    assert f"--mount=type=cache,target={target}" in content
+
+
+@pytest.mark.parametrize("extras, rendered", [
+    (["pandas>=2.0"], "'pandas>=2.0'"),
+    (["uvicorn[standard]"], "'uvicorn[standard]'"),
+    (["@types/node@^20"], "'@types/node@^20'"),
+    (["react@18.3.1"], "react@18.3.1"),
+])
+def test_extras_accept_installer_syntax_and_are_shell_quoted(extras, rendered):
+    config = GenerateDockerfileRequest(**{**JS_CONFIG, "extra_dependencies": extras}, installer="pnpm")
+    assert f"pnpm add -g {rendered}\n" in DockerfileGenerator(config=config).generate_dockerfile()
+
+
+def test_generate_alias_name_marks_installer():
+    assert "-3.11~uv+" in generate_dockerfile_alias_name(GenerateDockerfileRequest(**PYTHON_CONFIG, installer="uv"))
+    assert "~pip" not in generate_dockerfile_alias_name(GenerateDockerfileRequest(**PYTHON_CONFIG))
+
+
+def test_compile_template_rejects_unknown_placeholder():
+    with pytest.raises(ValueError, match="Unknown placeholder 'NODE_VERSION'"):
+        compile_template("FROM python:PYTHON_VERSION\nFROM node:NODE_VERSION\n", "", "PYTHON_VERSION")
+
+
+def test_compile_template_rejects_placeholder_in_end_template():
+    with pytest.raises(ValueError, match="EXTRA_DEPENDENCIES"):
+        compile_template("FROM python:PYTHON_VERSION\n", "RUN pip install EXTRA_DEPENDENCIES\n", "PYTHON_VERSION")
+
+
+def test_compile_template_requires_version_placeholder():
+    with pytest.raises(ValueError, match="PYTHON_VERSION"):
+        compile_template("FROM python:latest\n", "", "PYTHON_VERSION")
+
+
+def test_bind_fills_slots_and_splices_templates():
+    layer = compile_layer("RUN pip install EXTRA_DEPENDENCIES\n", "PYTHON_VERSION", "EXTRA_DEPENDENCIES")
+    template = compile_template("FROM python:PYTHON_VERSION\nRUN_INSTALL x\nEXTRAS_LAYER\n", "", "PYTHON_VERSION")
+    bound = template.bind({"run_install": "RUN", "extras_layer": layer, "lockfile_layer": ""})
+    assert bound.slot_names == {"language_version", "extra_dependencies"}
+    assert bound.parts[2] == "\nRUN x\nRUN pip install "  # static text between open slots is merged
+    values = {"language_version": "3.12", "extra_dependencies": "requests", "run_install": "RUN"}
+    assert bound.render(values) == template.render({**values, "extras_layer": layer.render(values), "lockfile_layer": ""})
+
+
+@pytest.mark.parametrize("language", sorted(INSTALLERS))
+def test_option_templates_leave_only_request_slots(language):
+    for variant in VARIANTS:
+        for installer in INSTALLERS[language]:
+            template = option_template(language, variant, installer, True, None, ("curl",), True)
+            assert template.slot_names <= REQUEST_SLOTS
+
+
 # --- Key name tests ---
 
 
 def test_generate_key_name():
     config = GenerateDockerfileRequest(**PYTHON_CONFIG)
     key = generate_dockerfile_key_name(config)
-    assert key == "dockerfile-python-Django-3.11-pandas-numpy.dockerfile"
+    assert re.fullmatch(r"dockerfile-python-3\.11-[0-9a-f]{16}\.dockerfile", key)
 
 
-def test_generate_key_name_no_extras():
-    config = GenerateDockerfileRequest(**{**PYTHON_CONFIG, "extra_dependencies": []})
-    key = generate_dockerfile_key_name(config)
-    assert key == "dockerfile-python-Django-3.11.dockerfile"
+def test_generate_key_name_ignores_extras_order():
+    forward = GenerateDockerfileRequest(**{**PYTHON_CONFIG, "extra_dependencies": ["pandas", "numpy"]})
+    reverse = GenerateDockerfileRequest(**{**PYTHON_CONFIG, "extra_dependencies": ["numpy ", "pandas", "numpy"]})
+    assert forward.extra_dependencies == reverse.extra_dependencies == ["numpy", "pandas"]
+    assert generate_dockerfile_key_name(forward) == generate_dockerfile_key_name(reverse)
+
+
+def test_generate_key_name_is_bounded():
+    many = [f"package{i}" for i in range(200)]
+    config = GenerateDockerfileRequest(**{**PYTHON_CONFIG, "extra_dependencies": many})
+    assert len(generate_dockerfile_key_name(config)) == len(generate_dockerfile_key_name(
+        GenerateDockerfileRequest(**PYTHON_CONFIG)
+    ))
+    assert len(generate_dockerfile_alias_name(config)) <= 200
+
+
+def test_generate_key_name_uses_given_content():
+    config = GenerateDockerfileRequest(**PYTHON_CONFIG)
+    content = DockerfileGenerator(config=config).generate_dockerfile()
+    assert generate_dockerfile_key_name(config, content) == generate_dockerfile_key_name(config)
+    assert generate_dockerfile_key_name(config, content + "\n") != generate_dockerfile_key_name(config)
+
+
+def test_generate_alias_name_marks_cache_mounts():
+    plain = generate_dockerfile_alias_name(GenerateDockerfileRequest(**PYTHON_CONFIG))
+    cached = generate_dockerfile_alias_name(GenerateDockerfileRequest(**PYTHON_CONFIG, cache_mounts=True))
+    assert cached.rsplit("-", 1)[0] == plain.rsplit("-", 1)[0].replace("-3.11+", "-3.11~cache+")
+
+
+def test_generate_alias_name_marks_variant():
+    alias = generate_dockerfile_alias_name(
+        GenerateDockerfileRequest(**PYTHON_CONFIG, variant="slim", cache_mounts=True)
+    )
+    assert "-3.11~slim~cache+" in alias
+
+
+def test_generate_alias_name_no_extras():
+    config = GenerateDockerfileRequest(**{**GO_CONFIG, "dependency_stack": "Gin Stack"})
+    assert re.fullmatch(r"go-Gin-Stack-1\.22-[0-9a-f]{12}", generate_dockerfile_alias_name(config))
+
+
+@pytest.mark.parametrize("first, second", [
+    ({"system_packages": ["git", "libpq-dev"]}, {"system_packages": ["git"], "extra_dependencies": ["libpq-dev"]}),
+    ({"extra_dependencies": ["a b"]}, {"extra_dependencies": ["a-b"]}),
+])
+def test_alias_names_of_different_requests_differ(first, second):
+    aliases = [
+        generate_dockerfile_alias_name(GenerateDockerfileRequest(**{**RUST_CONFIG, **overrides}))
+        for overrides in (first, second)
+    ]
+    assert aliases[0].rsplit("-", 1)[0] == aliases[1].rsplit("-", 1)[0]
+    assert aliases[0] != aliases[1]
 
 
 # --- S3 upload mock tests ---
 
 
 @patch("src.generate_dockerfile.is_running_on_lambda", return_value=True)
-@patch("src.generate_dockerfile.check_if_file_exists_in_s3", return_value=False)
-@patch("src.generate_dockerfile.upload_to_s3")
-def test_s3_upload_called_on_lambda(mock_upload, mock_exists, mock_lambda):
+@patch("src.generate_dockerfile.put_if_absent", return_value=True)
+@patch("src.generate_dockerfile.put_alias")
+def test_s3_upload_called_on_lambda(mock_upload, mock_put, mock_lambda):
     result = lambda_handler(event=_make_event(PYTHON_CONFIG))
     assert result["statusCode"] == 200
-    mock_upload.assert_called_once()
+    body = json.loads(result["body"])
+    assert mock_put.call_args.kwargs["file_path"] == f"python-images/{body['key']}"
+    assert mock_upload.call_args.kwargs["file_path"] == f"python-images/aliases/{body['alias']}.json"
+    manifest = json.loads(mock_upload.call_args.kwargs["content"])
+    assert manifest["key"] == f"python-images/{body['key']}"
 
 
 @patch("src.generate_dockerfile.is_running_on_lambda", return_value=True)
-@patch("src.generate_dockerfile.check_if_file_exists_in_s3", return_value=True)
-@patch("src.generate_dockerfile.upload_to_s3")
-def test_s3_upload_skipped_when_exists(mock_upload, mock_exists, mock_lambda):
+@patch("src.generate_dockerfile.put_if_absent", return_value=False)
+@patch("src.generate_dockerfile.put_alias")
+def test_s3_upload_skipped_when_exists(mock_upload, mock_put, mock_lambda):
     result = lambda_handler(event=_make_event(PYTHON_CONFIG))
     assert result["statusCode"] == 200
-    mock_upload.assert_not_called()
+    # The object already exists, but the alias manifest is still written
+    body = json.loads(result["body"])
+    assert mock_upload.call_args.kwargs["file_path"] == f"python-images/aliases/{body['alias']}.json"
+
+
+@patch("src.generate_dockerfile.is_running_on_lambda", return_value=True)
+@patch("src.generate_dockerfile.put_if_absent", side_effect=[True, False])
+@patch("src.generate_dockerfile.put_alias")
+def test_alias_written_for_existing_object_with_new_alias(mock_upload, mock_put, mock_lambda):
+    first = json.loads(lambda_handler(event=_make_event(PYTHON_CONFIG))["body"])
+    second = json.loads(lambda_handler(event=_make_event({**PYTHON_CONFIG, "system_packages": []}))["body"])
+    assert first["key"] == second["key"]
+    assert first["alias"] != second["alias"]
+    alias_keys = {c.kwargs["file_path"] for c in mock_upload.call_args_list}
+    assert alias_keys == {f"python-images/aliases/{b['alias']}.json" for b in (first, second)}
+
+
+class _CountingS3Client:
+    def __init__(self):
+        self.calls = []
+
+    def put_object(self, **kwargs):
+        self.calls.append(kwargs["Key"])
 
 
 @patch("src.generate_dockerfile.is_running_on_lambda", return_value=True)
-@patch("src.generate_dockerfile.check_if_file_exists_in_s3", return_value=False)
-@patch("src.generate_dockerfile.upload_to_s3", side_effect=Exception("S3 error"))
-def test_s3_upload_failure_returns_500(mock_upload, mock_exists, mock_lambda):
+def test_repeated_requests_skip_s3_when_warm(mock_lambda):
+    client = _CountingS3Client()
+    set_s3_client_factory(lambda region_name: client)
+    try:
+        lambda_handler(event=_make_event(PYTHON_CONFIG))
+        assert len(client.calls) == 2  # the Dockerfile and its alias manifest
+        for _ in range(3):
+            assert lambda_handler(event=_make_event(PYTHON_CONFIG))["statusCode"] == 200
+        assert len(client.calls) == 2
+    finally:
+        set_s3_client_factory(None)
+
+
+@patch("src.generate_dockerfile.is_running_on_lambda", return_value=True)
+@patch("src.generate_dockerfile.put_if_absent", side_effect=Exception("S3 error"))
+def test_s3_upload_failure_returns_500(mock_put, mock_lambda):
     result = lambda_handler(event=_make_event(PYTHON_CONFIG))
     assert result["statusCode"] == 500
     body = json.loads(result["body"])
     assert "S3 error" in body["error"]
+
+
+# --- Batch endpoint tests ---
+
+
+def _make_batch_event(configs) -> dict:
+    return {"body": json.dumps({"configs": configs})}
+
+
+def test_batch_returns_result_per_config():
+    result = lambda_handler(event=_make_batch_event([PYTHON_CONFIG, GO_CONFIG, RUST_CONFIG]))
+    assert result["statusCode"] == 200
+    body = json.loads(result["body"])
+    assert [r["index"] for r in body["results"]] == [0, 1, 2]
+    assert "FROM python:3.11-bookworm" in body["results"][0]["dockerfile"]
+    assert "FROM golang:1.22-bookworm" in body["results"][1]["dockerfile"]
+    assert body["results"][2]["key"].startswith("dockerfile-rust-")
+
+
+def test_batch_bad_entry_does_not_fail_batch():
+    bad = {**PYTHON_CONFIG, "extra_dependencies": ["$(whoami)"]}
+    result = lambda_handler(event=_make_batch_event([bad, JS_CONFIG, "not a config"]))
+    assert result["statusCode"] == 200
+    results = json.loads(result["body"])["results"]
+    assert results[0]["error"].startswith("Invalid dependency name: '$(whoami)'")
+    assert "\n" not in results[0]["error"]
+    assert "dockerfile" in results[1]
+    assert "error" in results[2]
+
+
+@pytest.mark.parametrize("malformed", [
+    {**PYTHON_CONFIG, "language": 5},
+    {**PYTHON_CONFIG, "language": None},
+    {**PYTHON_CONFIG, "extra_dependencies": [5]},
+    {**PYTHON_CONFIG, "installer": ["uv"]},
+])
+def test_batch_reports_non_string_fields_per_entry(malformed):
+    result = lambda_handler(event=_make_batch_event([PYTHON_CONFIG, malformed, GO_CONFIG]))
+    assert result["statusCode"] == 200
+    first, bad, last = json.loads(result["body"])["results"]
+    assert "dockerfile" in first and "dockerfile" in last
+    assert bad["index"] == 1 and "\n" not in bad["error"]
+
+
+def test_batch_rejects_empty_and_oversized(monkeypatch):
+    assert lambda_handler(event=_make_batch_event([]))["statusCode"] == 400
+    monkeypatch.setattr("src.generate_dockerfile.BATCH_MAX_SIZE", 2)
+    result = lambda_handler(event=_make_batch_event([PYTHON_CONFIG] * 3))
+    assert result["statusCode"] == 400
+    assert "Batch too large" in json.loads(result["body"])["error"]
+
+
+@patch("src.generate_dockerfile.is_running_on_lambda", return_value=True)
+@patch("src.generate_dockerfile.put_if_absent", return_value=True)
+@patch("src.generate_dockerfile.put_alias")
+def test_batch_uploads_each_distinct_object_once(mock_upload, mock_put, mock_lambda):
+    reordered = {**PYTHON_CONFIG, "extra_dependencies": ["numpy", "pandas"]}
+    result = lambda_handler(event=_make_batch_event([PYTHON_CONFIG, reordered, GO_CONFIG]))
+    assert result["statusCode"] == 200
+    # One Dockerfile plus one alias manifest per distinct object
+    assert mock_put.call_count == 2
+    assert mock_upload.call_count == 2
+    results = json.loads(result["body"])["results"]
+    assert all("dockerfile" in r for r in results)
+
+
+@patch("src.generate_dockerfile.is_running_on_lambda", return_value=True)
+@patch("src.generate_dockerfile.put_if_absent", return_value=True)
+@patch("src.generate_dockerfile.put_alias")
+def test_batch_writes_every_alias_of_shared_object(mock_upload, mock_put, mock_lambda):
+    no_apt = {**PYTHON_CONFIG, "system_packages": []}
+    result = lambda_handler(event=_make_batch_event([PYTHON_CONFIG, no_apt]))
+    assert result["statusCode"] == 200
+    first, second = json.loads(result["body"])["results"]
+    assert first["key"] == second["key"]
+    assert first["alias"] != second["alias"]
+    assert mock_put.call_count == 1
+    alias_keys = {c.kwargs["file_path"] for c in mock_upload.call_args_list}
+    assert alias_keys == {f"python-images/aliases/{r['alias']}.json" for r in (first, second)}
+
+
+@patch("src.generate_dockerfile.is_running_on_lambda", return_value=True)
+@patch("src.generate_dockerfile.put_if_absent", side_effect=Exception("S3 error"))
+def test_batch_upload_failure_reported_per_item(mock_put, mock_lambda):
+    result = lambda_handler(event=_make_batch_event([PYTHON_CONFIG, GO_CONFIG]))
+    assert result["statusCode"] == 200
+    results = json.loads(result["body"])["results"]
+    assert all("S3 error" in r["error"] for r in results)
+
+
+# --- Ingestion tests ---
+
+
+def test_from_event_accepts_raw_body_bytes():
+    body = json.dumps({"config": PYTHON_CONFIG}).encode("utf-8")
+    config = GenerateDockerfileRequest.from_event({"body": body})
+    assert config == GenerateDockerfileRequest(**PYTHON_CONFIG)
+
+
+def test_from_event_rejects_batch_body():
+    with pytest.raises(ValueError, match="'config'"):
+        GenerateDockerfileRequest.from_event(_make_batch_event([PYTHON_CONFIG]))
+
+
+def test_event_requires_config_or_configs():
+    with pytest.raises(ValueError, match="exactly one of 'config' or 'configs'"):
+        GenerateDockerfileEvent.model_validate_json(b"{}")
+    both = json.dumps({"config": PYTHON_CONFIG, "configs": [GO_CONFIG]})
+    with pytest.raises(ValueError, match="exactly one of 'config' or 'configs'"):
+        GenerateDockerfileEvent.model_validate_json(both)
+
+
+def test_request_list_adapter_validates_in_one_call():
+    configs = request_list_adapter().validate_python([PYTHON_CONFIG, GO_CONFIG])
+    assert [c.language for c in configs] == ["python", "go"]
+    assert request_list_adapter() is request_list_adapter()
+
+
+def test_validate_requests_attributes_errors_per_entry():
+    bad = {**PYTHON_CONFIG, "language_version": "2.7"}
+    results = validate_requests([PYTHON_CONFIG, bad, GO_CONFIG])
+    assert isinstance(results[0], GenerateDockerfileRequest)
+    assert "Unsupported version" in str(results[1])
+    assert isinstance(results[2], GenerateDockerfileRequest)
+
+
+# --- Render cache tests ---
+
+
+def test_render_cache_hits_for_equivalent_requests():
+    cache = RenderCache(max_entries=8, max_bytes=1024 * 1024)
+    first = cache.get_or_render(GenerateDockerfileRequest(**PYTHON_CONFIG))
+    reordered = {**PYTHON_CONFIG, "extra_dependencies": ["numpy", "pandas"]}
+    second = cache.get_or_render(GenerateDockerfileRequest(**reordered))
+    assert first == second
+    assert (cache.hits, cache.misses) == (1, 1)
+    content, key = first
+    assert key == generate_dockerfile_key_name(GenerateDockerfileRequest(**PYTHON_CONFIG), content)
+
+
+def test_render_cache_evicts_least_recently_used():
+    cache = RenderCache(max_entries=2, max_bytes=1024 * 1024)
+    python, go, rust = (GenerateDockerfileRequest(**c) for c in (PYTHON_CONFIG, GO_CONFIG, RUST_CONFIG))
+    cache.get_or_render(python)
+    cache.get_or_render(go)
+    cache.get_or_render(python)
+    cache.get_or_render(rust)
+    assert len(cache) == 2
+    cache.get_or_render(go)
+    assert cache.misses == 4
+
+
+def test_render_cache_respects_byte_budget():
+    config = GenerateDockerfileRequest(**PYTHON_CONFIG)
+    cache = RenderCache(max_entries=8, max_bytes=100)
+    cache.get_or_render(config)
+    assert len(cache) == 0 and cache.size_bytes == 0
+    cache = RenderCache(max_entries=8, max_bytes=1000)
+    cache.get_or_render(config)
+    cache.get_or_render(GenerateDockerfileRequest(**GO_CONFIG))
+    assert cache.size_bytes <= 1000
+    assert len(cache) == 1
+
+
+def test_handler_logs_render_cache_counters(caplog):
+    with caplog.at_level("INFO", logger="src.generate_dockerfile"):
+        lambda_handler(event=_make_event(PYTHON_CONFIG))
+        lambda_handler(event=_make_event(PYTHON_CONFIG))
+    handler_records = [r for r in caplog.records if r.name == "src.generate_dockerfile"]
+    final = json.loads(handler_records[-1].getMessage())
+    assert final["status_code"] == 200
+    assert final["render_cache_hits"] == 1
+    assert final["render_cache_misses"] == 1
+
+
+# --- Metrics tests ---
+
+
+def _emf_records(caplog) -> list[dict]:
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == "stackfordev.metrics"]
+
+
+def _assert_valid_emf(record: dict) -> None:
+    directive = record["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Dimensions"] == [["Language", "Outcome"]]
+    for metric in directive["Metrics"]:
+        assert metric["Unit"] == "Milliseconds"
+        assert record[metric["Name"]] >= 0
+
+
+@patch("src.generate_dockerfile.is_running_on_lambda", return_value=True)
+@patch("src.generate_dockerfile.put_if_absent", side_effect=[True, False])
+@patch("src.generate_dockerfile.put_alias")
+def test_handler_emits_emf_record_per_request(mock_upload, mock_put, mock_lambda, caplog):
+    with caplog.at_level("INFO"):
+        lambda_handler(event=_make_event(PYTHON_CONFIG))
+        lambda_handler(event=_make_event(PYTHON_CONFIG))
+    first, second = _emf_records(caplog)
+    for record in (first, second):
+        _assert_valid_emf(record)
+        assert record["Language"] == "python"
+    assert first["Outcome"] == "uploaded"
+    assert {"ValidationTime", "RenderTime", "S3PutTime", "AliasPutTime", "TotalTime"} <= first.keys()
+    assert first["render_cache_hit"] is False
+    assert second["Outcome"] == "cache_hit"
+    assert "AliasPutTime" in second
+    assert second["render_cache_hit"] is True
+
+
+def test_handler_emits_error_outcome_on_invalid_request(caplog):
+    with caplog.at_level("INFO"):
+        lambda_handler(event=_make_event({**PYTHON_CONFIG, "language": "COBOL"}))
+    (record,) = _emf_records(caplog)
+    _assert_valid_emf(record)
+    assert (record["Language"], record["Outcome"]) == ("unknown", "error")
+    assert "ValidationTime" in record
+
+
+def test_batch_emits_single_emf_record(caplog):
+    bad = {**PYTHON_CONFIG, "language_version": "2.7"}
+    with caplog.at_level("INFO"):
+        lambda_handler(event=_make_batch_event([PYTHON_CONFIG, bad]))
+    (record,) = _emf_records(caplog)
+    assert (record["Language"], record["Outcome"]) == ("batch", "error")
+    assert (record["batch_size"], record["failed"]) == (2, 1)
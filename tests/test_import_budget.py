@@ -0,0 +1,48 @@
+"""Cold-start guard for the Lambda entry point, measured with ``python -X importtime``."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time allowed for src.generate_dockerfile, best of a few runs.
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "300"))
+
+# Only needed once a request actually reaches S3 (or a local .env file).
+DEFERRED_MODULES = {"boto3", "botocore", "mypy_boto3_s3", "dotenv"}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_profile() -> dict[str, int]:
+    """Import the handler in a fresh Lambda-like interpreter; return cumulative µs per module."""
+    env = {**os.environ, "AWS_LAMBDA_FUNCTION_NAME": "stack-for-dev"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.generate_dockerfile"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    return [_import_profile() for _ in range(3)]
+
+
+def test_handler_import_within_budget(profiles):
+    best_ms = min(p["src.generate_dockerfile"] for p in profiles) / 1000
+    assert best_ms <= IMPORT_BUDGET_MS, (
+        f"Importing src.generate_dockerfile took {best_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
+    )
+
+
+def test_heavy_modules_deferred_on_lambda(profiles):
+    imported = {name.split(".")[0] for name in profiles[0]}
+    assert not imported & DEFERRED_MODULES
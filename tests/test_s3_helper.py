@@ -0,0 +1,142 @@
+"""Tests for the S3 helper's client cache and calls."""
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from src import s3_helper
+from src.s3_helper import (
+    check_if_file_exists_in_s3,
+    get_s3_client,
+    put_alias,
+    put_if_absent,
+    set_s3_client_factory,
+    upload_to_s3,
+)
+
+BUCKET = "test-bucket"
+REGION = "us-east-1"
+
+
+class FakeS3Client:
+    """Minimal in-memory stand-in for the boto3 S3 client."""
+
+    def __init__(self, region_name):
+        self.region_name = region_name
+        self.objects = {}
+        self.calls = []
+
+    def put_object(self, Bucket, Key, Body, IfNoneMatch=None):
+        self.calls.append(("put_object", Key))
+        if IfNoneMatch == "*" and (Bucket, Key) in self.objects:
+            raise ClientError(
+                {"Error": {"Code": "PreconditionFailed"}, "ResponseMetadata": {"HTTPStatusCode": 412}},
+                "PutObject",
+            )
+        self.objects[(Bucket, Key)] = Body
+
+    def head_object(self, Bucket, Key):
+        self.calls.append(("head_object", Key))
+        if (Bucket, Key) not in self.objects:
+            raise KeyError(Key)
+        return {}
+
+
+@pytest.fixture(autouse=True)
+def reset_client_cache():
+    set_s3_client_factory(None)
+    yield
+    set_s3_client_factory(None)
+
+
+@pytest.fixture()
+def built_clients():
+    built = []
+
+    def factory(region_name):
+        built.append(FakeS3Client(region_name))
+        return built[-1]
+
+    set_s3_client_factory(factory)
+    return built
+
+
+def test_client_is_reused_per_region(built_clients):
+    assert get_s3_client(REGION) is get_s3_client(REGION)
+    assert get_s3_client("eu-west-2") is not get_s3_client(REGION)
+    assert [c.region_name for c in built_clients] == [REGION, "eu-west-2"]
+
+
+def test_upload_and_check_share_one_client(built_clients):
+    assert not check_if_file_exists_in_s3(bucket=BUCKET, key="a.dockerfile", region_name=REGION)
+    upload_to_s3(file_path="a.dockerfile", bucket=BUCKET, content="FROM x", region_name=REGION)
+    assert check_if_file_exists_in_s3(bucket=BUCKET, key="a.dockerfile", region_name=REGION)
+    assert len(built_clients) == 1
+
+
+def test_put_if_absent_single_round_trip(built_clients):
+    assert put_if_absent(file_path="a.dockerfile", bucket=BUCKET, content="FROM x", region_name=REGION)
+    assert built_clients[0].calls == [("put_object", "a.dockerfile")]
+
+
+def test_put_if_absent_treats_412_as_existing(built_clients):
+    get_s3_client(REGION).objects[(BUCKET, "a.dockerfile")] = "FROM x"
+    assert not put_if_absent(file_path="a.dockerfile", bucket=BUCKET, content="FROM y", region_name=REGION)
+    assert built_clients[0].objects[(BUCKET, "a.dockerfile")] == "FROM x"
+
+
+def test_put_if_absent_propagates_other_errors(built_clients):
+    def failing_put(**kwargs):
+        raise ClientError({"Error": {"Code": "AccessDenied"}, "ResponseMetadata": {"HTTPStatusCode": 403}}, "PutObject")
+
+    get_s3_client(REGION).put_object = failing_put
+    with pytest.raises(ClientError):
+        put_if_absent(file_path="a.dockerfile", bucket=BUCKET, content="FROM x", region_name=REGION)
+
+
+def test_known_keys_skip_s3(built_clients):
+    put_if_absent(file_path="a.dockerfile", bucket=BUCKET, content="FROM x", region_name=REGION)
+    assert not put_if_absent(file_path="a.dockerfile", bucket=BUCKET, content="FROM x", region_name=REGION)
+    assert check_if_file_exists_in_s3(bucket=BUCKET, key="a.dockerfile", region_name=REGION)
+    assert built_clients[0].calls == [("put_object", "a.dockerfile")]
+
+
+def test_put_alias_skips_s3_while_target_is_unchanged(built_clients):
+    assert put_alias(file_path="a.json", bucket=BUCKET, content="{}", region_name=REGION, target="x.dockerfile")
+    assert not put_alias(file_path="a.json", bucket=BUCKET, content="{}", region_name=REGION, target="x.dockerfile")
+    assert put_alias(file_path="a.json", bucket=BUCKET, content="{}", region_name=REGION, target="y.dockerfile")
+    assert built_clients[0].calls == [("put_object", "a.json"), ("put_object", "a.json")]
+
+
+def test_default_client_uses_pool_and_retry_config(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    config = get_s3_client(REGION).meta.config
+    assert config.max_pool_connections == s3_helper.S3_MAX_POOL_CONNECTIONS
+    assert config.retries["mode"] == s3_helper.S3_RETRY_MODE
+
+
+def test_default_client_honours_endpoint_override(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("S3_ENDPOINT_URL", "http://127.0.0.1:5000")
+    assert get_s3_client(REGION).meta.endpoint_url == "http://127.0.0.1:5000"
+
+
+def test_missing_bucket_or_region_rejected():
+    with pytest.raises(ValueError, match="Bucket"):
+        upload_to_s3(file_path="a", bucket=None, content="", region_name=REGION)
+    with pytest.raises(ValueError, match="Region"):
+        check_if_file_exists_in_s3(bucket=BUCKET, key="a", region_name=None)
+
+
+def test_round_trip_against_moto(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("s3", region_name=REGION).create_bucket(Bucket=BUCKET)
+        assert put_if_absent(file_path="a.dockerfile", bucket=BUCKET, content="FROM x", region_name=REGION)
+        set_s3_client_factory(None)  # forget known keys so the next call reaches moto
+        assert not put_if_absent(file_path="a.dockerfile", bucket=BUCKET, content="FROM y", region_name=REGION)
+        assert check_if_file_exists_in_s3(bucket=BUCKET, key="a.dockerfile", region_name=REGION)